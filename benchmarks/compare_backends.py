@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+СРАВНЕНИЕ ПАРСЕРОВ: РУЧНОЙ PARSER ПРОТИВ ANTLR
+
+Для каждого сценария из run_benchmarks.py измеряет время полного разбора
+(от исходного текста до AST) обоими парсерами, проверяет совпадение
+деревьев и сообщает, в каком режиме предсказания (SLL или LL) завершился
+разбор ANTLR.
+
+Использование:
+    antlr4 -Dlanguage=Python3 src/grammars/Pseudocode.g4
+    python benchmarks/compare_backends.py --scenario flat --repeat 3
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import Any, Dict
+
+# Добавляем путь для импортов
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.antlr_backend import (HandWrittenBackend, AntlrBackend, compare_backends,
+                               antlr_available, require_antlr)
+from benchmarks.run_benchmarks import SCENARIOS, measure
+
+# Сценарии по умолчанию - все сценарии бенчмарков
+DEFAULT_SCENARIOS = list(SCENARIOS)
+
+
+def run_comparison(name: str, repeat: int, scale: float) -> Dict[str, Any]:
+    """Измеряет оба парсера на одном сценарии и сверяет их AST."""
+    code = SCENARIOS[name](scale)
+    hand, antlr = HandWrittenBackend(), AntlrBackend()
+
+    check = compare_backends(code, hand, antlr)
+    stages = {
+        'hand': measure(lambda: hand.parse(code), repeat),
+        'antlr': measure(lambda: antlr.parse(code), repeat),
+    }
+    return {
+        'source_bytes': len(code.encode('utf-8')),
+        'agree': check['agree'],
+        'difference': check['difference'],
+        'antlr_mode': antlr.last_mode,
+        'stages': stages,
+        'slowdown': stages['antlr']['best'] / stages['hand']['best']
+    }
+
+
+def print_comparison(results: Dict[str, Any]):
+    """Выводит таблицу сравнения."""
+    print(f"{'СЦЕНАРИЙ':<12} {'РУЧНОЙ, мс':>11} {'ANTLR, мс':>11} {'×':>6} {'РЕЖИМ':>6}  AST")
+    print("-" * 60)
+    for name, data in results.items():
+        status = '✅' if data['agree'] else f"❌ {data['difference']}"
+        print(f"{name:<12} {data['stages']['hand']['best'] * 1000:>11.2f} "
+              f"{data['stages']['antlr']['best'] * 1000:>11.2f} {data['slowdown']:>6.1f} "
+              f"{data['antlr_mode']:>6}  {status}")
+
+
+def main():
+    """Точка входа командной строки."""
+    arg_parser = argparse.ArgumentParser(description="Сравнение ручного парсера и парсера ANTLR")
+    arg_parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                            help="Сценарий для запуска (можно указать несколько раз)")
+    arg_parser.add_argument('--repeat', type=int, default=3, help="Число повторов каждого измерения")
+    arg_parser.add_argument('--scale', type=float, default=1.0, help="Множитель размера сценариев")
+    arg_parser.add_argument('--output', help="Сохранить результаты в JSON")
+    args = arg_parser.parse_args()
+
+    if not antlr_available():
+        try:
+            require_antlr()
+        except RuntimeError as e:
+            print(f"❌ {e}")
+        return 1
+
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10000))
+
+    print("⚖️  СРАВНЕНИЕ ПАРСЕРОВ")
+    print("=" * 60)
+
+    results = {name: run_comparison(name, args.repeat, args.scale)
+               for name in args.scenario or DEFAULT_SCENARIOS}
+    print_comparison(results)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+
+    return 0 if all(data['agree'] for data in results.values()) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+НАБОР БЕНЧМАРКОВ АНАЛИЗАТОРА ПСЕВДОКОДА
+
+Измеряет по отдельности производительность лексера (PseudocodeLexer.tokenize),
+парсера (Parser.parse, в том числе с отложенным разбором блоков), валидатора
+(ASTValidator.validate), сериализации (ASTNode.to_dict) и построения
+плоского AST (FlatAST.from_ast) на фиксированных воспроизводимых сценариях. Сохраняет
+результаты как JSON-базу и сообщает о регрессиях относительно нее.
+
+Использование:
+    python benchmarks/run_benchmarks.py                 # запуск и сравнение с базой
+    python benchmarks/run_benchmarks.py --save          # сохранить новую базу
+    python benchmarks/run_benchmarks.py --scenario flat --repeat 10
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+# Добавляем путь для импортов
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.lexer import PseudocodeLexer, LexerAnalyzer, LineIndex
+from src.flat_ast import FlatAST
+from src.parser import Parser, ASTValidator, ASTNode, iter_child_nodes
+from src.generator import ProgramGenerator
+
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), 'baselines', 'baseline.json')
+
+# Допустимое замедление относительно базы (доля)
+DEFAULT_TOLERANCE = 0.25
+
+
+# ----------------------------------------------------------------------
+# Сценарии
+# ----------------------------------------------------------------------
+
+def scenario_flat(scale: float = 1.0) -> str:
+    """Длинная плоская программа из присваиваний и вывода."""
+    statements = int(5000 * scale)
+    lines = []
+    for i in range(statements):
+        if i % 4 == 3:
+            lines.append(f'print("value: " + v{i - 1});')
+        else:
+            lines.append(f'v{i} = {i} + {i % 7} * 3;')
+    return '\n'.join(lines) + '\n'
+
+
+def scenario_nested(scale: float = 1.0) -> str:
+    """Глубоко вложенные блоки if/for/while."""
+    depth, repeats = 100, max(1, int(10 * scale))
+    blocks = []
+    for r in range(repeats):
+        opening, closing = [], []
+        for level in range(depth):
+            indent = '    ' * level
+            kind = level % 3
+            if kind == 0:
+                opening.append(f'{indent}if (x{level} > {level}) {{')
+            elif kind == 1:
+                opening.append(f'{indent}for i{level} in range(0, {level + r}) {{')
+            else:
+                opening.append(f'{indent}while (y{level} < {level}) {{')
+            closing.append(f'{indent}}}')
+        body = '    ' * depth + f'z = {r};'
+        blocks.append('\n'.join(opening + [body] + closing[::-1]))
+    return '\n'.join(blocks) + '\n'
+
+
+def scenario_expressions(scale: float = 1.0) -> str:
+    """Программа из длинных арифметических выражений."""
+    statements, width = int(500 * scale), 40
+    operators = ['+', '-', '*', '/', '%']
+    lines = []
+    for i in range(statements):
+        terms = []
+        for j in range(width):
+            term = f'a{j % 10}' if j % 3 else str(j + i)
+            if j % 7 == 0:
+                term = f'({term} + {j})'
+            terms.append(term)
+        expression = terms[0]
+        for j, term in enumerate(terms[1:]):
+            expression += f' {operators[(i + j) % len(operators)]} {term}'
+        lines.append(f'r{i} = {expression};')
+    return '\n'.join(lines) + '\n'
+
+
+def scenario_comments(scale: float = 1.0) -> str:
+    """Программа, в которой комментарии преобладают над кодом."""
+    statements, comments_per_statement = int(1500 * scale), 8
+    lines = []
+    for i in range(statements):
+        for c in range(comments_per_statement):
+            lines.append(f'# комментарий {i}.{c}: описание шага алгоритма и инварианта цикла')
+        lines.append(f'x{i % 50} = {i}; # хвостовой комментарий')
+    return '\n'.join(lines) + '\n'
+
+
+def scenario_strings(scale: float = 1.0) -> str:
+    """Программа с большими строковыми литералами."""
+    statements, length = int(500 * scale), 2000
+    alphabet = 'abcdefghijklmnopqrstuvwxyz0123456789 '
+    lines = []
+    for i in range(statements):
+        text = ''.join(alphabet[(i * 7 + j) % len(alphabet)] for j in range(length))
+        lines.append(f'print("{text}" + s{i % 10});')
+    return '\n'.join(lines) + '\n'
+
+
+def scenario_generated(scale: float = 1.0) -> str:
+    """Реалистичная программа от генератора по грамматике (фиксированное зерно)."""
+    return ProgramGenerator(seed=2024, max_depth=4, expression_width=4).generate(int(300_000 * scale))
+
+
+SCENARIOS: Dict[str, Callable[[float], str]] = {
+    'flat': scenario_flat,
+    'nested': scenario_nested,
+    'expressions': scenario_expressions,
+    'comments': scenario_comments,
+    'strings': scenario_strings,
+    'generated': scenario_generated,
+}
+
+
+# ----------------------------------------------------------------------
+# Измерения
+# ----------------------------------------------------------------------
+
+def count_nodes(ast: ASTNode) -> int:
+    """Считает узлы AST без рекурсии."""
+    total, stack = 0, [ast]
+    while stack:
+        node = stack.pop()
+        total += 1
+        stack.extend(iter_child_nodes(node))
+    return total
+
+
+def measure(func: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """
+    Измеряет время выполнения функции (лучшее и медианное из repeat запусков)
+    и пиковую память отдельным запуском под tracemalloc.
+    """
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'best': timings[0],
+        'median': timings[len(timings) // 2],
+        'peak_memory': peak
+    }
+
+
+def run_scenario(name: str, repeat: int, scale: float = 1.0) -> Dict[str, Any]:
+    """Выполняет все измерения для одного сценария."""
+    code = SCENARIOS[name](scale)
+    lexer = PseudocodeLexer()
+    raw_tokens = lexer.tokenize(code)
+    tokens = LexerAnalyzer().convert_tokens(raw_tokens)
+    ast = Parser(tokens).parse()
+    nodes = count_nodes(ast)
+    validator = ASTValidator()
+    line_index = LineIndex(code)
+
+    stages = {
+        'tokenize': measure(lambda: lexer.tokenize(code), repeat),
+        'parse': measure(lambda: Parser(tokens).parse(), repeat),
+        'parse_lazy': measure(lambda: Parser(tokens, lazy_blocks=True).parse(), repeat),
+        'validate': measure(lambda: validator.validate(ast), repeat),
+        'to_dict': measure(lambda: ast.to_dict(), repeat),
+        'flatten': measure(lambda: FlatAST.from_ast(ast, line_index), repeat),
+    }
+
+    # Пропускная способность считается по лучшему времени
+    stages['tokenize']['tokens_per_sec'] = len(tokens) / stages['tokenize']['best']
+    for stage in ('parse', 'parse_lazy'):
+        stages[stage]['tokens_per_sec'] = len(tokens) / stages[stage]['best']
+    for stage in ('parse', 'validate', 'to_dict', 'flatten'):
+        stages[stage]['nodes_per_sec'] = nodes / stages[stage]['best']
+
+    return {
+        'source_bytes': len(code.encode('utf-8')),
+        'tokens': len(tokens),
+        'nodes': nodes,
+        'stages': stages
+    }
+
+
+def find_regressions(results: Dict[str, Any], baseline: Dict[str, Any],
+                     tolerance: float) -> List[str]:
+    """Сравнивает результаты с базой и возвращает описания регрессий."""
+    regressions = []
+    for scenario, data in results['scenarios'].items():
+        base = baseline.get('scenarios', {}).get(scenario)
+        if not base:
+            continue
+        for stage, current in data['stages'].items():
+            previous = base['stages'].get(stage)
+            if not previous:
+                continue
+            if current['best'] > previous['best'] * (1 + tolerance):
+                slowdown = current['best'] / previous['best'] - 1
+                regressions.append(
+                    f"{scenario}/{stage}: время {previous['best'] * 1000:.2f} → "
+                    f"{current['best'] * 1000:.2f} мс (+{slowdown:.0%})")
+            if current['peak_memory'] > previous['peak_memory'] * (1 + tolerance):
+                growth = current['peak_memory'] / max(previous['peak_memory'], 1) - 1
+                regressions.append(
+                    f"{scenario}/{stage}: память {previous['peak_memory'] / 1024:.0f} → "
+                    f"{current['peak_memory'] / 1024:.0f} КБ (+{growth:.0%})")
+    return regressions
+
+
+def print_results(results: Dict[str, Any]):
+    """Выводит таблицу результатов."""
+    print(f"{'СЦЕНАРИЙ':<12} {'ЭТАП':<10} {'ЛУЧШЕЕ, мс':>11} {'ТОКЕН/с':>12} {'УЗЕЛ/с':>12} {'ПИК, КБ':>10}")
+    print("-" * 72)
+    for scenario, data in results['scenarios'].items():
+        for stage, stats in data['stages'].items():
+            tokens_rate = f"{stats['tokens_per_sec']:,.0f}" if 'tokens_per_sec' in stats else '-'
+            nodes_rate = f"{stats['nodes_per_sec']:,.0f}" if 'nodes_per_sec' in stats else '-'
+            print(f"{scenario:<12} {stage:<10} {stats['best'] * 1000:>11.2f} "
+                  f"{tokens_rate:>12} {nodes_rate:>12} {stats['peak_memory'] / 1024:>10.0f}")
+        print(f"{'':<12} {data['tokens']} токенов, {data['nodes']} узлов, {data['source_bytes']} байт")
+
+
+def main():
+    """Точка входа командной строки."""
+    arg_parser = argparse.ArgumentParser(description="Бенчмарки анализатора псевдокода")
+    arg_parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                            help="Сценарий для запуска (можно указать несколько раз)")
+    arg_parser.add_argument('--repeat', type=int, default=5, help="Число повторов каждого измерения")
+    arg_parser.add_argument('--scale', type=float, default=1.0,
+                            help="Множитель размера сценариев (база сравнима только при том же значении)")
+    arg_parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="Путь к JSON-базе")
+    arg_parser.add_argument('--save', action='store_true', help="Сохранить результаты как новую базу")
+    arg_parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                            help="Допустимое замедление относительно базы (доля)")
+    arg_parser.add_argument('--output', help="Сохранить результаты запуска в JSON")
+    args = arg_parser.parse_args()
+
+    # Глубоко вложенные сценарии обходятся рекурсивно
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10000))
+
+    print("🏁 БЕНЧМАРКИ АНАЛИЗАТОРА ПСЕВДОКОДА")
+    print("=" * 72)
+
+    results = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'scale': args.scale,
+        'scenarios': {}
+    }
+    for name in args.scenario or list(SCENARIOS):
+        results['scenarios'][name] = run_scenario(name, args.repeat, args.scale)
+
+    print_results(results)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 База сохранена: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nℹ️  База не найдена ({args.baseline}); запустите с --save")
+        return 0
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    if baseline.get('scale', 1.0) != args.scale:
+        print(f"\n⚠️  База снята с --scale {baseline.get('scale', 1.0)}, сравнение невозможно")
+        return 1
+
+    regressions = find_regressions(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n🚨 ОБНАРУЖЕНЫ РЕГРЕССИИ (допуск {args.tolerance:.0%}):")
+        for regression in regressions:
+            print(f"   • {regression}")
+        return 1
+
+    print(f"\n✅ Регрессий относительно базы нет (допуск {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -10,13 +10,19 @@
 import os
 import sys
 import json
-from typing import List, Dict, Any
+from contextlib import nullcontext
+from typing import List, Dict, Any, Optional
 
 # Добавляем путь для импортов
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from src.lexer import PseudocodeLexer, LexerAnalyzer
 from src.parser import Parser, ASTValidator, ASTNode
+from src.interpreter import Interpreter, ExecutionLimits
+from src.symbols import build_symbol_table
+from src.metrics import AnalysisMetrics, MetricsCallback
+from src.query import QueryIndex
+from src.report import ReportRenderer
 
 
 class PseudocodeAnalyzer:
@@ -30,13 +36,37 @@ class PseudocodeAnalyzer:
     4. Валидация структуры
     """
     
-    def __init__(self):
-        """Инициализация анализатора."""
+    def __init__(self, instrument: bool = False, metrics_callback: Optional[MetricsCallback] = None,
+                 trace_memory: bool = False, compact_positions: bool = False):
+        """
+        Инициализация анализатора.
+        
+        Args:
+            instrument: Собирать метрики по фазам анализа (время, выделения
+                памяти, число узлов по типам, глубина вложенности)
+            metrics_callback: Функция, получающая метрики после каждого анализа;
+                включает инструментирование
+            trace_memory: Дополнительно измерять пиковую память фаз через
+                tracemalloc (требует запущенного tracemalloc)
+            compact_positions: Хранить в токенах и узлах AST смещение в исходнике
+                вместо строки и столбца (они вычисляются при обращении)
+        """
         self.lexer_analyzer = LexerAnalyzer()
         self.ast_validator = ASTValidator()
+        self.instrument = instrument or metrics_callback is not None
+        self.metrics_callback = metrics_callback
+        self.trace_memory = trace_memory
+        self.compact_positions = compact_positions
         self.tokens = []
         self.ast = None
+        self.symbol_table = None
+        self.query_index = None
         self.validation_errors = []
+        self.metrics = None
+    
+    def _phase(self, name: str):
+        """Возвращает контекст измерения фазы (пустой без инструментирования)."""
+        return self.metrics.phase(name) if self.metrics else nullcontext()
     
     def analyze(self, code: str) -> Dict[str, Any]:
         """
@@ -46,45 +76,92 @@ class PseudocodeAnalyzer:
             code: Исходный код на псевдокоде
             
         Returns:
-            Словарь с результатами анализа
+            Словарь с результатами анализа; при включенном инструментировании
+            содержит ключ 'metrics'
         """
+        self.symbol_table = None
+        self.query_index = None
+        self.metrics = AnalysisMetrics(self.trace_memory) if self.instrument else None
+        
         try:
             # Лексический анализ
-            self.tokens = self.lexer_analyzer.analyze(code)
+            lexer = self.lexer_analyzer.lexer
+            with self._phase('lexing'):
+                if self.compact_positions:
+                    raw_tokens = lexer.tokenize_compact(code)
+                else:
+                    raw_tokens = lexer.tokenize(code)
+            with self._phase('token_conversion'):
+                self.tokens = self.lexer_analyzer.convert_tokens(raw_tokens)
             
             if not self.tokens:
-                return {
+                return self._finish({
                     'success': False,
                     'errors': ['Лексический анализ не дал результатов'],
                     'tokens': [],
                     'ast': None
-                }
+                })
             
-            # Синтаксический анализ и построение AST
-            parser = Parser(self.tokens)
-            self.ast = parser.parse()
+            # Синтаксический анализ, построение AST и валидация: правила
+            # ASTValidator проверяются при создании узлов, поэтому фаза
+            # parsing включает время валидации, а отдельной фазы у нее нет
+            with self._phase('parsing'):
+                line_index = lexer.line_index if self.compact_positions else None
+                parser = Parser(self.tokens, line_index=line_index, validator=self.ast_validator)
+                self.ast = parser.parse()
+            self.validation_errors = parser.validation_errors
             
-            # Валидация AST
-            self.validation_errors = self.ast_validator.validate(self.ast)
+            # Таблица символов строится один раз на анализ
+            with self._phase('symbols'):
+                self.symbol_table = build_symbol_table(self.ast)
             
-            return {
+            with self._phase('to_dict'):
+                ast_json = self.ast.to_dict() if self.ast else None
+            
+            if self.metrics:
+                self.metrics.count_nodes(self.ast)
+            
+            return self._finish({
                 'success': len(self.validation_errors) == 0,
                 'errors': self.validation_errors,
                 'tokens': self.tokens,
                 'ast': self.ast,
+                'symbols': self.symbol_table,
                 'token_count': len(self.tokens),
-                'ast_json': self.ast.to_dict() if self.ast else None
-            }
+                'ast_json': ast_json
+            })
             
         except Exception as e:
-            return {
+            return self._finish({
                 'success': False,
                 'errors': [f"Ошибка анализа: {str(e)}"],
                 'tokens': self.tokens,
                 'ast': None,
+                'symbols': None,
                 'token_count': len(self.tokens),
                 'ast_json': None
-            }
+            })
+    
+    def query(self, selector: str) -> List[ASTNode]:
+        """
+        Ищет узлы AST последнего анализа по запросу (см. src/query.py).
+        
+        Индексы строятся при первом запросе и используются повторно до
+        следующего анализа.
+        """
+        if self.ast is None:
+            return []
+        if self.query_index is None:
+            self.query_index = QueryIndex(self.ast)
+        return self.query_index.select(selector)
+    
+    def _finish(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Добавляет метрики в результат и передает их обработчику."""
+        if self.metrics:
+            result['metrics'] = self.metrics.to_dict()
+            if self.metrics_callback:
+                self.metrics_callback(dict(result['metrics'], success=result['success']))
+        return result
     
     def analyze_file(self, file_path: str) -> Dict[str, Any]:
         """
@@ -115,89 +192,67 @@ class PseudocodeAnalyzer:
                 'ast': None
             }
     
-    def print_ast(self, node: ASTNode, level: int = 0):
+    def execute(self, code: str, limits: ExecutionLimits = None,
+                interpreter: Optional[Interpreter] = None) -> Dict[str, Any]:
         """
-        Рекурсивно выводит AST в читаемом формате.
+        Анализирует и выполняет код в рамках бюджета ресурсов.
         
         Args:
-            node: Узел AST для вывода
-            level: Текущий уровень вложенности
+            code: Исходный код на псевдокоде
+            limits: Ограничения на шаги, время, вывод и размер значений
+            interpreter: Интерпретатор (например, ProfilingInterpreter);
+                по умолчанию - Interpreter(limits). Ограничения переданного
+                интерпретатора задаются при его создании, поэтому вместе
+                с ним limits передавать нельзя
+            
+        Returns:
+            Словарь с результатами выполнения (см. Interpreter.run);
+            если анализ не удался, status = 'analysis_error'
+
+        Raises:
+            ValueError: Если переданы и limits, и interpreter
         """
-        indent = "  " * level
-        node_info = f"{node.node_type.value}"
+        if limits is not None and interpreter is not None:
+            raise ValueError("limits и interpreter нельзя передавать вместе: "
+                             "ограничения задаются при создании интерпретатора")
+
+        result = self.analyze(code)
         
-        # Добавляем специфичную информацию для разных типов узлов
-        if node.node_type.value == 'VARIABLE':
-            node_info += f"({node.name})"
-        elif node.node_type.value == 'NUMBER':
-            node_info += f"({node.value})"
-        elif node.node_type.value == 'STRING':
-            node_info += f"('{node.value}')"
-        elif node.node_type.value == 'ASSIGNMENT':
-            node_info += f"({node.variable.name})"
-        elif node.node_type.value == 'BINARY_OP':
-            node_info += f"({node.operator})"
-        elif node.node_type.value == 'ARRAY':
-            node_info += f"[{len(node.elements) if hasattr(node, 'elements') else 0} elements]"
-        elif node.node_type.value == 'ARRAY_ACCESS':
-            node_info += f"(access)"
+        if not result['success']:
+            return {
+                'success': False,
+                'status': 'analysis_error',
+                'errors': result['errors'],
+                'output': '',
+                'steps': 0,
+                'elapsed': 0.0,
+                'variables': {}
+            }
         
-        print(f"{indent}├─ {node_info}")
+        return (interpreter or Interpreter(limits)).run(result['ast'])
+    
+    def print_ast(self, node: ASTNode, level: int = 0, **options):
+        """
+        Рекурсивно выводит AST в читаемом формате.
         
-        # Рекурсивно обходим дочерние узлы
-        for attr_name in dir(node):
-            if not attr_name.startswith('_') and attr_name not in ['node_type', 'line', 'column']:
-                attr_value = getattr(node, attr_name)
-                
-                if isinstance(attr_value, ASTNode):
-                    print(f"{indent}│  └─ {attr_name}:")
-                    self.print_ast(attr_value, level + 2)
-                elif isinstance(attr_value, list) and attr_value:
-                    print(f"{indent}│  └─ {attr_name}:")
-                    for i, item in enumerate(attr_value):
-                        if isinstance(item, ASTNode):
-                            print(f"{indent}│     [{i}]:")
-                            self.print_ast(item, level + 3)
-                        else:
-                            print(f"{indent}│     [{i}]: {item}")
+        Args:
+            node: Узел AST для вывода
+            level: Текущий уровень вложенности
+            **options: Параметры ReportRenderer (max_depth, max_children, elide)
+        """
+        ReportRenderer(**options).render_ast(node, level)
     
-    def print_analysis_report(self, result: Dict[str, Any], title: str = "АНАЛИЗ ПСЕВДОКОДА"):
+    def print_analysis_report(self, result: Dict[str, Any], title: str = "АНАЛИЗ ПСЕВДОКОДА", **options):
         """
         Выводит подробный отчет анализа.
         
         Args:
             result: Результат анализа
             title: Заголовок отчета
+            **options: Параметры ReportRenderer (max_depth, max_children, elide,
+                show_json, summary_only, stream)
         """
-        print("=" * 80)
-        print(title)
-        print("=" * 80)
-        
-        # Статус анализа
-        if result['success']:
-            print("✅ АНАЛИЗ УСПЕШЕН")
-        else:
-            print("❌ ОБНАРУЖЕНЫ ОШИБКИ")
-        
-        # Информация о токенах
-        print(f"\n📊 ЛЕКСИЧЕСКИЙ АНАЛИЗ:")
-        print(f"   Найдено токенов: {result['token_count']}")
-        
-        # Ошибки
-        if result['errors']:
-            print(f"\n🚨 ОШИБКИ ВАЛИДАЦИИ:")
-            for error in result['errors']:
-                print(f"   • {error}")
-        
-        # AST
-        if result['ast']:
-            print(f"\n🌳 АБСТРАКТНОЕ СИНТАКСИЧЕСКОЕ ДЕРЕВО (AST):")
-            self.print_ast(result['ast'])
-        
-        # JSON представление
-        if result.get('ast_json'):
-            print(f"\n📄 JSON ПРЕДСТАВЛЕНИЕ AST:")
-            print(json.dumps(result['ast_json'], indent=2, ensure_ascii=False))
+        ReportRenderer(**options).render_report(result, title)
     
     def export_ast_json(self, file_path: str):
         """
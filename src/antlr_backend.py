@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+АЛЬТЕРНАТИВНЫЙ ПАРСЕР НА ОСНОВЕ ГРАММАТИКИ ANTLR
+
+Разбирает псевдокод парсером, сгенерированным из src/grammars/Pseudocode.g4,
+и преобразует дерево разбора в AST того же вида, что строит Parser.
+Разбор двухэтапный: сначала быстрый режим предсказания SLL с прерыванием
+на первой ошибке, и только если он не справился - полный режим LL
+с обычным восстановлением после ошибок.
+
+Перед использованием парсер нужно сгенерировать:
+    antlr4 -Dlanguage=Python3 src/grammars/Pseudocode.g4
+"""
+
+import os
+import sys
+from typing import Any, Dict, List, Optional
+
+# Добавляем путь для импортов
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.lexer import LexerAnalyzer
+from src.parser import Parser, ASTNode, NodeType
+
+try:
+    from antlr4 import CommonTokenStream, InputStream
+    from antlr4.atn.PredictionMode import PredictionMode
+    from antlr4.error.ErrorListener import ErrorListener
+    from antlr4.error.ErrorStrategy import BailErrorStrategy, DefaultErrorStrategy
+    from antlr4.error.Errors import ParseCancellationException
+except ImportError:
+    ANTLR_RUNTIME_AVAILABLE = False
+    ErrorListener = object
+else:
+    ANTLR_RUNTIME_AVAILABLE = True
+
+try:
+    from src.grammars.PseudocodeLexer import PseudocodeLexer as GeneratedLexer
+    from src.grammars.PseudocodeParser import PseudocodeParser as GeneratedParser
+except ImportError:
+    GENERATED_PARSER_AVAILABLE = False
+else:
+    GENERATED_PARSER_AVAILABLE = True
+
+
+def antlr_available() -> bool:
+    """Проверяет, доступны ли среда выполнения ANTLR и сгенерированный парсер."""
+    return ANTLR_RUNTIME_AVAILABLE and GENERATED_PARSER_AVAILABLE
+
+
+def require_antlr():
+    """Сообщает, чего не хватает для работы ANTLR-парсера."""
+    if not ANTLR_RUNTIME_AVAILABLE:
+        raise RuntimeError("Не установлен antlr4-python3-runtime: pip install -r requirements.txt")
+    if not GENERATED_PARSER_AVAILABLE:
+        raise RuntimeError("Парсер не сгенерирован: antlr4 -Dlanguage=Python3 src/grammars/Pseudocode.g4")
+
+
+class _LexerErrorListener(ErrorListener):
+    """Превращает ошибки лексера ANTLR в RuntimeError, как у PseudocodeLexer."""
+
+    def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
+        text = msg.split('at: ', 1)[-1]
+        raise RuntimeError(f"Неожиданный символ {text} на строке {line}")
+
+
+class _ParserErrorListener(ErrorListener):
+    """Собирает синтаксические ошибки полного (LL) разбора."""
+
+    def __init__(self):
+        super().__init__()
+        self.errors: List[str] = []
+
+    def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
+        self.errors.append(f"Синтаксическая ошибка на строке {line}, позиция {column}: {msg}")
+
+
+class HandWrittenBackend:
+    """Основной разбор: PseudocodeLexer + Parser (для сравнения с ANTLR)."""
+
+    name = 'hand'
+
+    def __init__(self):
+        self.lexer_analyzer = LexerAnalyzer()
+
+    def parse(self, code: str) -> ASTNode:
+        """Разбирает код и возвращает корень AST."""
+        return Parser(self.lexer_analyzer.analyze(code)).parse()
+
+
+class AntlrBackend:
+    """
+    Разбор сгенерированным ANTLR-парсером с двухэтапным предсказанием.
+
+    Атрибут last_mode после разбора содержит 'SLL' или 'LL' - режим,
+    в котором разбор завершился; счетчики sll_count/ll_count накапливаются.
+    """
+
+    name = 'antlr'
+
+    def __init__(self):
+        require_antlr()
+        self.last_mode = None
+        self.sll_count = 0
+        self.ll_count = 0
+
+    def parse(self, code: str) -> ASTNode:
+        """
+        Разбирает код и возвращает корень AST.
+
+        Raises:
+            RuntimeError: При неожиданном символе
+            SyntaxError: При синтаксической ошибке
+        """
+        lexer = GeneratedLexer(InputStream(code))
+        lexer.removeErrorListeners()
+        lexer.addErrorListener(_LexerErrorListener())
+        stream = CommonTokenStream(lexer)
+        stream.fill()
+
+        parser = GeneratedParser(stream)
+        parser.removeErrorListeners()
+
+        # Этап 1: SLL без восстановления - достаточно для подавляющего большинства входов
+        parser._interp.predictionMode = PredictionMode.SLL
+        parser._errHandler = BailErrorStrategy()
+        try:
+            tree = parser.program()
+            self.last_mode = 'SLL'
+            self.sll_count += 1
+        except ParseCancellationException:
+            # Этап 2: полный LL; ошибка здесь - настоящая синтаксическая ошибка
+            stream.seek(0)
+            parser.reset()
+            listener = _ParserErrorListener()
+            parser.addErrorListener(listener)
+            parser._errHandler = DefaultErrorStrategy()
+            parser._interp.predictionMode = PredictionMode.LL
+            tree = parser.program()
+            self.last_mode = 'LL'
+            self.ll_count += 1
+            if listener.errors:
+                raise SyntaxError(listener.errors[0])
+
+        return ParseTreeConverter().convert(tree)
+
+
+class ParseTreeConverter:
+    """Преобразует дерево разбора ANTLR в AST формата Parser."""
+
+    def convert(self, ctx) -> ASTNode:
+        """Преобразует контекст правила program."""
+        statements = [self._statement(statement) for statement in ctx.statement()]
+        return ASTNode(NodeType.PROGRAM, statements=statements)
+
+    def _statement(self, ctx) -> ASTNode:
+        if ctx.assignment():
+            return self._assignment(ctx.assignment())
+        if ctx.conditional():
+            return self._conditional(ctx.conditional())
+        if ctx.loop():
+            return self._loop(ctx.loop())
+        if ctx.output():
+            return self._output(ctx.output())
+        # LBRACE statement* RBRACE
+        return self._brace_block(ctx.LBRACE().getSymbol(), ctx.statement())
+
+    def _brace_block(self, lbrace, statements) -> ASTNode:
+        return ASTNode(
+            NodeType.BLOCK,
+            statements=[self._statement(statement) for statement in statements],
+            line=lbrace.line,
+            column=lbrace.column
+        )
+
+    def _block(self, ctx) -> ASTNode:
+        if ctx.LBRACE():
+            return self._brace_block(ctx.LBRACE().getSymbol(), ctx.statement())
+        statement = self._statement(ctx.statement(0))
+        return ASTNode(
+            NodeType.BLOCK,
+            statements=[statement],
+            line=statement.line,
+            column=statement.column
+        )
+
+    def _empty_block(self, token) -> ASTNode:
+        return ASTNode(NodeType.BLOCK, statements=[], line=token.line, column=token.column)
+
+    def _variable(self, token) -> ASTNode:
+        return ASTNode(NodeType.VARIABLE, name=token.text, line=token.line, column=token.column)
+
+    def _assignment(self, ctx) -> ASTNode:
+        token = ctx.ID().getSymbol()
+        return ASTNode(
+            NodeType.ASSIGNMENT,
+            variable=self._variable(token),
+            value=self._expression(ctx.expression()),
+            line=token.line,
+            column=token.column
+        )
+
+    def _conditional(self, ctx) -> ASTNode:
+        token = ctx.IF().getSymbol()
+        blocks = ctx.block()
+        return ASTNode(
+            NodeType.CONDITIONAL,
+            condition=self._condition(ctx.condition()),
+            then_block=self._block(blocks[0]),
+            else_block=self._block(blocks[1]) if len(blocks) > 1 else None,
+            line=token.line,
+            column=token.column
+        )
+
+    def _loop(self, ctx) -> ASTNode:
+        if ctx.WHILE():
+            token = ctx.WHILE().getSymbol()
+            body = self._block(ctx.block()) if ctx.block() else self._empty_block(token)
+            return ASTNode(
+                NodeType.WHILE_LOOP,
+                condition=self._condition(ctx.condition()),
+                body=body,
+                line=token.line,
+                column=token.column
+            )
+
+        token = ctx.FOR().getSymbol()
+        start, end = ctx.expression()
+        body = self._block(ctx.block()) if ctx.block() else self._empty_block(token)
+        return ASTNode(
+            NodeType.FOR_LOOP,
+            variable=self._variable(ctx.ID().getSymbol()),
+            start=self._expression(start),
+            end=self._expression(end),
+            body=body,
+            line=token.line,
+            column=token.column
+        )
+
+    def _output(self, ctx) -> ASTNode:
+        token = ctx.PRINT().getSymbol()
+        return ASTNode(
+            NodeType.OUTPUT,
+            expression=self._expression(ctx.expression()),
+            line=token.line,
+            column=token.column
+        )
+
+    def _condition(self, ctx) -> ASTNode:
+        expressions = ctx.expression()
+        left = self._expression(expressions[0])
+        operator, right = None, None
+        if ctx.comparison():
+            operator = self._token_name(ctx.comparison().getChild(0).getSymbol())
+            right = self._expression(expressions[1])
+        return ASTNode(
+            NodeType.CONDITION,
+            left=left,
+            operator=operator,
+            right=right,
+            line=left.line,
+            column=left.column
+        )
+
+    def _expression(self, ctx) -> ASTNode:
+        """expression : term ((PLUS | MINUS) term)* и term : factor ((MUL | DIV | MOD) factor)*"""
+        children = list(ctx.getChildren())
+        node = self._operand(children[0])
+        for i in range(1, len(children), 2):
+            right = self._operand(children[i + 1])
+            node = ASTNode(
+                NodeType.BINARY_OP,
+                left=node,
+                operator=self._token_name(children[i].getSymbol()),
+                right=right,
+                line=node.line,
+                column=node.column
+            )
+        return node
+
+    def _operand(self, ctx) -> ASTNode:
+        rule = ctx.getRuleIndex()
+        if rule in (GeneratedParser.RULE_expression, GeneratedParser.RULE_term):
+            return self._expression(ctx)
+        return self._factor(ctx)
+
+    def _factor(self, ctx) -> ASTNode:
+        if ctx.NUMBER():
+            token = ctx.NUMBER().getSymbol()
+            return ASTNode(NodeType.NUMBER, value=int(token.text), line=token.line, column=token.column)
+        if ctx.ID():
+            return self._variable(ctx.ID().getSymbol())
+        if ctx.expression():
+            return self._expression(ctx.expression())
+        token = ctx.string().STRING().getSymbol()
+        return ASTNode(NodeType.STRING, value=token.text[1:-1], line=token.line, column=token.column)
+
+    def _token_name(self, token) -> str:
+        return GeneratedParser.symbolicNames[token.type]
+
+
+def first_difference(left: Any, right: Any, path: str = 'ast') -> Optional[str]:
+    """
+    Находит первое расхождение двух сериализованных AST (результатов to_dict).
+
+    Returns:
+        Путь к расхождению с описанием или None, если деревья совпадают
+    """
+    if isinstance(left, dict) and isinstance(right, dict):
+        for key in sorted(set(left) | set(right)):
+            if key not in left or key not in right:
+                return f"{path}.{key}: поле есть только в одном дереве"
+            difference = first_difference(left[key], right[key], f"{path}.{key}")
+            if difference:
+                return difference
+        return None
+    if isinstance(left, list) and isinstance(right, list):
+        if len(left) != len(right):
+            return f"{path}: длина {len(left)} != {len(right)}"
+        for i, (a, b) in enumerate(zip(left, right)):
+            difference = first_difference(a, b, f"{path}[{i}]")
+            if difference:
+                return difference
+        return None
+    if left != right:
+        return f"{path}: {left!r} != {right!r}"
+    return None
+
+
+def run_backend(backend, code: str) -> Dict[str, Any]:
+    """Разбирает код указанным парсером и возвращает решение и AST."""
+    try:
+        ast = backend.parse(code)
+    except (SyntaxError, RuntimeError) as e:
+        return {'accepted': False, 'error': str(e), 'ast': None}
+    return {'accepted': True, 'error': None, 'ast': ast.to_dict()}
+
+
+def compare_backends(code: str, hand: Optional[HandWrittenBackend] = None,
+                     antlr: Optional[AntlrBackend] = None) -> Dict[str, Any]:
+    """
+    Сверяет решения и AST двух парсеров на одном входе.
+
+    Returns:
+        Словарь с ключами agree, hand, antlr и difference
+    """
+    hand_result = run_backend(hand or HandWrittenBackend(), code)
+    antlr_result = run_backend(antlr or AntlrBackend(), code)
+
+    difference = None
+    if hand_result['accepted'] != antlr_result['accepted']:
+        difference = (f"решения расходятся: hand={hand_result['accepted']}, "
+                      f"antlr={antlr_result['accepted']}")
+    elif hand_result['accepted']:
+        difference = first_difference(hand_result['ast'], antlr_result['ast'])
+
+    return {
+        'agree': difference is None,
+        'hand': hand_result,
+        'antlr': antlr_result,
+        'difference': difference
+    }
@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""
+СТРУКТУРНОЕ СРАВНЕНИЕ ДВУХ ВЕРСИЙ ПРОГРАММЫ
+
+Строит сопоставление узлов двух AST и по нему - список правок: вставки,
+удаления, изменения значений и перемещения поддеревьев с позициями
+в старой и новой версиях. Сопоставление выполняется в три прохода:
+
+1. Совпадающие поддеревья находятся по структурному хешу и сопоставляются
+   целиком, без поэлементного сравнения.
+2. Снизу вверх: несопоставленный узел сопоставляется с узлом того же типа
+   в новой версии, содержащим больше всего его сопоставленных детей.
+3. Сверху вниз: несопоставленные дети сопоставленных узлов сопоставляются
+   по полю, типу и значению.
+
+Использование:
+    python src/ast_diff.py old.pseudo new.pseudo
+"""
+
+import os
+import sys
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+# Добавляем путь для импортов
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.parser import ASTNode, iter_fields
+
+
+INSERT = 'insert'
+DELETE = 'delete'
+UPDATE = 'update'
+MOVE = 'move'
+
+# Минимальный размер поддерева, сопоставляемого по хешу на первом проходе:
+# одиночные листья (переменная x, число 1) встречаются повсюду и
+# сопоставляются по контексту на третьем проходе
+DEFAULT_MIN_SIZE = 2
+
+# Минимальная доля общих детей для сопоставления снизу вверх
+DEFAULT_SIMILARITY = 0.5
+
+
+class _FlatTree:
+    """Дерево, разложенное в массивы в прямом порядке обхода."""
+
+    def __init__(self, ast: ASTNode):
+        self.nodes: List[ASTNode] = []
+        self.parent: List[int] = []
+        self.field: List[Optional[str]] = []
+        self.label: List[Tuple] = []
+        self.children: List[List[int]] = []
+
+        stack: List[Tuple[ASTNode, int, Optional[str]]] = [(ast, -1, None)]
+        while stack:
+            node, parent, field = stack.pop()
+            index = len(self.nodes)
+            self.nodes.append(node)
+            self.parent.append(parent)
+            self.field.append(field)
+            self.children.append([])
+            if parent >= 0:
+                self.children[parent].append(index)
+
+            label = []
+            children = []
+            for name, value in iter_fields(node):
+                if isinstance(value, ASTNode):
+                    children.append((value, name))
+                elif isinstance(value, list):
+                    children.extend((item, name) for item in value if isinstance(item, ASTNode))
+                else:
+                    label.append((name, value))
+            self.label.append(tuple(label))
+            stack.extend((child, index, name) for child, name in reversed(children))
+
+        # Дети всегда идут после родителя, поэтому обход в обратном порядке
+        # встречает узел после всех его потомков
+        count = len(self.nodes)
+        self.size = [1] * count
+        self.hash = [0] * count
+        for index in range(count - 1, -1, -1):
+            child_hashes = []
+            for child in self.children[index]:
+                self.size[index] += self.size[child]
+                child_hashes.append((self.field[child], self.hash[child]))
+            self.hash[index] = hash((self.nodes[index].node_type, self.label[index], tuple(child_hashes)))
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def position(self, index: int) -> Dict[str, int]:
+        node = self.nodes[index]
+        return {'line': node.line, 'column': node.column}
+
+    def describe(self, index: int) -> str:
+        node = self.nodes[index]
+        values = ', '.join(f"{value}" for _, value in self.label[index] if value is not None)
+        return f"{node.node_type.value}({values})" if values else node.node_type.value
+
+
+def _longest_increasing(sequence: List[int]) -> set:
+    """Позиции элементов наибольшей возрастающей подпоследовательности (O(n log n))."""
+    tails: List[int] = []
+    tail_positions: List[int] = []
+    previous = [-1] * len(sequence)
+    for position, value in enumerate(sequence):
+        slot = bisect_left(tails, value)
+        if slot == len(tails):
+            tails.append(value)
+            tail_positions.append(position)
+        else:
+            tails[slot] = value
+            tail_positions[slot] = position
+        previous[position] = tail_positions[slot - 1] if slot else -1
+
+    result = set()
+    position = tail_positions[-1] if tail_positions else -1
+    while position != -1:
+        result.add(position)
+        position = previous[position]
+    return result
+
+
+class ASTDiffer:
+    """Вычисление структурной разницы двух AST."""
+
+    def __init__(self, min_size: int = DEFAULT_MIN_SIZE, similarity: float = DEFAULT_SIMILARITY):
+        """
+        Args:
+            min_size: Минимальный размер поддерева для сопоставления по хешу
+            similarity: Минимальная доля общих детей (коэффициент Дайса)
+                для сопоставления снизу вверх
+        """
+        self.min_size = min_size
+        self.similarity = similarity
+
+    def diff(self, old: ASTNode, new: ASTNode) -> Dict[str, Any]:
+        """
+        Сравнивает две версии программы.
+
+        Returns:
+            Словарь с ключами operations (список правок), summary (число правок
+            по видам), matched (число сопоставленных узлов), old_nodes, new_nodes
+        """
+        self.old = _FlatTree(old)
+        self.new = _FlatTree(new)
+        self.old_to_new = [-1] * len(self.old)
+        self.new_to_old = [-1] * len(self.new)
+        self.identical_roots = set()
+
+        self._match_identical()
+        if self.old_to_new[0] == -1 and self.new_to_old[0] == -1 \
+                and self.old.nodes[0].node_type == self.new.nodes[0].node_type:
+            self._link(0, 0)
+        self._match_bottom_up()
+        self._match_top_down()
+
+        operations = self._edit_script()
+        summary = {INSERT: 0, DELETE: 0, UPDATE: 0, MOVE: 0}
+        for operation in operations:
+            summary[operation['op']] += 1
+
+        return {
+            'operations': operations,
+            'summary': summary,
+            'matched': sum(1 for partner in self.old_to_new if partner != -1),
+            'old_nodes': len(self.old),
+            'new_nodes': len(self.new)
+        }
+
+    def _link(self, old_index: int, new_index: int):
+        self.old_to_new[old_index] = new_index
+        self.new_to_old[new_index] = old_index
+
+    # ------------------------------------------------------------------
+    # Проход 1: совпадающие поддеревья
+    # ------------------------------------------------------------------
+
+    def _match_identical(self):
+        old, new = self.old, self.new
+        pools: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        for index in range(len(new)):
+            if new.size[index] >= self.min_size:
+                pools[(new.hash[index], new.size[index])].append(index)
+
+        scale = len(new) / len(old)
+        index = 0
+        while index < len(old):
+            size = old.size[index]
+            if size >= self.min_size:
+                pool = pools.get((old.hash[index], size))
+                partner = self._nearest_free(pool, int(index * scale), size) if pool else -1
+                if partner != -1:
+                    # Одинаковые поддеревья совпадают и в порядке обхода
+                    for offset in range(size):
+                        self._link(index + offset, partner + offset)
+                    self.identical_roots.add(index)
+                    index += size
+                    continue
+            index += 1
+
+    def _nearest_free(self, pool: List[int], target: int, size: int) -> int:
+        """Ближайший к target корень из pool, все узлы поддерева которого свободны."""
+        new_to_old = self.new_to_old
+        right = bisect_left(pool, target)
+        left = right - 1
+        while left >= 0 or right < len(pool):
+            if right < len(pool) and (left < 0 or pool[right] - target <= target - pool[left]):
+                candidate = pool[right]
+                right += 1
+            else:
+                candidate = pool[left]
+                left -= 1
+            if new_to_old[candidate] == -1 and \
+                    all(partner == -1 for partner in new_to_old[candidate:candidate + size]):
+                return candidate
+        return -1
+
+    # ------------------------------------------------------------------
+    # Проход 2: снизу вверх по сопоставленным детям
+    # ------------------------------------------------------------------
+
+    def _match_bottom_up(self):
+        old, new = self.old, self.new
+        for index in range(len(old) - 1, -1, -1):
+            children = old.children[index]
+            if self.old_to_new[index] != -1 or not children:
+                continue
+
+            votes: Dict[int, int] = defaultdict(int)
+            node_type = old.nodes[index].node_type
+            for child in children:
+                partner = self.old_to_new[child]
+                if partner == -1:
+                    continue
+                candidate = new.parent[partner]
+                if candidate != -1 and self.new_to_old[candidate] == -1 \
+                        and new.nodes[candidate].node_type == node_type:
+                    votes[candidate] += 1
+
+            best, best_score = -1, 0.0
+            for candidate, shared in votes.items():
+                score = 2 * shared / (len(children) + len(new.children[candidate]))
+                if score > best_score:
+                    best, best_score = candidate, score
+            if best != -1 and best_score >= self.similarity:
+                self._link(index, best)
+
+    # ------------------------------------------------------------------
+    # Проход 3: сверху вниз по детям сопоставленных узлов
+    # ------------------------------------------------------------------
+
+    def _match_top_down(self):
+        old, new = self.old, self.new
+        for index in range(len(old)):
+            partner = self.old_to_new[index]
+            if partner == -1:
+                continue
+
+            free_new: Dict[Tuple[Optional[str], Any], List[int]] = defaultdict(list)
+            for child in new.children[partner]:
+                if self.new_to_old[child] == -1:
+                    free_new[(new.field[child], new.nodes[child].node_type)].append(child)
+            if not free_new:
+                continue
+
+            pending = []
+            for child in old.children[index]:
+                if self.old_to_new[child] != -1:
+                    continue
+                candidates = free_new.get((old.field[child], old.nodes[child].node_type))
+                if not candidates:
+                    continue
+                # Сначала узел с тем же значением, затем первый по порядку
+                same_label = next((c for c in candidates if new.label[c] == old.label[child]), None)
+                if same_label is not None:
+                    candidates.remove(same_label)
+                    self._link(child, same_label)
+                else:
+                    pending.append(child)
+
+            for child in pending:
+                candidates = free_new.get((old.field[child], old.nodes[child].node_type))
+                if candidates:
+                    self._link(child, candidates.pop(0))
+
+    # ------------------------------------------------------------------
+    # Построение списка правок
+    # ------------------------------------------------------------------
+
+    def _edit_script(self) -> List[Dict[str, Any]]:
+        old, new = self.old, self.new
+        deletes, changes, inserts = [], [], []
+
+        index = 0
+        while index < len(old):
+            current, index = index, index + 1
+            partner = self.old_to_new[current]
+            parent = old.parent[current]
+            if current in self.identical_roots:
+                # Внутри совпавшего поддерева правок нет - проверяется только его место
+                if parent != -1 and (self.old_to_new[parent] != new.parent[partner]
+                                     or old.field[current] != new.field[partner]):
+                    changes.append(self._move(current, partner))
+                index = current + old.size[current]
+                continue
+            if partner == -1:
+                if parent == -1 or self.old_to_new[parent] != -1:
+                    deletes.append({
+                        'op': DELETE,
+                        'node': old.describe(current),
+                        'size': old.size[current],
+                        'old': old.position(current),
+                        'new': None
+                    })
+                continue
+
+            if old.label[current] != new.label[partner]:
+                changes.append({
+                    'op': UPDATE,
+                    'node': old.describe(current),
+                    'old_value': dict(old.label[current]),
+                    'new_value': dict(new.label[partner]),
+                    'old': old.position(current),
+                    'new': new.position(partner)
+                })
+
+            if parent != -1 and (self.old_to_new[parent] != new.parent[partner]
+                                 or old.field[current] != new.field[partner]):
+                changes.append(self._move(current, partner))
+
+            if len(old.children[current]) > 1:
+                changes.extend(self._reordered_children(current, partner))
+
+        for index in range(len(new)):
+            parent = new.parent[index]
+            if self.new_to_old[index] == -1 and (parent == -1 or self.new_to_old[parent] != -1):
+                inserts.append({
+                    'op': INSERT,
+                    'node': new.describe(index),
+                    'size': new.size[index],
+                    'old': None,
+                    'new': new.position(index)
+                })
+
+        return deletes + changes + inserts
+
+    def _move(self, old_index: int, new_index: int) -> Dict[str, Any]:
+        return {
+            'op': MOVE,
+            'node': self.old.describe(old_index),
+            'size': self.old.size[old_index],
+            'old': self.old.position(old_index),
+            'new': self.new.position(new_index)
+        }
+
+    def _reordered_children(self, index: int, partner: int) -> List[Dict[str, Any]]:
+        """Перемещения внутри одного списка детей (дети вне наибольшей упорядоченной части)."""
+        new_order = {child: position for position, child in enumerate(self.new.children[partner])}
+        kept = []
+        for child in self.old.children[index]:
+            child_partner = self.old_to_new[child]
+            if child_partner in new_order and self.old.field[child] == self.new.field[child_partner]:
+                kept.append((child, new_order[child_partner]))
+        if len(kept) < 2:
+            return []
+
+        in_order = _longest_increasing([position for _, position in kept])
+        return [self._move(child, self.old_to_new[child])
+                for position, (child, _) in enumerate(kept) if position not in in_order]
+
+
+def diff_ast(old: ASTNode, new: ASTNode) -> Dict[str, Any]:
+    """Сравнивает две версии программы с параметрами по умолчанию."""
+    return ASTDiffer().diff(old, new)
+
+
+def print_diff(result: Dict[str, Any]):
+    """Выводит список правок."""
+    symbols = {INSERT: '➕', DELETE: '➖', UPDATE: '✏️ ', MOVE: '🔀'}
+    summary = result['summary']
+    print(f"🔍 Правок: {len(result['operations'])} (вставок {summary[INSERT]}, удалений {summary[DELETE]}, "
+          f"изменений {summary[UPDATE]}, перемещений {summary[MOVE]})")
+    print(f"   Сопоставлено узлов: {result['matched']} из {result['old_nodes']} → {result['new_nodes']}")
+    for operation in result['operations']:
+        old, new = operation['old'], operation['new']
+        where = ' → '.join(f"{pos['line']}:{pos['column']}" if pos else '-' for pos in (old, new))
+        line = f"   {symbols[operation['op']]} {operation['op']:<7} {operation['node']:<30} [{where}]"
+        if operation['op'] == UPDATE:
+            line += f"  {operation['old_value']} → {operation['new_value']}"
+        print(line)
+
+
+def main():
+    """Сравнивает две версии программы из файлов."""
+    from src.analyzer import PseudocodeAnalyzer
+
+    if len(sys.argv) != 3:
+        print("Использование: python src/ast_diff.py old.pseudo new.pseudo")
+        return 2
+
+    analyzer = PseudocodeAnalyzer()
+    trees = []
+    for path in sys.argv[1:]:
+        result = analyzer.analyze_file(path)
+        if not result['ast']:
+            print(f"❌ {path}: {result['errors']}")
+            return 1
+        trees.append(result['ast'])
+
+    print_diff(diff_ast(*trees))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
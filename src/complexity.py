@@ -0,0 +1,497 @@
+#!/usr/bin/env python3
+"""
+СТАТИЧЕСКАЯ ОЦЕНКА СЛОЖНОСТИ ЦИКЛОВ
+
+Обходит вложенность циклов FOR_LOOP/WHILE_LOOP и для каждого гнезда циклов
+выводит символическое число итераций, оценку в нотации O(...) и конкретную
+оценку числа итераций. Позволяет отклонять заведомо квадратичные (и хуже)
+программы до их выполнения.
+
+Каждый узел AST посещается один раз, поэтому время работы линейно
+относительно размера дерева.
+"""
+
+import math
+import os
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+# Добавляем путь для импортов
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.parser import ASTNode, NodeType
+
+
+# Маркер значения, которое нельзя вычислить статически
+UNKNOWN = object()
+
+# Стоимость: (неограниченность, степень n, степень log n)
+Cost = Tuple[bool, int, int]
+CONSTANT: Cost = (False, 0, 0)
+
+OPERATOR_SYMBOLS = {
+    'PLUS': '+', 'MINUS': '-', 'MUL': '*', 'DIV': '/', 'MOD': '%',
+    'EQ': '==', 'NEQ': '!=', 'LT': '<', 'GT': '>', 'LEQ': '<=', 'GEQ': '>=',
+}
+
+# Направление изменения переменной, при котором условие рано или поздно ложно
+_DECREASING_OPERATORS = ('GT', 'GEQ')
+_INCREASING_OPERATORS = ('LT', 'LEQ')
+_MIRRORED_OPERATORS = {'GT': 'LT', 'LT': 'GT', 'GEQ': 'LEQ', 'LEQ': 'GEQ', 'EQ': 'EQ', 'NEQ': 'NEQ'}
+
+
+def expression_text(node: ASTNode) -> str:
+    """Восстанавливает текстовую запись выражения для отчетов."""
+    node_type = node.node_type
+    if node_type == NodeType.NUMBER:
+        return str(node.value)
+    if node_type == NodeType.STRING:
+        return f'"{node.value}"'
+    if node_type == NodeType.VARIABLE:
+        return node.name
+    if node_type == NodeType.BINARY_OP:
+        left = expression_text(node.left)
+        right = expression_text(node.right)
+        if node.right.node_type == NodeType.BINARY_OP:
+            right = f"({right})"
+        return f"{left} {OPERATOR_SYMBOLS.get(node.operator, node.operator)} {right}"
+    if node_type == NodeType.ARRAY_ACCESS:
+        return f"{expression_text(node.array)}[{expression_text(node.index)}]"
+    return node_type.value
+
+
+def format_complexity(cost: Cost) -> str:
+    """Форматирует стоимость в нотации O(...)."""
+    unbounded, degree, log = cost
+    if unbounded:
+        return "O(∞)"
+    parts = []
+    if degree == 1:
+        parts.append("n")
+    elif degree > 1:
+        parts.append(f"n^{degree}")
+    if log == 1:
+        parts.append("log n")
+    elif log > 1:
+        parts.append(f"log^{log} n")
+    return f"O({' '.join(parts) or '1'})"
+
+
+def _multiply(a: Cost, b: Cost) -> Cost:
+    return (a[0] or b[0], a[1] + b[1], a[2] + b[2])
+
+
+def _has_variables(node: ASTNode) -> bool:
+    """Проверяет, зависит ли выражение от переменных."""
+    node_type = node.node_type
+    if node_type in (NodeType.VARIABLE, NodeType.ARRAY_ACCESS):
+        return True
+    if node_type == NodeType.BINARY_OP:
+        return _has_variables(node.left) or _has_variables(node.right)
+    if node_type == NodeType.ARRAY:
+        return any(_has_variables(element) for element in node.elements)
+    return False
+
+
+def _variable_names(node: ASTNode, names: List[str]) -> List[str]:
+    """Собирает имена переменных выражения."""
+    node_type = node.node_type
+    if node_type == NodeType.VARIABLE:
+        names.append(node.name)
+    elif node_type == NodeType.BINARY_OP:
+        _variable_names(node.left, names)
+        _variable_names(node.right, names)
+    elif node_type == NodeType.ARRAY_ACCESS:
+        _variable_names(node.array, names)
+        _variable_names(node.index, names)
+    return names
+
+
+class _LoopFrame:
+    """Присваивания, выполненные в теле цикла (включая вложенные циклы)."""
+
+    def __init__(self):
+        # имя переменной -> список (вид изменения, операция, шаг)
+        self.updates: Dict[str, List[Tuple[str, str, Any]]] = {}
+
+    def merge_into(self, parent: '_LoopFrame'):
+        for name, updates in self.updates.items():
+            parent.updates.setdefault(name, []).extend(updates)
+
+
+class ComplexityAnalyzer:
+    """
+    Статический оценщик сложности гнезд циклов.
+
+    Границы range(start, end), зависящие от переменных, и циклы while
+    с шаговым изменением переменной условия считаются линейными по n;
+    умножение или деление переменной условия дает логарифм. Если переменные
+    условия while не изменяются в теле (или изменяются «не в ту сторону»),
+    цикл помечается как неограниченный.
+    """
+
+    def __init__(self, assumed_n: int = 1000, max_degree: Optional[int] = None):
+        """
+        Инициализация оценщика.
+
+        Args:
+            assumed_n: Значение n для конкретной оценки, если граница
+                не вычисляется статически
+            max_degree: Максимально допустимая степень n (None - без проверки)
+        """
+        self.assumed_n = assumed_n
+        self.max_degree = max_degree
+
+    def analyze(self, ast: ASTNode) -> Dict[str, Any]:
+        """
+        Оценивает сложность программы.
+
+        Args:
+            ast: Корневой узел AST (программа)
+
+        Returns:
+            Словарь с результатами оценки:
+                - complexity: итоговая оценка O(...)
+                - degree, log, unbounded: составляющие оценки
+                - iterations: оценка общего числа итераций (None - не ограничено)
+                - exceeds_limit: превышена ли max_degree
+                - nests: список гнезд циклов с построчными данными
+        """
+        self._env: Dict[str, Any] = {}
+        self._frames: List[_LoopFrame] = []
+        self._branch_depth = 0
+        self._nests: List[Dict[str, Any]] = []
+        self._loops: List[Dict[str, Any]] = []
+
+        cost, iterations = self._visit(ast)
+
+        exceeds = False
+        if self.max_degree is not None:
+            exceeds = cost[0] or cost[1] > self.max_degree
+
+        return {
+            'complexity': format_complexity(cost),
+            'degree': cost[1],
+            'log': cost[2],
+            'unbounded': cost[0],
+            'iterations': iterations,
+            'exceeds_limit': exceeds,
+            'nests': self._nests
+        }
+
+    # ------------------------------------------------------------------
+    # Обход операторов
+    # ------------------------------------------------------------------
+
+    def _visit(self, node: ASTNode) -> Tuple[Cost, Optional[int]]:
+        """Возвращает стоимость оператора и число итераций циклов в нем."""
+        node_type = node.node_type
+
+        if node_type in (NodeType.PROGRAM, NodeType.BLOCK):
+            cost, iterations = CONSTANT, 0
+            for statement in node.statements:
+                statement_cost, statement_iterations = self._visit(statement)
+                cost = max(cost, statement_cost)
+                iterations = None if iterations is None or statement_iterations is None \
+                    else iterations + statement_iterations
+            return cost, iterations
+
+        if node_type == NodeType.ASSIGNMENT:
+            self._record_assignment(node)
+            return CONSTANT, 0
+
+        if node_type == NodeType.CONDITIONAL:
+            self._branch_depth += 1
+            cost, iterations = self._visit(node.then_block)
+            if node.else_block:
+                else_cost, else_iterations = self._visit(node.else_block)
+                cost = max(cost, else_cost)
+                iterations = None if iterations is None or else_iterations is None \
+                    else max(iterations, else_iterations)
+            self._branch_depth -= 1
+            return cost, iterations
+
+        if node_type in (NodeType.FOR_LOOP, NodeType.WHILE_LOOP):
+            return self._visit_loop(node)
+
+        return CONSTANT, 0
+
+    def _record_assignment(self, node: ASTNode):
+        """Учитывает присваивание в окружении констант и в кадре цикла."""
+        name = node.variable.name
+        if self._frames:
+            self._frames[-1].updates.setdefault(name, []).append(self._classify_update(name, node.value))
+        if self._frames or self._branch_depth:
+            self._env[name] = UNKNOWN
+        else:
+            self._env[name] = self._evaluate(node.value)
+
+    def _visit_loop(self, node: ASTNode) -> Tuple[Cost, Optional[int]]:
+        """Оценивает цикл вместе с вложенными в него циклами."""
+        outermost = not self._frames
+        if outermost:
+            self._loops = []
+
+        entry = {
+            'kind': node.node_type.value,
+            'line': node.line,
+            'column': node.column,
+            'depth': len(self._frames) + 1
+        }
+        self._loops.append(entry)
+
+        if node.node_type == NodeType.FOR_LOOP:
+            bound = self._for_bound(node)
+            self._env[node.variable.name] = UNKNOWN
+        else:
+            bound = self._while_snapshot(node)
+
+        self._frames.append(_LoopFrame())
+        body_cost, body_iterations = self._visit(node.body)
+        frame = self._frames.pop()
+        if self._frames:
+            frame.merge_into(self._frames[-1])
+
+        if node.node_type == NodeType.WHILE_LOOP:
+            bound = self._while_bound(node, bound, frame)
+
+        own_cost, count, estimated = bound['cost'], bound['count'], bound['estimated']
+        entry.update({
+            'bound': bound['text'],
+            'complexity': format_complexity(own_cost),
+            'count': count,
+            'estimated': estimated
+        })
+        if bound.get('reason'):
+            entry['reason'] = bound['reason']
+
+        cost = _multiply(own_cost, body_cost)
+        if cost[0] or count is None or body_iterations is None:
+            iterations = None
+        else:
+            iterations = count * (1 + body_iterations)
+
+        if outermost:
+            self._nests.append({
+                'kind': entry['kind'],
+                'line': entry['line'],
+                'column': entry['column'],
+                'complexity': format_complexity(cost),
+                'degree': cost[1],
+                'log': cost[2],
+                'unbounded': cost[0],
+                'iterations': iterations,
+                'loops': self._loops
+            })
+
+        return cost, iterations
+
+    # ------------------------------------------------------------------
+    # Границы циклов
+    # ------------------------------------------------------------------
+
+    def _for_bound(self, node: ASTNode) -> Dict[str, Any]:
+        """Вычисляет границу цикла for по range(start, end)."""
+        start_text = expression_text(node.start)
+        if node.start.node_type == NodeType.BINARY_OP:
+            start_text = f"({start_text})"
+        end_text = expression_text(node.end)
+        text = end_text if start_text == '0' else f"{end_text} - {start_text}"
+
+        symbolic = _has_variables(node.start) or _has_variables(node.end)
+        start, end = self._evaluate(node.start), self._evaluate(node.end)
+        if isinstance(start, int) and isinstance(end, int):
+            count, estimated = max(0, end - start), False
+        else:
+            count, estimated = self.assumed_n, True
+
+        return {
+            'cost': (False, 1 if symbolic else 0, 0),
+            'text': text,
+            'count': count,
+            'estimated': estimated
+        }
+
+    def _while_snapshot(self, node: ASTNode) -> Dict[str, Any]:
+        """Запоминает значения переменных условия до входа в цикл."""
+        condition = node.condition
+        names = _variable_names(condition.left, [])
+        if condition.right is not None:
+            _variable_names(condition.right, names)
+        return {
+            'names': names,
+            'initial': {name: self._env.get(name, UNKNOWN) for name in names},
+            'left': self._evaluate(condition.left),
+            'right': self._evaluate(condition.right) if condition.right is not None else UNKNOWN
+        }
+
+    def _while_bound(self, node: ASTNode, snapshot: Dict[str, Any], frame: _LoopFrame) -> Dict[str, Any]:
+        """Вычисляет границу цикла while по изменениям переменных условия."""
+        condition = node.condition
+        text = expression_text(condition.left)
+        if condition.operator is not None:
+            text += f" {OPERATOR_SYMBOLS[condition.operator]} {expression_text(condition.right)}"
+
+        if not snapshot['names']:
+            # Условие без переменных: либо ни одной итерации, либо бесконечный цикл
+            value = snapshot['left']
+            if condition.operator is not None:
+                value = self._compare(condition.operator, value, snapshot['right'])
+            if value is not UNKNOWN and not value:
+                return {'cost': CONSTANT, 'text': text, 'count': 0, 'estimated': False}
+            return self._unbounded(text, "условие цикла не зависит от переменных")
+
+        best = None
+        for name in snapshot['names']:
+            for kind, operator, step in frame.updates.get(name, []):
+                candidate = self._estimate_while(node, snapshot, name, kind, operator, step)
+                if candidate is not None and (best is None or candidate['cost'] < best['cost']):
+                    best = candidate
+
+        if best is None:
+            return self._unbounded(text, "переменные условия не изменяются в теле цикла")
+        best['text'] = text
+        return best
+
+    def _estimate_while(self, node: ASTNode, snapshot: Dict[str, Any], name: str,
+                        kind: str, operator: str, step: Any) -> Optional[Dict[str, Any]]:
+        """Оценивает число итераций while для одного изменения переменной условия."""
+        condition = node.condition
+        if kind == 'other':
+            return {'cost': (False, 1, 0), 'count': self.assumed_n, 'estimated': True}
+
+        # Приводим условие к виду «name OP bound»
+        comparison, bound = condition.operator, UNKNOWN
+        if condition.left.node_type == NodeType.VARIABLE and condition.left.name == name:
+            bound = snapshot['right']
+        elif condition.right is not None and condition.right.node_type == NodeType.VARIABLE \
+                and condition.right.name == name:
+            comparison, bound = _MIRRORED_OPERATORS[comparison], snapshot['left']
+        elif comparison is None:
+            comparison, bound = 'NEQ', 0
+
+        if isinstance(step, int) and comparison is not None:
+            if kind == 'linear':
+                direction = step if operator == 'PLUS' else -step
+            else:
+                direction = 1 if (operator == 'MUL') == (step > 1) else -1
+            if direction == 0 or (kind == 'geometric' and abs(step) <= 1):
+                return self._unbounded(None, f"переменная '{name}' не приближается к границе")
+            if (comparison in _DECREASING_OPERATORS and direction > 0) or \
+                    (comparison in _INCREASING_OPERATORS and direction < 0):
+                return self._unbounded(None, f"переменная '{name}' удаляется от границы")
+
+        initial = snapshot['initial'].get(name, UNKNOWN)
+        concrete = isinstance(initial, int) and isinstance(bound, int) and isinstance(step, int) and step != 0
+
+        if kind == 'linear':
+            if concrete:
+                count = max(0, math.ceil(abs(bound - initial) / abs(step)))
+                return {'cost': (False, 1, 0), 'count': count, 'estimated': False}
+            return {'cost': (False, 1, 0), 'count': self.assumed_n, 'estimated': True}
+
+        if concrete and abs(step) > 1 and initial != 0 and bound != 0:
+            ratio = max(abs(bound), abs(initial)) / min(abs(bound), abs(initial))
+            count = math.ceil(math.log(ratio, abs(step))) if ratio > 1 else 0
+            return {'cost': (False, 0, 1), 'count': count, 'estimated': False}
+        return {'cost': (False, 0, 1), 'count': max(1, math.ceil(math.log2(self.assumed_n))), 'estimated': True}
+
+    def _unbounded(self, text: Optional[str], reason: str) -> Dict[str, Any]:
+        return {'cost': (True, 0, 0), 'text': text, 'count': None, 'estimated': False, 'reason': reason}
+
+    # ------------------------------------------------------------------
+    # Вспомогательные вычисления
+    # ------------------------------------------------------------------
+
+    def _classify_update(self, name: str, value: ASTNode) -> Tuple[str, str, Any]:
+        """Определяет вид изменения переменной: линейное, геометрическое или иное."""
+        if value.node_type == NodeType.BINARY_OP and value.operator in ('PLUS', 'MINUS', 'MUL', 'DIV'):
+            left, right = value.left, value.right
+            other = None
+            if left.node_type == NodeType.VARIABLE and left.name == name:
+                other = right
+            elif value.operator in ('PLUS', 'MUL') and right.node_type == NodeType.VARIABLE \
+                    and right.name == name:
+                other = left
+            if other is not None and name not in _variable_names(other, []):
+                kind = 'linear' if value.operator in ('PLUS', 'MINUS') else 'geometric'
+                step = self._evaluate(other)
+                return kind, value.operator, step if isinstance(step, int) else UNKNOWN
+        return 'other', '', UNKNOWN
+
+    def _evaluate(self, node: Optional[ASTNode]) -> Any:
+        """Вычисляет целочисленное выражение по известным константам."""
+        if node is None:
+            return UNKNOWN
+        node_type = node.node_type
+        if node_type == NodeType.NUMBER:
+            return node.value
+        if node_type == NodeType.VARIABLE:
+            return self._env.get(node.name, UNKNOWN)
+        if node_type == NodeType.BINARY_OP:
+            left, right = self._evaluate(node.left), self._evaluate(node.right)
+            if not isinstance(left, int) or not isinstance(right, int):
+                return UNKNOWN
+            operator = node.operator
+            if operator == 'PLUS':
+                return left + right
+            if operator == 'MINUS':
+                return left - right
+            if operator == 'MUL':
+                return left * right
+            if operator in ('DIV', 'MOD') and right != 0:
+                return left // right if operator == 'DIV' else left % right
+        return UNKNOWN
+
+    def _compare(self, operator: str, left: Any, right: Any) -> Any:
+        if not isinstance(left, int) or not isinstance(right, int):
+            return UNKNOWN
+        return {
+            'EQ': left == right, 'NEQ': left != right, 'LT': left < right,
+            'GT': left > right, 'LEQ': left <= right, 'GEQ': left >= right
+        }[operator]
+
+
+def print_complexity_report(report: Dict[str, Any]):
+    """Выводит отчет об оценке сложности."""
+    print(f"📈 Итоговая оценка: {report['complexity']}")
+    iterations = report['iterations']
+    print(f"   Оценка числа итераций: {iterations if iterations is not None else 'не ограничено'}")
+    for nest in report['nests']:
+        print(f"\n   🔁 Гнездо циклов на строке {nest['line']}: {nest['complexity']}")
+        for loop in nest['loops']:
+            indent = "   " * loop['depth']
+            count = loop['count'] if loop['count'] is not None else '∞'
+            mark = '≈' if loop['estimated'] else '='
+            line = f"   {indent}{loop['kind']} (строка {loop['line']}): {loop['complexity']}, итераций {mark} {count}"
+            if loop.get('bound'):
+                line += f"  [{loop['bound']}]"
+            if loop.get('reason'):
+                line += f"  ⚠️  {loop['reason']}"
+            print(line)
+
+
+def main():
+    """Оценивает сложность программ из файлов, переданных в командной строке."""
+    from src.analyzer import PseudocodeAnalyzer
+
+    paths = sys.argv[1:] or [
+        os.path.join(os.path.dirname(__file__), '..', 'examples', 'factorial.pseudo'),
+        os.path.join(os.path.dirname(__file__), '..', 'tests', 'test_cases', 'loops.pseudo'),
+    ]
+
+    analyzer = PseudocodeAnalyzer()
+    estimator = ComplexityAnalyzer()
+    for path in paths:
+        print("=" * 60)
+        print(f"📄 {path}")
+        print("=" * 60)
+        result = analyzer.analyze_file(path)
+        if not result['ast']:
+            print(f"❌ Ошибки анализа: {result['errors']}")
+            continue
+        print_complexity_report(estimator.analyze(result['ast']))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,496 @@
+#!/usr/bin/env python3
+"""
+СТАТИСТИКА ТОКЕНОВ ПО КОРПУСУ ПРОГРАММ
+
+Потоковый сбор статистики по множеству файлов: число токенов каждого типа,
+частые идентификаторы, гистограммы длин и сводка по каждому файлу.
+
+Память ограничена независимо от размера корпуса:
+- частоты идентификаторов считает скетч Мисры-Гриса (HeavyHitters) из
+  не более чем 2k счетчиков; оценка частоты занижена не больше чем на
+  N/(k+1), где N - число учтенных идентификаторов;
+- гистограммы хранят счетчики логарифмических корзин (не больше 64);
+- сводки по файлам не накапливаются, а сразу передаются потребителю
+  (например, пишутся строками JSON).
+
+Все агрегаты объединяются операцией merge, поэтому рабочие процессы пула
+обрабатывают свои пачки файлов независимо, а основной процесс складывает
+их частичные результаты.
+
+Использование:
+    python src/corpus_stats.py examples tests/test_cases --workers 4
+    python src/corpus_stats.py corpus/ --summaries files.jsonl --json stats.json
+"""
+
+import argparse
+import heapq
+import json
+import multiprocessing
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+# Добавляем путь для импортов
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.lexer import PseudocodeLexer
+
+DEFAULT_TOP_K = 1000
+DEFAULT_BATCH_SIZE = 64
+
+Summary = Dict[str, Any]
+
+
+class HeavyHitters:
+    """
+    Скетч Мисры-Гриса для поиска частых элементов потока.
+
+    Хранит не более 2k счетчиков: при переполнении из всех счетчиков
+    вычитается (k+1)-е по величине значение, и неположительные удаляются.
+    Каждое такое вычитание уменьшает не меньше k+1 счетчиков, поэтому
+    суммарная ошибка error не превосходит total / (k+1), а оценка частоты
+    лежит в пределах [истинная - error, истинная]. Объединение скетчей
+    сохраняет ту же гарантию.
+    """
+
+    def __init__(self, k: int = DEFAULT_TOP_K):
+        if k < 1:
+            raise ValueError("Размер скетча должен быть положительным")
+        self.k = k
+        self.counters: Dict[str, int] = {}
+        self.total = 0
+        self.error = 0
+
+    def add(self, item: str, count: int = 1):
+        """Учитывает count вхождений элемента."""
+        self.total += count
+        self.counters[item] = self.counters.get(item, 0) + count
+        if len(self.counters) > 2 * self.k:
+            self._prune()
+
+    def update(self, counts: Dict[str, int]):
+        """Учитывает словарь частот (например, идентификаторы одного файла)."""
+        counters = self.counters
+        for item, count in counts.items():
+            self.total += count
+            counters[item] = counters.get(item, 0) + count
+        if len(counters) > 2 * self.k:
+            self._prune()
+
+    def merge(self, other: 'HeavyHitters'):
+        """Добавляет к скетчу другой скетч."""
+        self.update(other.counters)
+        # update учел только счетчики other, но не уже вычтенное из него
+        self.total += other.total - sum(other.counters.values())
+        self.error += other.error
+
+    def _prune(self):
+        """Оставляет не больше k счетчиков."""
+        if len(self.counters) <= self.k:
+            return
+        threshold = heapq.nlargest(self.k + 1, self.counters.values())[-1]
+        self.error += threshold
+        self.counters = {item: count - threshold
+                         for item, count in self.counters.items() if count > threshold}
+
+    def estimate(self, item: str) -> int:
+        """Нижняя оценка частоты элемента."""
+        return self.counters.get(item, 0)
+
+    def top(self, n: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Самые частые элементы с оценками, по убыванию частоты."""
+        ranked = sorted(self.counters.items(), key=lambda entry: (-entry[1], entry[0]))
+        return ranked if n is None else ranked[:n]
+
+    def to_dict(self) -> Dict[str, Any]:
+        self._prune()
+        return {'k': self.k, 'total': self.total, 'error': self.error,
+                'counters': dict(self.top())}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'HeavyHitters':
+        sketch = cls(data['k'])
+        sketch.total = data['total']
+        sketch.error = data['error']
+        sketch.counters = dict(data['counters'])
+        return sketch
+
+
+class Histogram:
+    """
+    Гистограмма неотрицательных целых с логарифмическими корзинами.
+
+    Значение v попадает в корзину v.bit_length(): 0, 1, 2-3, 4-7, 8-15 и т.д.
+    Кроме корзин хранятся число значений, сумма, минимум и максимум.
+    """
+
+    def __init__(self):
+        self.buckets: List[int] = []
+        self.count = 0
+        self.total = 0
+        self.min: Optional[int] = None
+        self.max: Optional[int] = None
+
+    def add(self, value: int, count: int = 1):
+        """Учитывает count значений value."""
+        bucket = value.bit_length()
+        if bucket >= len(self.buckets):
+            self.buckets.extend([0] * (bucket + 1 - len(self.buckets)))
+        self.buckets[bucket] += count
+        self.count += count
+        self.total += value * count
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def update(self, counts: Dict[int, int]):
+        """Учитывает словарь {значение: число повторений}."""
+        for value, count in counts.items():
+            self.add(value, count)
+
+    def merge(self, other: 'Histogram'):
+        """Добавляет к гистограмме другую."""
+        if len(other.buckets) > len(self.buckets):
+            self.buckets.extend([0] * (len(other.buckets) - len(self.buckets)))
+        for bucket, count in enumerate(other.buckets):
+            self.buckets[bucket] += count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+
+    @staticmethod
+    def bucket_range(bucket: int) -> Tuple[int, int]:
+        """Наименьшее и наибольшее значение корзины."""
+        if bucket == 0:
+            return 0, 0
+        return 1 << (bucket - 1), (1 << bucket) - 1
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> int:
+        """Верхняя граница корзины, в которую попадает квантиль q."""
+        if not self.count:
+            return 0
+        rank = q * self.count
+        seen = 0
+        for bucket, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= rank:
+                return min(self.bucket_range(bucket)[1], self.max)
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'buckets': list(self.buckets), 'count': self.count, 'total': self.total,
+                'min': self.min, 'max': self.max}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Histogram':
+        histogram = cls()
+        histogram.buckets = list(data['buckets'])
+        histogram.count = data['count']
+        histogram.total = data['total']
+        histogram.min = data['min']
+        histogram.max = data['max']
+        return histogram
+
+
+class CorpusStatistics:
+    """
+    Объединяемая статистика токенов по множеству файлов.
+
+    Файл учитывается целиком или не учитывается вовсе: если лексер
+    останавливается с ошибкой, частичные счетчики файла отбрасываются,
+    а файл засчитывается в failed.
+    """
+
+    HISTOGRAMS = (
+        'tokens_per_file',    # Токенов в файле
+        'lines_per_file',     # Строк в файле
+        'tokens_per_line',    # Токенов в непустой строке
+        'token_length',       # Длина текста токена
+        'identifier_length',  # Длина идентификатора
+    )
+
+    def __init__(self, top_k: int = DEFAULT_TOP_K):
+        self.files = 0
+        self.failed = 0
+        self.tokens = 0
+        self.lines = 0
+        self.token_types: Dict[str, int] = {}
+        self.identifiers = HeavyHitters(top_k)
+        self.histograms = {name: Histogram() for name in self.HISTOGRAMS}
+        self.lexer: Optional[PseudocodeLexer] = None
+
+    def add_tokens(self, name: str, tokens: Iterable[Dict[str, Any]],
+                   lines: Optional[int] = None) -> Summary:
+        """
+        Учитывает поток токенов одного файла.
+
+        Args:
+            name: Имя файла для сводки
+            tokens: Токены в формате PseudocodeLexer.tokenize (или iter_tokens)
+            lines: Число строк файла (по умолчанию - строка последнего токена)
+
+        Returns:
+            Сводка по файлу
+
+        Raises:
+            RuntimeError: Ошибка лексера; статистика при этом не меняется
+        """
+        types: Dict[str, int] = {}
+        identifiers: Dict[str, int] = {}
+        token_lengths: Dict[int, int] = {}
+        line_tokens: Dict[int, int] = {}
+        count = 0
+        line = 0
+        on_line = 0
+
+        for token in tokens:
+            kind = token['type']
+            value = token['value']
+            types[kind] = types.get(kind, 0) + 1
+            if kind == 'ID':
+                identifiers[value] = identifiers.get(value, 0) + 1
+            length = len(value) if type(value) is str else len(str(value))
+            token_lengths[length] = token_lengths.get(length, 0) + 1
+            if token['line'] != line:
+                if on_line:
+                    line_tokens[on_line] = line_tokens.get(on_line, 0) + 1
+                line = token['line']
+                on_line = 0
+            on_line += 1
+            count += 1
+        if on_line:
+            line_tokens[on_line] = line_tokens.get(on_line, 0) + 1
+
+        lines = line if lines is None else lines
+        self.files += 1
+        self.tokens += count
+        self.lines += lines
+        for kind, kind_count in types.items():
+            self.token_types[kind] = self.token_types.get(kind, 0) + kind_count
+        self.identifiers.update(identifiers)
+        self.histograms['tokens_per_file'].add(count)
+        self.histograms['lines_per_file'].add(lines)
+        self.histograms['tokens_per_line'].update(line_tokens)
+        self.histograms['token_length'].update(token_lengths)
+        for identifier, identifier_count in identifiers.items():
+            self.histograms['identifier_length'].add(len(identifier), identifier_count)
+
+        top_identifier = max(identifiers.items(), key=lambda entry: (entry[1], entry[0]), default=(None, 0))
+        return {
+            'file': name,
+            'tokens': count,
+            'lines': lines,
+            'identifiers': len(identifiers),
+            'top_identifier': top_identifier[0],
+            'max_tokens_per_line': max(line_tokens, default=0),
+            'error': None,
+        }
+
+    def add_code(self, name: str, code: str) -> Summary:
+        """Учитывает текст программы; ошибка лексера попадает в сводку."""
+        if self.lexer is None:
+            self.lexer = PseudocodeLexer()
+        lines = code.count('\n') + (0 if code.endswith('\n') or not code else 1)
+        try:
+            return self.add_tokens(name, self.lexer.iter_tokens(code), lines)
+        except RuntimeError as e:
+            return self._failure(name, str(e))
+
+    def add_file(self, path: str) -> Summary:
+        """Учитывает файл; ошибки чтения и лексера попадают в сводку."""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                code = f.read()
+        except (OSError, UnicodeDecodeError) as e:
+            return self._failure(path, f"Ошибка чтения файла: {e}")
+        return self.add_code(path, code)
+
+    def _failure(self, name: str, message: str) -> Summary:
+        self.failed += 1
+        return {'file': name, 'error': message}
+
+    def merge(self, other: 'CorpusStatistics'):
+        """Добавляет статистику другого набора файлов."""
+        self.files += other.files
+        self.failed += other.failed
+        self.tokens += other.tokens
+        self.lines += other.lines
+        for kind, count in other.token_types.items():
+            self.token_types[kind] = self.token_types.get(kind, 0) + count
+        self.identifiers.merge(other.identifiers)
+        for name, histogram in other.histograms.items():
+            self.histograms[name].merge(histogram)
+
+    def top_identifiers(self, n: int = 20) -> List[Tuple[str, int]]:
+        return self.identifiers.top(n)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'files': self.files,
+            'failed': self.failed,
+            'tokens': self.tokens,
+            'lines': self.lines,
+            'token_types': dict(sorted(self.token_types.items(), key=lambda entry: (-entry[1], entry[0]))),
+            'identifiers': self.identifiers.to_dict(),
+            'histograms': {name: histogram.to_dict() for name, histogram in self.histograms.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'CorpusStatistics':
+        stats = cls(data['identifiers']['k'])
+        stats.files = data['files']
+        stats.failed = data['failed']
+        stats.tokens = data['tokens']
+        stats.lines = data['lines']
+        stats.token_types = dict(data['token_types'])
+        stats.identifiers = HeavyHitters.from_dict(data['identifiers'])
+        stats.histograms = {name: Histogram.from_dict(histogram)
+                            for name, histogram in data['histograms'].items()}
+        return stats
+
+    def __getstate__(self):
+        # Лексер не передается между процессами - он создается заново
+        state = dict(self.__dict__)
+        state['lexer'] = None
+        return state
+
+
+def iter_source_files(paths: Iterable[str], suffix: str = '.pseudo') -> Iterator[str]:
+    """Файлы из списка путей; каталоги обходятся рекурсивно в порядке имен."""
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if name.endswith(suffix):
+                    yield os.path.join(root, name)
+
+
+def _collect_batch(paths: List[str], top_k: int) -> Tuple[CorpusStatistics, List[Summary]]:
+    """Обрабатывает пачку файлов в рабочем процессе."""
+    stats = CorpusStatistics(top_k)
+    summaries = [stats.add_file(path) for path in paths]
+    return stats, summaries
+
+
+def collect(paths: Iterable[str], workers: int = 0, top_k: int = DEFAULT_TOP_K,
+            on_summary: Optional[Callable[[Summary], None]] = None,
+            batch_size: int = DEFAULT_BATCH_SIZE) -> CorpusStatistics:
+    """
+    Собирает статистику по файлам.
+
+    Args:
+        paths: Пути к файлам (итератор читается лениво)
+        workers: Число рабочих процессов (0 - в текущем процессе)
+        top_k: Размер скетча частых идентификаторов
+        on_summary: Вызывается для сводки каждого файла в порядке paths
+        batch_size: Число файлов в одном задании пула
+
+    Returns:
+        Объединенная статистика
+    """
+    total = CorpusStatistics(top_k)
+    if workers <= 0:
+        for path in paths:
+            summary = total.add_file(path)
+            if on_summary is not None:
+                on_summary(summary)
+        return total
+
+    paths = iter(paths)
+    context = multiprocessing.get_context('fork') if 'fork' in multiprocessing.get_all_start_methods() else None
+    with ProcessPoolExecutor(workers, mp_context=context) as pool:
+        # Не больше двух заданий на процесс: список путей и результаты
+        # не накапливаются, а сводки выдаются в исходном порядке
+        pending = deque()
+        while True:
+            while len(pending) < 2 * workers:
+                batch = list(islice(paths, batch_size))
+                if not batch:
+                    break
+                pending.append(pool.submit(_collect_batch, batch, top_k))
+            if not pending:
+                break
+            partial, summaries = pending.popleft().result()
+            total.merge(partial)
+            if on_summary is not None:
+                for summary in summaries:
+                    on_summary(summary)
+    return total
+
+
+def print_statistics(stats: CorpusStatistics, top: int = 20):
+    """Выводит статистику корпуса."""
+    print("=" * 60)
+    print("📊 СТАТИСТИКА КОРПУСА")
+    print("=" * 60)
+    print(f"Файлов: {stats.files} (с ошибками: {stats.failed})")
+    print(f"Токенов: {stats.tokens}, строк: {stats.lines}")
+
+    print("\n🏷️  Типы токенов:")
+    for kind, count in sorted(stats.token_types.items(), key=lambda entry: (-entry[1], entry[0])):
+        percentage = count / stats.tokens * 100 if stats.tokens else 0
+        print(f"  {kind:<15} {count:>10} ({percentage:5.1f}%)")
+
+    sketch = stats.identifiers
+    print(f"\n🔤 Частые идентификаторы (погрешность не больше {sketch.error}):")
+    for identifier, count in stats.top_identifiers(top):
+        print(f"  {identifier:<20} {count:>10}")
+
+    print("\n📈 Гистограммы (среднее / медиана / p99 / максимум):")
+    for name, histogram in stats.histograms.items():
+        print(f"  {name:<18} {histogram.mean():8.1f} {histogram.quantile(0.5):>6} "
+              f"{histogram.quantile(0.99):>6} {histogram.max if histogram.max is not None else 0:>6}")
+
+
+class SummaryWriter:
+    """Обработчик on_summary, записывающий сводки в поток строками JSON."""
+
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+
+    def __call__(self, summary: Summary):
+        self.stream.write(json.dumps(summary, ensure_ascii=False) + '\n')
+
+
+def main():
+    """Точка входа командной строки."""
+    arg_parser = argparse.ArgumentParser(description="Статистика токенов по корпусу программ")
+    arg_parser.add_argument('paths', nargs='+', help="Файлы или каталоги с псевдокодом")
+    arg_parser.add_argument('--workers', type=int, default=0, help="Число рабочих процессов")
+    arg_parser.add_argument('--top', type=int, default=20, help="Сколько частых идентификаторов показать")
+    arg_parser.add_argument('--top-k', type=int, default=DEFAULT_TOP_K, help="Размер скетча идентификаторов")
+    arg_parser.add_argument('--summaries', help="Файл для сводок по файлам (строки JSON)")
+    arg_parser.add_argument('--json', help="Сохранить статистику в JSON")
+    args = arg_parser.parse_args()
+
+    summaries_file = open(args.summaries, 'w', encoding='utf-8') if args.summaries else None
+    try:
+        on_summary = SummaryWriter(summaries_file) if summaries_file is not None else None
+        stats = collect(iter_source_files(args.paths), args.workers, args.top_k, on_summary)
+    finally:
+        if summaries_file is not None:
+            summaries_file.close()
+
+    print_statistics(stats, args.top)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(stats.to_dict(), f, ensure_ascii=False, indent=2)
+        print(f"\n💾 Статистика сохранена в {args.json}")
+    return 1 if stats.failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
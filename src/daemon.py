@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+ДЕМОН АНАЛИЗА ПСЕВДОКОДА
+
+Долгоживущий процесс, который держит прогретыми импорты, скомпилированные
+регулярные выражения лексера, кеш результатов и пул рабочих процессов.
+Запросы принимаются через локальный Unix-сокет (протокол описан в
+src/daemon_client.py), ответы содержат только компактную сводку анализа.
+
+Результаты кешируются по хешу текста программы, поэтому повторный анализ
+неизмененного файла сводится к его чтению.
+
+Использование:
+    python src/daemon.py --workers 4 &
+    python src/daemon_client.py examples/*.pseudo
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+# Добавляем путь для импортов
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.analyzer import PseudocodeAnalyzer
+from src.daemon_client import default_socket_path
+
+
+def compact_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Сводка результата анализа без токенов и AST."""
+    compact = {
+        'success': result['success'],
+        'errors': [str(error) for error in result['errors']],
+        'token_count': result.get('token_count', len(result.get('tokens') or [])),
+    }
+    symbols = result.get('symbols')
+    if symbols is not None:
+        compact['undefined_before_use'] = [occurrence.to_dict() for occurrence in symbols.undefined_before_use()]
+        compact['unused'] = symbols.unused()
+    return compact
+
+
+def read_source(path: str) -> str:
+    """Читает файл программы так же, как PseudocodeAnalyzer.analyze_file."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def _file_error(path: str, error: Exception) -> Dict[str, Any]:
+    if isinstance(error, FileNotFoundError):
+        message = f"Файл не найден: {path}"
+    else:
+        message = f"Ошибка чтения файла: {error}"
+    return {'success': False, 'errors': [message], 'token_count': 0}
+
+
+# Анализатор рабочего процесса пула создается один раз при его запуске
+_worker_analyzer: Optional[PseudocodeAnalyzer] = None
+
+
+def _init_worker():
+    global _worker_analyzer
+    _worker_analyzer = PseudocodeAnalyzer()
+
+
+def _analyze_in_worker(code: str) -> Dict[str, Any]:
+    return compact_result(_worker_analyzer.analyze(code))
+
+
+class ResultCache:
+    """LRU-кеш компактных результатов по хешу текста программы."""
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self.entries: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(code: str) -> str:
+        return hashlib.blake2b(code.encode('utf-8'), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            result = self.entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return result
+
+    def put(self, key: str, result: Dict[str, Any]):
+        if self.max_size <= 0:
+            return
+        with self.lock:
+            self.entries[key] = result
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+
+class AnalysisService:
+    """
+    Прогретое состояние демона: анализаторы, кеш и пул процессов.
+
+    Одиночные запросы выполняются в потоке соединения собственным
+    анализатором потока; пакетные при наличии пула раздаются процессам.
+    """
+
+    def __init__(self, workers: int = 0, cache_size: int = 1024):
+        self.cache = ResultCache(cache_size)
+        self.local = threading.local()
+        self.pool = ProcessPoolExecutor(workers, initializer=_init_worker) if workers > 0 else None
+        self.workers = workers
+        self.started = time.time()
+        self.requests = 0
+        self.analysis_seconds = 0.0
+        self.lock = threading.Lock()
+
+    def _analyzer(self) -> PseudocodeAnalyzer:
+        analyzer = getattr(self.local, 'analyzer', None)
+        if analyzer is None:
+            analyzer = self.local.analyzer = PseudocodeAnalyzer()
+        return analyzer
+
+    def analyze_code(self, code: str) -> Dict[str, Any]:
+        """Анализирует текст программы (с кешированием)."""
+        key = ResultCache.key(code)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return dict(cached, cached=True)
+        start = time.perf_counter()
+        result = compact_result(self._analyzer().analyze(code))
+        self._account(time.perf_counter() - start)
+        self.cache.put(key, result)
+        return dict(result, cached=False)
+
+    def analyze_path(self, path: str) -> Dict[str, Any]:
+        try:
+            code = read_source(path)
+        except Exception as e:
+            return _file_error(path, e)
+        return self.analyze_code(code)
+
+    def analyze_paths(self, paths: List[str]) -> List[Dict[str, Any]]:
+        """Анализирует несколько файлов; промахи кеша при наличии пула - параллельно."""
+        if self.pool is None:
+            return [self.analyze_path(path) for path in paths]
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(paths)
+        pending = {}
+        for position, path in enumerate(paths):
+            try:
+                code = read_source(path)
+            except Exception as e:
+                results[position] = _file_error(path, e)
+                continue
+            key = ResultCache.key(code)
+            cached = self.cache.get(key)
+            if cached is not None:
+                results[position] = dict(cached, cached=True)
+            else:
+                pending[position] = (key, self.pool.submit(_analyze_in_worker, code))
+
+        start = time.perf_counter()
+        for position, (key, future) in pending.items():
+            result = future.result()
+            self.cache.put(key, result)
+            results[position] = dict(result, cached=False)
+        if pending:
+            self._account(time.perf_counter() - start)
+        return results
+
+    def _account(self, seconds: float):
+        with self.lock:
+            self.analysis_seconds += seconds
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Выполняет один запрос протокола."""
+        with self.lock:
+            self.requests += 1
+        op = request.get('op')
+        if op == 'analyze':
+            if 'code' in request:
+                return self.analyze_code(request['code'])
+            if 'path' in request:
+                return self.analyze_path(request['path'])
+            return {'error': "Запрос analyze требует поле 'code' или 'path'"}
+        if op == 'analyze_many':
+            return {'results': self.analyze_paths(request.get('paths', []))}
+        if op == 'ping':
+            return {'pong': True}
+        if op == 'stats':
+            return self.stats()
+        return {'error': f"Неизвестная операция: {op}"}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'uptime': round(time.time() - self.started, 3),
+            'requests': self.requests,
+            'analysis_seconds': round(self.analysis_seconds, 6),
+            'workers': self.workers,
+            'cache_entries': len(self.cache.entries),
+            'cache_hits': self.cache.hits,
+            'cache_misses': self.cache.misses,
+        }
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Обрабатывает строки JSON одного соединения до его закрытия."""
+
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                if request.get('op') == 'shutdown':
+                    self._reply({'stopping': True})
+                    threading.Thread(target=self.server.shutdown, daemon=True).start()
+                    return
+                response = self.server.service.handle(request)
+            except Exception as e:
+                response = {'error': f"Ошибка обработки запроса: {e}"}
+            self._reply(response)
+
+    def _reply(self, response: Dict[str, Any]):
+        self.wfile.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+        self.wfile.flush()
+
+
+class AnalysisDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Сервер на Unix-сокете; каждое соединение обслуживается в своем потоке."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: Optional[str] = None, workers: int = 0, cache_size: int = 1024):
+        self.socket_path = socket_path or default_socket_path()
+        _remove_stale_socket(self.socket_path)
+        self.service = AnalysisService(workers, cache_size)
+        super().__init__(self.socket_path, _RequestHandler)
+        os.chmod(self.socket_path, 0o600)
+
+    def server_close(self):
+        super().server_close()
+        self.service.close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+def _remove_stale_socket(path: str):
+    """Удаляет сокет, оставшийся от завершившегося демона; работающий не трогает."""
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.unlink(path)
+        return
+    finally:
+        probe.close()
+    raise RuntimeError(f"Демон уже запущен: {path}")
+
+
+def main():
+    """Точка входа командной строки."""
+    arg_parser = argparse.ArgumentParser(description="Демон анализа псевдокода")
+    arg_parser.add_argument('--socket', help="Путь к сокету (по умолчанию PSEUDOCODE_DAEMON_SOCKET)")
+    arg_parser.add_argument('--workers', type=int, default=0, help="Число процессов для пакетных запросов")
+    arg_parser.add_argument('--cache-size', type=int, default=1024, help="Размер кеша результатов")
+    args = arg_parser.parse_args()
+
+    try:
+        server = AnalysisDaemon(args.socket, args.workers, args.cache_size)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return 1
+
+    print(f"🚀 Демон анализа слушает {server.socket_path} (процессов: {args.workers})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    print("🛑 Демон остановлен")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+КЛИЕНТ ДЕМОНА АНАЛИЗА
+
+Тонкий клиент для src/daemon.py: не импортирует анализатор, поэтому
+запускается быстро, а анализ выполняет уже прогретый демон.
+
+Протокол: по Unix-сокету передаются строки JSON, по одной на запрос и ответ.
+
+    {"op": "analyze", "path": "/abs/file.pseudo"}
+    {"op": "analyze", "code": "x = 1;"}
+    {"op": "analyze_many", "paths": ["/abs/a.pseudo", "/abs/b.pseudo"]}
+    {"op": "stats"} / {"op": "ping"} / {"op": "shutdown"}
+
+Использование:
+    python src/daemon_client.py examples/*.pseudo
+    python src/daemon_client.py --stats
+    python src/daemon_client.py --stop
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+import tempfile
+from typing import Any, Dict, List, Optional
+
+
+def default_socket_path() -> str:
+    """Путь к сокету демона: переменная PSEUDOCODE_DAEMON_SOCKET или временный каталог."""
+    return os.environ.get('PSEUDOCODE_DAEMON_SOCKET') or os.path.join(
+        tempfile.gettempdir(), f"pseudocode-analyzer-{os.getuid()}.sock")
+
+
+class DaemonClient:
+    """Соединение с демоном анализа."""
+
+    def __init__(self, socket_path: Optional[str] = None, timeout: Optional[float] = None):
+        self.socket_path = socket_path or default_socket_path()
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(self.socket_path)
+        self.stream = self.sock.makefile('rwb')
+
+    def request(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Отправляет запрос и ждет ответа."""
+        self.stream.write(json.dumps(payload, ensure_ascii=False).encode('utf-8') + b'\n')
+        self.stream.flush()
+        line = self.stream.readline()
+        if not line:
+            raise ConnectionError("Демон закрыл соединение")
+        response = json.loads(line)
+        if 'error' in response:
+            raise RuntimeError(response['error'])
+        return response
+
+    def analyze_code(self, code: str) -> Dict[str, Any]:
+        """Анализирует текст программы."""
+        return self.request({'op': 'analyze', 'code': code})
+
+    def analyze_file(self, path: str) -> Dict[str, Any]:
+        """Анализирует файл (путь передается демону абсолютным)."""
+        return self.request({'op': 'analyze', 'path': os.path.abspath(path)})
+
+    def analyze_files(self, paths: List[str]) -> List[Dict[str, Any]]:
+        """Анализирует несколько файлов одним запросом."""
+        response = self.request({'op': 'analyze_many', 'paths': [os.path.abspath(p) for p in paths]})
+        return response['results']
+
+    def close(self):
+        self.stream.close()
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def main():
+    """Точка входа командной строки."""
+    arg_parser = argparse.ArgumentParser(description="Клиент демона анализа псевдокода")
+    arg_parser.add_argument('files', nargs='*', help="Файлы с псевдокодом")
+    arg_parser.add_argument('--socket', help="Путь к сокету демона")
+    arg_parser.add_argument('--json', action='store_true', help="Печатать ответы в JSON")
+    arg_parser.add_argument('--stats', action='store_true', help="Показать статистику демона")
+    arg_parser.add_argument('--stop', action='store_true', help="Остановить демон")
+    args = arg_parser.parse_args()
+
+    try:
+        client = DaemonClient(args.socket)
+    except OSError as e:
+        print(f"❌ Демон недоступен ({e}); запустите: python src/daemon.py", file=sys.stderr)
+        return 2
+
+    with client:
+        if args.stats or args.stop:
+            response = client.request({'op': 'shutdown' if args.stop else 'stats'})
+            print(json.dumps(response, ensure_ascii=False, indent=2))
+            return 0
+
+        results = client.analyze_files(args.files) if args.files else []
+        failed = 0
+        for path, result in zip(args.files, results):
+            if not result['success']:
+                failed += 1
+            if args.json:
+                print(json.dumps(dict(result, path=path), ensure_ascii=False))
+            elif result['success']:
+                print(f"✅ {path}")
+            else:
+                print(f"❌ {path}: {'; '.join(result['errors'])}")
+        return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+ПЛОСКОЕ ПРЕДСТАВЛЕНИЕ AST (STRUCT OF ARRAYS)
+
+Все дерево хранится в нескольких массивах array по одному элементу на узел:
+    kind          тип узла (номер в NodeType)
+    shape         номер набора полей узла (имена и виды полей, см. ниже)
+    field         номер поля родителя, в котором лежит узел
+    first_child   индекс первого ребенка или -1
+    next_sibling  индекс следующего ребенка того же родителя или -1
+    op            код оператора (таблица ops) или 255
+    literal       индекс имени/значения в таблице literals или -1
+    offset        смещение в исходнике или -1 (строка и столбец - по LineIndex)
+
+Узлы лежат в прямом порядке обхода, поэтому первый ребенок узла i, если
+он есть, - это i + 1, а обход всего дерева - цикл по range(len(tree)).
+Узел занимает 25 байт против сотен байт у ASTNode со словарем
+атрибутов (смещение - 64-битное, поэтому исходники больше 2 ГиБ тоже
+допустимы); массивы быстро сериализуются pickle и передаются между
+процессами одним блоком.
+
+Интерфейс ASTNode дают легкие посредники FlatNode, создаваемые по
+требованию: node.statements, node.left.name, to_dict(), iter_fields и
+все анализы, работающие через iter_fields, работают с ними без изменений.
+Посредники кешируются деревом, поэтому повторное обращение к узлу дает
+тот же объект (на это рассчитывают анализы, различающие узлы по id);
+release_proxies() освобождает их после работы с деревом.
+
+Использование:
+    tree = parse_flat(code)
+    tree = FlatAST.from_ast(ast, LineIndex(code))
+    root = tree.root
+"""
+
+import os
+import sys
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Добавляем путь для импортов
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.lexer import LexerAnalyzer, LineIndex
+from src.parser import ASTNode, NodeType, Parser, iter_fields
+
+
+NODE_TYPES = list(NodeType)
+# Коды по значению: NodeType из src.parser и из parser - разные классы
+NODE_TYPE_CODES = {node_type.value: code for code, node_type in enumerate(NODE_TYPES)}
+
+# Виды полей в наборе полей узла
+CHILD = 'child'       # один дочерний узел
+CHILDREN = 'children' # список дочерних узлов
+NONE = 'none'         # значение None
+OPERATOR = 'operator' # строка из таблицы операторов
+LITERAL = 'literal'   # имя или значение из таблицы литералов
+
+NO_OPERATOR = 255
+
+
+class FlatAST:
+    """Дерево в плоских массивах; узлы адресуются индексами."""
+
+    def __init__(self, line_index: Optional[LineIndex] = None):
+        self.kind = array('B')
+        self.shape = array('H')
+        self.field = array('B')
+        self.first_child = array('i')
+        self.next_sibling = array('i')
+        self.op = array('B')
+        self.literal = array('i')
+        self.offset = array('q')
+        # Наборы полей: кортежи (имя, вид) в порядке полей узла
+        self.shapes: List[Tuple[Tuple[str, str], ...]] = []
+        self.ops: List[str] = []
+        self.literals: List[Any] = []
+        self.line_index = line_index
+        self._init_lookups()
+
+    def _init_lookups(self):
+        """Служебные таблицы, которые не сериализуются, а восстанавливаются."""
+        self._shape_fields = [{name: (position, kind) for position, (name, kind) in enumerate(shape)}
+                              for shape in self.shapes]
+        self._proxies: Dict[int, FlatNode] = {}
+
+    # -- построение -------------------------------------------------------
+
+    @classmethod
+    def from_ast(cls, ast: ASTNode, line_index: Optional[LineIndex] = None) -> 'FlatAST':
+        """
+        Строит плоское дерево по обычному AST.
+
+        Для узлов со смещением (Parser с line_index) индекс строк берется
+        из самих узлов; для узлов со строкой и столбцом он обязателен,
+        чтобы перевести позицию в смещение.
+        """
+        if line_index is None:
+            line_index = getattr(ast, '_line_index', None)
+        if line_index is None:
+            raise ValueError("Для AST со строками и столбцами нужен LineIndex исходника")
+        tree = cls(line_index)
+        line_starts = line_index.line_starts
+        # Коды таблиц нужны только при построении
+        shape_codes: Dict[Tuple[Tuple[str, str], ...], int] = {}
+        op_codes: Dict[str, int] = {}
+        literal_codes: Dict[Tuple[type, Any], int] = {}
+
+        # Стек: (узел, индекс родителя, номер поля родителя)
+        stack: List[Tuple[ASTNode, int, int]] = [(ast, -1, 0)]
+        last_child: Dict[int, int] = {}
+        while stack:
+            node, parent, field = stack.pop()
+            index = len(tree.kind)
+            if parent >= 0:
+                previous = last_child.get(parent)
+                if previous is None:
+                    tree.first_child[parent] = index
+                else:
+                    tree.next_sibling[previous] = index
+                last_child[parent] = index
+
+            if hasattr(node, '_offset'):
+                offset = -1 if node._offset is None else node._offset
+            else:
+                offset = line_starts[node.line - 1] + node.column if node.line > 0 else -1
+
+            shape: List[Tuple[str, str]] = []
+            children: List[Tuple[ASTNode, int]] = []
+            op = NO_OPERATOR
+            literal = -1
+            for position, (name, value) in enumerate(iter_fields(node)):
+                if isinstance(value, ASTNode):
+                    shape.append((name, CHILD))
+                    children.append((value, position))
+                elif isinstance(value, list):
+                    shape.append((name, CHILDREN))
+                    children.extend((item, position) for item in value)
+                elif value is None:
+                    shape.append((name, NONE))
+                elif name == 'operator':
+                    shape.append((name, OPERATOR))
+                    op = tree._code(tree.ops, op_codes, value, value)
+                elif literal < 0:
+                    shape.append((name, LITERAL))
+                    literal = tree._code(tree.literals, literal_codes, (type(value), value), value)
+                else:
+                    raise ValueError(f"Узел {node.node_type.value} содержит больше одного литерала")
+            if len(tree.ops) > NO_OPERATOR:
+                raise ValueError("Слишком много различных операторов")
+
+            tree.kind.append(NODE_TYPE_CODES[node.node_type.value])
+            tree.shape.append(tree._code(tree.shapes, shape_codes, tuple(shape), tuple(shape)))
+            tree.field.append(field)
+            tree.first_child.append(-1)
+            tree.next_sibling.append(-1)
+            tree.op.append(op)
+            tree.literal.append(literal)
+            tree.offset.append(offset)
+            stack.extend((child, index, position) for child, position in reversed(children))
+
+        tree._shape_fields = [{name: (position, kind) for position, (name, kind) in enumerate(shape)}
+                              for shape in tree.shapes]
+        return tree
+
+    @classmethod
+    def join_programs(cls, trees: List['FlatAST'], line_index: Optional[LineIndex] = None) -> 'FlatAST':
+        """
+        Склеивает программы в одну: операторы верхнего уровня идут подряд.
+
+        Деревья частей одного исходника (см. src/parallel.py) хранят
+        абсолютные смещения, поэтому позиции после склейки верны. Таблицы
+        наборов полей, операторов и литералов объединяются, коды в массивах
+        перекодируются.
+        """
+        tree = cls(line_index)
+        shape_codes: Dict[Tuple[Tuple[str, str], ...], int] = {}
+        op_codes: Dict[str, int] = {}
+        literal_codes: Dict[Tuple[type, Any], int] = {}
+        program_shape = (('statements', CHILDREN),)
+        tree.kind.append(NODE_TYPE_CODES[NodeType.PROGRAM.value])
+        tree.shape.append(tree._code(tree.shapes, shape_codes, program_shape, program_shape))
+        tree.field.append(0)
+        tree.first_child.append(-1)
+        tree.next_sibling.append(-1)
+        tree.op.append(NO_OPERATOR)
+        tree.literal.append(-1)
+        tree.offset.append(-1)
+
+        last_statement = -1
+        for part in trees:
+            # Узел i части (кроме корня) получает индекс base + i
+            base = len(tree.kind) - 1
+            shape_map = [tree._code(tree.shapes, shape_codes, shape, shape) for shape in part.shapes]
+            op_map = [tree._code(tree.ops, op_codes, op, op) for op in part.ops]
+            op_map.extend([NO_OPERATOR] * (NO_OPERATOR + 1 - len(op_map)))
+            literal_map = [tree._code(tree.literals, literal_codes, (type(value), value), value)
+                           for value in part.literals]
+            if len(tree.ops) > NO_OPERATOR:
+                raise ValueError("Слишком много различных операторов")
+
+            tree.kind.extend(part.kind[1:])
+            tree.shape.extend(shape_map[code] for code in part.shape[1:])
+            tree.field.extend(part.field[1:])
+            tree.first_child.extend(index + base if index >= 0 else -1 for index in part.first_child[1:])
+            tree.next_sibling.extend(index + base if index >= 0 else -1 for index in part.next_sibling[1:])
+            tree.op.extend(op_map[code] for code in part.op[1:])
+            tree.literal.extend(literal_map[code] if code >= 0 else -1 for code in part.literal[1:])
+            tree.offset.extend(part.offset[1:])
+
+            # Связываем операторы верхнего уровня соседних частей
+            first = part.first_child[0]
+            if first < 0:
+                continue
+            if last_statement < 0:
+                tree.first_child[0] = first + base
+            else:
+                tree.next_sibling[last_statement] = first + base
+            last = first
+            while part.next_sibling[last] >= 0:
+                last = part.next_sibling[last]
+            last_statement = last + base
+
+        tree._init_lookups()
+        return tree
+
+    @staticmethod
+    def _code(table: List[Any], codes: Dict[Any, int], key: Any, value: Any) -> int:
+        code = codes.get(key)
+        if code is None:
+            code = codes[key] = len(table)
+            table.append(value)
+        return code
+
+    # -- доступ по индексам -----------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.kind)
+
+    @property
+    def root(self) -> 'FlatNode':
+        return self.node(0)
+
+    def node(self, index: int) -> 'FlatNode':
+        """Посредник узла с интерфейсом ASTNode."""
+        proxy = self._proxies.get(index)
+        if proxy is None:
+            proxy = FlatNode(self, index)
+            self._proxies[index] = proxy
+        return proxy
+
+    def release_proxies(self):
+        """Освобождает созданные посредники (само дерево не меняется)."""
+        self._proxies.clear()
+
+    def node_type(self, index: int) -> NodeType:
+        return NODE_TYPES[self.kind[index]]
+
+    def position(self, index: int) -> Tuple[int, int]:
+        """Строка и столбец узла ((0, 0) для узлов без позиции)."""
+        offset = self.offset[index]
+        if offset < 0:
+            return 0, 0
+        return self.line_index.position(offset)
+
+    def children(self, index: int) -> Iterator[int]:
+        """Индексы детей узла в порядке полей."""
+        child = self.first_child[index]
+        while child >= 0:
+            yield child
+            child = self.next_sibling[child]
+
+    def indices_of(self, node_type: NodeType) -> List[int]:
+        """Индексы всех узлов типа node_type в порядке обхода."""
+        code = NODE_TYPE_CODES[node_type.value]
+        return [index for index, kind in enumerate(self.kind) if kind == code]
+
+    def count(self, node_type: NodeType) -> int:
+        """Число узлов типа node_type."""
+        return self.kind.count(NODE_TYPE_CODES[node_type.value])
+
+    def field_value(self, index: int, name: str) -> Any:
+        """Значение поля узла в виде, как у ASTNode (дети - посредники)."""
+        position, kind = self._shape_fields[self.shape[index]][name]
+        if kind == CHILD:
+            for child in self.children(index):
+                if self.field[child] == position:
+                    return self.node(child)
+        if kind == CHILDREN:
+            return [self.node(child) for child in self.children(index) if self.field[child] == position]
+        if kind == OPERATOR:
+            return self.ops[self.op[index]]
+        if kind == LITERAL:
+            return self.literals[self.literal[index]]
+        return None
+
+    def field_names(self, index: int) -> List[str]:
+        return [name for name, _ in self.shapes[self.shape[index]]]
+
+    def to_ast(self, index: int = 0) -> ASTNode:
+        """Восстанавливает обычное дерево ASTNode со строками и столбцами."""
+        line, column = self.position(index)
+        fields = {}
+        for name in self.field_names(index):
+            value = self.field_value(index, name)
+            if isinstance(value, FlatNode):
+                value = self.to_ast(value._index)
+            elif isinstance(value, list):
+                value = [self.to_ast(item._index) for item in value]
+            fields[name] = value
+        return ASTNode(self.node_type(index), line=line, column=column, **fields)
+
+    def nbytes(self) -> int:
+        """Размер массивов узлов в байтах (без таблиц литералов)."""
+        return sum(len(column) * column.itemsize for column in (
+            self.kind, self.shape, self.field, self.first_child,
+            self.next_sibling, self.op, self.literal, self.offset))
+
+    # -- сериализация -----------------------------------------------------
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = {key: value for key, value in self.__dict__.items() if not key.startswith('_')}
+        state['line_starts'] = array('q', self.line_index.line_starts) if self.line_index else None
+        del state['line_index']
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        line_starts = state.pop('line_starts')
+        self.__dict__.update(state)
+        self.line_index = None
+        if line_starts is not None:
+            self.line_index = LineIndex.__new__(LineIndex)
+            self.line_index.line_starts = list(line_starts)
+        self._init_lookups()
+
+
+class FlatNode(ASTNode):
+    """
+    Посредник узла FlatAST с интерфейсом ASTNode.
+
+    Поля читаются из массивов дерева при каждом обращении; собственных
+    данных у посредника нет, кроме ссылки на дерево и индекса.
+    """
+
+    __slots__ = ('_tree', '_index')
+
+    def __init__(self, tree: FlatAST, index: int):
+        object.__setattr__(self, '_tree', tree)
+        object.__setattr__(self, '_index', index)
+
+    @property
+    def node_type(self) -> NodeType:
+        return self._tree.node_type(self._index)
+
+    @property
+    def line(self) -> int:
+        return self._tree.position(self._index)[0]
+
+    @property
+    def column(self) -> int:
+        return self._tree.position(self._index)[1]
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            return self._tree.field_value(self._index, name)
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError("Узлы FlatAST только для чтения")
+
+    def __dir__(self) -> List[str]:
+        return sorted(set(super().__dir__()) | set(self._tree.field_names(self._index)))
+
+    def __repr__(self):
+        return f"FlatNode({self.node_type.value}#{self._index})"
+
+    def _field_items(self) -> Iterator[Tuple[str, Any]]:
+        """Поля узла для iter_fields."""
+        tree, index = self._tree, self._index
+        for name in tree.field_names(index):
+            yield name, tree.field_value(index, name)
+
+
+def parse_flat(code: str) -> FlatAST:
+    """
+    Разбирает исходный код и строит плоское дерево.
+
+    Парсер сначала строит обычное дерево ASTNode, и только затем оно
+    переводится в массивы. Поэтому пиковая память разбора остается
+    памятью полного дерева объектов; экономия касается памяти, занятой
+    деревом после возврата (обычное дерево к этому моменту освобождается).
+    """
+    lexer = LexerAnalyzer()
+    tokens = lexer.convert_tokens(lexer.lexer.tokenize_compact(code))
+    ast = Parser(tokens, line_index=lexer.lexer.line_index).parse()
+    return FlatAST.from_ast(ast, lexer.lexer.line_index)
@@ -0,0 +1,468 @@
+#!/usr/bin/env python3
+"""
+ДИФФЕРЕНЦИАЛЬНЫЙ ФАЗЗИНГ ПАРСЕРОВ
+
+Один и тот же вход разбирается двумя реализациями, и сравниваются решения
+(принят или отвергнут) и нормализованные AST. Реализации:
+
+    hand     - PseudocodeLexer.tokenize + Parser (основной разбор)
+    antlr    - парсер, сгенерированный из src/grammars/Pseudocode.g4
+    compact  - tokenize_compact + Parser, позиции по индексу строк
+    flat     - разбор в FlatAST и обход через посредники FlatNode
+
+Входы - программы ProgramGenerator, к которым применяются случайные
+мутации на уровне токенов и символов. Поток входов полностью определяется
+зерном, поэтому любой случай воспроизводится по (seed, номер).
+
+Случаи раздаются пачками пулу процессов. Расхождения группируются по
+сигнатуре (вид расхождения и путь в AST без индексов); для первого входа
+каждой сигнатуры рабочий процесс ищет минимальный вход с тем же
+расхождением (delta debugging: сначала по лексемам, затем по символам).
+Счетчик пропускной способности выводится по ходу работы, а бюджет
+задается числом случаев и/или временем.
+
+Использование:
+    python src/fuzz.py --left hand --right antlr --seconds 3600 --workers 8 --out fuzz-findings
+    python src/fuzz.py --left hand --right compact --cases 100000
+"""
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import random
+import re
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Добавляем путь для импортов
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.antlr_backend import AntlrBackend, HandWrittenBackend, first_difference
+from src.flat_ast import parse_flat
+from src.generator import GrammarSpec, ProgramGenerator
+from src.lexer import LexerAnalyzer
+from src.parser import ASTNode, Parser
+
+DEFAULT_BATCH_SIZE = 200
+
+# Лексемы, которые мутации вставляют и подставляют: все виды токенов
+# языка, а также символы, которых в языке нет
+VOCABULARY = [
+    'if', 'else', 'while', 'for', 'in', 'range', 'print',
+    'x', 'n', 'value1', '_tmp', '0', '7', '42', '"s"', '""', '"a\nb"',
+    '=', '==', '!=', '<', '>', '<=', '>=', '&&', '||', '!',
+    '+', '-', '*', '/', '%', ',', ';', '{', '}', '(', ')',
+    '# комментарий\n', '\n', ' ', '[', ']', '@',
+]
+
+# Деление входа на лексемы для минимизации (не зависит от лексеров)
+PIECE_PATTERN = re.compile(r'"[^"]*"?|#[^\n]*|[A-Za-z_0-9]+|[<>=!]=|&&|\|\||\s+|.', re.DOTALL)
+
+# Деление входа на операторы и строки - первый, самый грубый уровень минимизации
+SEGMENT_PATTERN = re.compile(r'[^;{}\n]*[;{}\n]|[^;{}\n]+')
+
+# Индексы элементов в пути расхождения (ast.body[3].left -> ast.body[].left)
+INDEX_PATTERN = re.compile(r'\[\d+\]')
+
+
+class CompactBackend:
+    """Разбор по токенам компактного режима: позиции вычисляются по LineIndex."""
+
+    name = 'compact'
+
+    def __init__(self):
+        self.lexer_analyzer = LexerAnalyzer()
+
+    def parse(self, code: str) -> ASTNode:
+        lexer = self.lexer_analyzer.lexer
+        tokens = self.lexer_analyzer.convert_tokens(lexer.tokenize_compact(code))
+        return Parser(tokens, line_index=lexer.line_index).parse()
+
+
+class FlatBackend:
+    """Разбор в FlatAST; дерево читается через посредники FlatNode."""
+
+    name = 'flat'
+
+    def parse(self, code: str) -> ASTNode:
+        return parse_flat(code).root
+
+
+BACKENDS: Dict[str, Callable[[], Any]] = {
+    'hand': HandWrittenBackend,
+    'antlr': AntlrBackend,
+    'compact': CompactBackend,
+    'flat': FlatBackend,
+}
+
+
+def strip_positions(tree: Any) -> Any:
+    """Убирает строки и столбцы из сериализованного AST."""
+    if isinstance(tree, dict):
+        return {key: strip_positions(value) for key, value in tree.items() if key not in ('line', 'column')}
+    if isinstance(tree, list):
+        return [strip_positions(item) for item in tree]
+    return tree
+
+
+def outcome(backend, code: str, positions: bool = True) -> Tuple[bool, Any]:
+    """Решение парсера и нормализованный AST (или None при отказе)."""
+    try:
+        tree = backend.parse(code).to_dict()
+    except (SyntaxError, RuntimeError, RecursionError):
+        return False, None
+    return True, tree if positions else strip_positions(tree)
+
+
+def compare(left, right, code: str, positions: bool = True) -> Tuple[bool, Optional[Tuple[str, str]]]:
+    """
+    Сравнивает два парсера на входе.
+
+    Returns:
+        Решение левого парсера (принят ли вход) и None при согласии,
+        иначе (сигнатура, описание расхождения)
+    """
+    left_accepted, left_tree = outcome(left, code, positions)
+    right_accepted, right_tree = outcome(right, code, positions)
+    if left_accepted != right_accepted:
+        signature = f"decision:{left.name}={left_accepted},{right.name}={right_accepted}"
+        return left_accepted, (signature, f"решения расходятся: {left.name}={left_accepted}, "
+                                          f"{right.name}={right_accepted}")
+    if not left_accepted:
+        return False, None
+    difference = first_difference(left_tree, right_tree)
+    if difference is None:
+        return True, None
+    path = INDEX_PATTERN.sub('[]', difference.split(':', 1)[0])
+    return True, (f"ast:{path}", difference)
+
+
+# ----------------------------------------------------------------------
+# Порождение входов
+# ----------------------------------------------------------------------
+
+class CaseGenerator:
+    """Детерминированный поток входов: программа генератора плюс мутации."""
+
+    def __init__(self, grammar: Optional[GrammarSpec] = None, max_size: int = 300, max_mutations: int = 3):
+        self.grammar = grammar or GrammarSpec.load()
+        self.max_size = max_size
+        self.max_mutations = max_mutations
+
+    def case(self, seed: int, index: int) -> str:
+        """Вход номер index потока с зерном seed."""
+        rng = random.Random(seed * 1_000_003 + index)
+        generator = ProgramGenerator(seed=rng.getrandbits(32), max_depth=rng.randint(1, 4),
+                                     expression_width=rng.randint(1, 4), comment_density=0.2,
+                                     grammar=self.grammar)
+        code = generator.generate(rng.randint(1, self.max_size))
+        # Часть входов остается без мутаций: согласие на корректных
+        # программах проверяется так же, как на испорченных
+        for _ in range(rng.choice([0] + list(range(1, self.max_mutations + 1)))):
+            code = mutate(code, rng)
+        return code
+
+
+def mutate(code: str, rng: random.Random) -> str:
+    """Применяет к входу одну случайную мутацию."""
+    pieces = [match.group() for match in PIECE_PATTERN.finditer(code)]
+    if not pieces:
+        return rng.choice(VOCABULARY)
+    position = rng.randrange(len(pieces))
+    action = rng.random()
+    if action < 0.25:
+        del pieces[position]
+    elif action < 0.45:
+        pieces[position] = rng.choice(VOCABULARY)
+    elif action < 0.65:
+        pieces.insert(position, rng.choice(VOCABULARY))
+    elif action < 0.75:
+        pieces.insert(position, pieces[position])
+    elif action < 0.85 and position + 1 < len(pieces):
+        pieces[position], pieces[position + 1] = pieces[position + 1], pieces[position]
+    else:
+        # Мутация символа внутри лексемы
+        piece = pieces[position]
+        offset = rng.randrange(len(piece) + 1)
+        if rng.random() < 0.5 and piece:
+            piece = piece[:offset] + piece[offset + 1:]
+        else:
+            piece = piece[:offset] + rng.choice('=<>!&|+-*/%(){}";#\n 0aZ_@') + piece[offset:]
+        pieces[position] = piece
+    return ''.join(pieces)
+
+
+# ----------------------------------------------------------------------
+# Минимизация
+# ----------------------------------------------------------------------
+
+def ddmin(items: List[str], failing: Callable[[List[str]], bool]) -> List[str]:
+    """Уменьшает список, пока удаление любой части убирает ошибку (delta debugging)."""
+    granularity = 2
+    while len(items) >= 2:
+        chunk = -(-len(items) // granularity)
+        reduced = False
+        for start in range(0, len(items), chunk):
+            complement = items[:start] + items[start + chunk:]
+            if complement and failing(complement):
+                items = complement
+                granularity = max(granularity - 1, 2)
+                reduced = True
+                break
+        if not reduced:
+            if granularity >= len(items):
+                break
+            granularity = min(granularity * 2, len(items))
+    return items
+
+
+def minimize(code: str, failing: Callable[[str], bool], max_tests: int = 5000) -> str:
+    """
+    Ищет минимальный вход, на котором failing остается истинным.
+
+    Сначала удаляются операторы и строки, затем лексемы и отдельные символы. Число проверок
+    ограничено max_tests; по его исчерпании возвращается лучший найденный вход.
+    """
+    tests = [0]
+    best = [code]
+
+    def check(candidate: str) -> bool:
+        if tests[0] >= max_tests:
+            return False
+        tests[0] += 1
+        if failing(candidate):
+            if len(candidate) < len(best[0]):
+                best[0] = candidate
+            return True
+        return False
+
+    segments = ddmin(SEGMENT_PATTERN.findall(code), lambda items: check(''.join(items)))
+    pieces = ddmin(PIECE_PATTERN.findall(''.join(segments)), lambda items: check(''.join(items)))
+    ddmin(list(''.join(pieces)), lambda chars: check(''.join(chars)))
+    return best[0]
+
+
+# ----------------------------------------------------------------------
+# Запуск
+# ----------------------------------------------------------------------
+
+class FuzzStats:
+    """Счетчики прогона и пропускная способность."""
+
+    def __init__(self):
+        self.cases = 0
+        self.accepted = 0
+        self.rejected = 0
+        self.disagreements = 0
+        self.signatures: Dict[str, int] = {}
+        self.started = time.perf_counter()
+
+    def merge(self, batch: Dict[str, Any]):
+        self.cases += batch['cases']
+        self.accepted += batch['accepted']
+        self.rejected += batch['rejected']
+        for signature, count in batch['signatures'].items():
+            self.disagreements += count
+            self.signatures[signature] = self.signatures.get(signature, 0) + count
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    @property
+    def rate(self) -> float:
+        return self.cases / self.elapsed if self.elapsed > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'cases': self.cases, 'accepted': self.accepted, 'rejected': self.rejected,
+                'disagreements': self.disagreements, 'signatures': dict(self.signatures),
+                'elapsed': round(self.elapsed, 3), 'rate': round(self.rate, 1)}
+
+
+# Состояние рабочего процесса
+_worker: Dict[str, Any] = {}
+
+
+def _init_worker(left: Callable[[], Any], right: Callable[[], Any], positions: bool,
+                 minimize_findings: bool, cases: CaseGenerator):
+    _worker.update(left=left(), right=right(), positions=positions,
+                   minimize=minimize_findings, cases=cases)
+
+
+def _fuzz_batch(seed: int, start: int, count: int, known: frozenset) -> Dict[str, Any]:
+    """Проверяет случаи start..start+count-1 потока seed."""
+    left, right, positions = _worker['left'], _worker['right'], _worker['positions']
+    result = {'cases': count, 'accepted': 0, 'rejected': 0, 'signatures': {}, 'findings': []}
+    seen = set(known)
+    for index in range(start, start + count):
+        code = _worker['cases'].case(seed, index)
+        accepted, found = compare(left, right, code, positions)
+        if found is None:
+            result['accepted' if accepted else 'rejected'] += 1
+            continue
+        signature, difference = found
+        result['signatures'][signature] = result['signatures'].get(signature, 0) + 1
+        if signature in seen:
+            continue
+        seen.add(signature)
+
+        def same_signature(candidate: str) -> bool:
+            other = compare(left, right, candidate, positions)[1]
+            return other is not None and other[0] == signature
+
+        minimized = minimize(code, same_signature) if _worker['minimize'] else code
+        result['findings'].append({
+            'signature': signature,
+            'difference': compare(left, right, minimized, positions)[1][1],
+            'seed': seed,
+            'index': index,
+            'input': code,
+            'minimized': minimized,
+        })
+    return result
+
+
+def fuzz(left: Callable[[], Any], right: Callable[[], Any], cases: Optional[int] = None,
+         seconds: Optional[float] = None, workers: int = 0, seed: int = 0,
+         batch_size: int = DEFAULT_BATCH_SIZE, positions: bool = True, minimize_findings: bool = True,
+         on_finding: Optional[Callable[[Dict[str, Any]], None]] = None,
+         on_progress: Optional[Callable[[FuzzStats], None]] = None,
+         generator: Optional[CaseGenerator] = None) -> Tuple[FuzzStats, List[Dict[str, Any]]]:
+    """
+    Сравнивает два парсера на потоке входов.
+
+    Args:
+        left, right: Фабрики парсеров (классы из BACKENDS или совместимые)
+        cases: Наибольшее число случаев
+        seconds: Бюджет времени (новые пачки после него не выдаются)
+        workers: Число рабочих процессов (0 - в текущем процессе)
+        seed: Зерно потока входов
+        batch_size: Число случаев в одном задании
+        positions: Сравнивать позиции узлов
+        minimize_findings: Минимизировать входы с расхождениями
+        on_finding: Вызывается для первого входа каждой сигнатуры
+        on_progress: Вызывается после каждой пачки
+
+    Returns:
+        Статистика и список находок (по одной на сигнатуру)
+    """
+    if cases is None and seconds is None:
+        raise ValueError("Нужно задать число случаев или бюджет времени")
+    generator = generator or CaseGenerator()
+    stats = FuzzStats()
+    findings: List[Dict[str, Any]] = []
+    known: set = set()
+    next_start = [0]
+
+    def next_batch() -> Optional[Tuple[int, int]]:
+        if seconds is not None and stats.elapsed >= seconds:
+            return None
+        remaining = batch_size if cases is None else min(batch_size, cases - next_start[0])
+        if remaining <= 0:
+            return None
+        start = next_start[0]
+        next_start[0] += remaining
+        return start, remaining
+
+    def account(batch: Dict[str, Any]):
+        stats.merge(batch)
+        for finding in batch['findings']:
+            if finding['signature'] not in known:
+                known.add(finding['signature'])
+                findings.append(finding)
+                if on_finding is not None:
+                    on_finding(finding)
+        if on_progress is not None:
+            on_progress(stats)
+
+    if workers <= 0:
+        _init_worker(left, right, positions, minimize_findings, generator)
+        while True:
+            bounds = next_batch()
+            if bounds is None:
+                break
+            account(_fuzz_batch(seed, bounds[0], bounds[1], frozenset(known)))
+        return stats, findings
+
+    context = multiprocessing.get_context('fork') if 'fork' in multiprocessing.get_all_start_methods() else None
+    with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker,
+                             initargs=(left, right, positions, minimize_findings, generator)) as pool:
+        pending = deque()
+        while True:
+            while len(pending) < 2 * workers:
+                bounds = next_batch()
+                if bounds is None:
+                    break
+                pending.append(pool.submit(_fuzz_batch, seed, bounds[0], bounds[1], frozenset(known)))
+            if not pending:
+                break
+            account(pending.popleft().result())
+    return stats, findings
+
+
+def main():
+    """Точка входа командной строки."""
+    arg_parser = argparse.ArgumentParser(description="Дифференциальный фаззинг парсеров")
+    arg_parser.add_argument('--left', choices=sorted(BACKENDS), default='hand', help="Первый парсер")
+    arg_parser.add_argument('--right', choices=sorted(BACKENDS), default='antlr', help="Второй парсер")
+    arg_parser.add_argument('--cases', type=int, help="Число случаев")
+    arg_parser.add_argument('--seconds', type=float, help="Бюджет времени в секундах")
+    arg_parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Число процессов")
+    arg_parser.add_argument('--seed', type=int, default=0, help="Зерно потока входов")
+    arg_parser.add_argument('--batch', type=int, default=DEFAULT_BATCH_SIZE, help="Случаев в одном задании")
+    arg_parser.add_argument('--ignore-positions', action='store_true', help="Не сравнивать позиции узлов")
+    arg_parser.add_argument('--no-minimize', action='store_true', help="Не минимизировать находки")
+    arg_parser.add_argument('--out', help="Каталог для находок (входы .pseudo и findings.jsonl)")
+    args = arg_parser.parse_args()
+    if args.cases is None and args.seconds is None:
+        args.cases = 10000
+
+    left, right = BACKENDS[args.left], BACKENDS[args.right]
+    try:
+        left(), right()
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return 2
+
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+    last_report = [time.perf_counter()]
+
+    def on_finding(finding):
+        print(f"🐞 {finding['signature']}: {finding['difference']}")
+        print(f"   минимальный вход: {finding['minimized']!r}")
+        if args.out:
+            name = hashlib.blake2b(finding['signature'].encode('utf-8'), digest_size=6).hexdigest()
+            with open(os.path.join(args.out, f"{name}.pseudo"), 'w', encoding='utf-8') as f:
+                f.write(finding['minimized'])
+            with open(os.path.join(args.out, 'findings.jsonl'), 'a', encoding='utf-8') as f:
+                f.write(json.dumps(finding, ensure_ascii=False) + '\n')
+
+    def on_progress(stats):
+        if time.perf_counter() - last_report[0] >= 5:
+            last_report[0] = time.perf_counter()
+            print(f"⚡ {stats.cases} случаев, {stats.rate:.0f}/с, расхождений: {stats.disagreements} "
+                  f"(сигнатур: {len(stats.signatures)})")
+
+    print(f"🎯 Фаззинг {args.left} против {args.right}: процессов {args.workers}, зерно {args.seed}")
+    stats, findings = fuzz(left, right, args.cases, args.seconds, args.workers, args.seed, args.batch,
+                           positions=not args.ignore_positions, minimize_findings=not args.no_minimize,
+                           on_finding=on_finding, on_progress=on_progress)
+
+    print(f"\n📊 Случаев: {stats.cases} за {stats.elapsed:.1f} с ({stats.rate:.0f}/с)")
+    print(f"   Оба приняли: {stats.accepted}, оба отвергли: {stats.rejected}, расхождений: {stats.disagreements}")
+    for signature, count in sorted(stats.signatures.items(), key=lambda entry: -entry[1]):
+        print(f"   {count:>8}  {signature}")
+    if args.out:
+        with open(os.path.join(args.out, 'stats.json'), 'w', encoding='utf-8') as f:
+            json.dump(stats.to_dict(), f, ensure_ascii=False, indent=2)
+    return 1 if findings else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
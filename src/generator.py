@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+ГЕНЕРАТОР СИНТЕТИЧЕСКИХ ПРОГРАММ НА ПСЕВДОКОДЕ
+
+Порождает воспроизводимые (по зерну) программы заданного размера для
+нагрузочного и масштабного тестирования. Наборы операторов сравнения
+и арифметики берутся из продукций грамматики src/grammars/Pseudocode.g4
+и дополняются конструкциями, которые принимает Parser (остаток от деления,
+условия в скобках, комментарии, выражения в границах range).
+
+Управляемые параметры: общий размер, глубина вложенности, ширина
+выражений, плотность комментариев и доля внедряемых ошибок. Вывод
+потоковый, поэтому можно генерировать файлы размером в гигабайты.
+
+Использование:
+    python src/generator.py --size 10M --seed 1 -o big.pseudo
+    python src/generator.py --size 1G --depth 6 --errors 0.001 > huge.pseudo
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+from typing import Dict, Iterator, List, Optional, TextIO
+
+
+GRAMMAR_PATH = os.path.join(os.path.dirname(__file__), 'grammars', 'Pseudocode.g4')
+
+# Операции, которые принимает Parser, но которых нет в грамматике
+PARSER_EXTRA_OPERATORS: Dict[str, List[str]] = {}
+
+IDENTIFIER_STEMS = [
+    'x', 'y', 'n', 'sum', 'count', 'total', 'result', 'max_num', 'min_num',
+    'factorial', 'value', 'acc', 'temp', 'left', 'right', 'mid', 'step',
+]
+
+COMMENT_WORDS = [
+    'compute', 'the', 'sum', 'of', 'values', 'check', 'loop', 'invariant',
+    'update', 'maximum', 'counter', 'result', 'step', 'edge', 'case', 'here',
+]
+
+
+def parse_size(text: str) -> int:
+    """Разбирает размер вида 512, 64K, 10M, 2G."""
+    match = re.fullmatch(r'(\d+(?:\.\d+)?)([KMG]?)B?', text.strip().upper())
+    if not match:
+        raise ValueError(f"Некорректный размер: {text}")
+    multiplier = {'': 1, 'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30}[match.group(2)]
+    return int(float(match.group(1)) * multiplier)
+
+
+class GrammarSpec:
+    """
+    Сведения о языке, извлеченные из грамматики ANTLR.
+
+    Читаются литералы токенов (например, PLUS : '+';) и альтернативы
+    правил comparison, expression и term; по ним определяются операторы,
+    доступные генератору.
+    """
+
+    TOKEN_RULE = re.compile(r"^([A-Z][A-Z_]*)\s*:\s*'([^']+)'\s*;", re.MULTILINE)
+    PARSER_RULE = re.compile(r"^([a-z][a-zA-Z_]*)\s*:(.*?);", re.MULTILINE | re.DOTALL)
+
+    def __init__(self, comparisons: List[str], additive: List[str], multiplicative: List[str]):
+        self.comparisons = comparisons
+        self.additive = additive
+        self.multiplicative = multiplicative
+
+    @classmethod
+    def load(cls, path: str = GRAMMAR_PATH) -> 'GrammarSpec':
+        """Загружает грамматику; при ее отсутствии используются операторы Parser."""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                text = f.read()
+        except OSError:
+            return cls(['==', '!=', '<', '>', '<=', '>='], ['+', '-'], ['*', '/', '%'])
+
+        literals = dict(cls.TOKEN_RULE.findall(text))
+        rules = {name: body for name, body in cls.PARSER_RULE.findall(text)}
+
+        def operators(rule: str) -> List[str]:
+            names = re.findall(r'\b([A-Z][A-Z_]*)\b', rules.get(rule, ''))
+            found = [literals[name] for name in names
+                     if name in literals and not literals[name].isalpha() and literals[name] not in '(){};,']
+            for extra in PARSER_EXTRA_OPERATORS.get(rule, []):
+                if extra not in found:
+                    found.append(extra)
+            return list(dict.fromkeys(found))
+
+        return cls(operators('comparison'), operators('expression'), operators('term'))
+
+
+class ProgramGenerator:
+    """
+    Генератор программ на псевдокоде.
+
+    Программа порождается как поток операторов верхнего уровня; каждый
+    оператор строится по продукциям statement/expression/condition
+    с ограничением глубины вложенности.
+    """
+
+    def __init__(self, seed: int = 0, max_depth: int = 4, expression_width: int = 4,
+                 comment_density: float = 0.1, error_rate: float = 0.0,
+                 grammar: Optional[GrammarSpec] = None):
+        """
+        Args:
+            seed: Зерно генератора случайных чисел
+            max_depth: Максимальная глубина вложенности блоков
+            expression_width: Максимальное число операндов в выражении
+            comment_density: Вероятность комментария перед оператором
+            error_rate: Доля операторов верхнего уровня с внедренной ошибкой
+            grammar: Сведения о грамматике (по умолчанию - из Pseudocode.g4)
+        """
+        self.random = random.Random(seed)
+        self.max_depth = max_depth
+        self.expression_width = max(1, expression_width)
+        self.comment_density = comment_density
+        self.error_rate = error_rate
+        self.grammar = grammar or GrammarSpec.load()
+        self.variables: List[str] = ['x', 'n']
+        self.counter = 0
+        self.errors_injected = 0
+
+    # ------------------------------------------------------------------
+    # Потоковый вывод
+    # ------------------------------------------------------------------
+
+    def statements(self) -> Iterator[str]:
+        """Бесконечный поток операторов верхнего уровня (с переводами строк)."""
+        yield 'x = 1;\nn = 10;\n'
+        while True:
+            # Ограничиваем пул имен, чтобы память не росла с размером программы
+            if len(self.variables) > 256:
+                del self.variables[2:66]
+            text = self._statement(0)
+            if self.error_rate and self.random.random() < self.error_rate:
+                text = self._inject_error(text)
+            yield text + '\n'
+
+    def generate(self, size: int) -> str:
+        """Генерирует программу размером не меньше size символов."""
+        parts, total = [], 0
+        for text in self.statements():
+            parts.append(text)
+            total += len(text)
+            if total >= size:
+                break
+        return ''.join(parts)
+
+    def write(self, out: TextIO, size: int, chunk_size: int = 1 << 20) -> int:
+        """
+        Пишет программу размером не меньше size символов в поток.
+
+        Память ограничена размером буфера chunk_size независимо от size.
+
+        Returns:
+            Число записанных символов
+        """
+        buffer, buffered, total = [], 0, 0
+        for text in self.statements():
+            buffer.append(text)
+            buffered += len(text)
+            if buffered >= chunk_size:
+                out.write(''.join(buffer))
+                total += buffered
+                buffer, buffered = [], 0
+            if total + buffered >= size:
+                break
+        out.write(''.join(buffer))
+        return total + buffered
+
+    # ------------------------------------------------------------------
+    # Продукции
+    # ------------------------------------------------------------------
+
+    def _statement(self, depth: int) -> str:
+        """statement : assignment | conditional | loop | output | block"""
+        indent = '    ' * depth
+        prefix = ''
+        if self.comment_density and self.random.random() < self.comment_density:
+            prefix = f"{indent}# {self._comment()}\n"
+
+        compound = depth < self.max_depth and self.random.random() < 0.3
+        if not compound:
+            kind = self.random.random()
+            if kind < 0.7:
+                return prefix + self._assignment(indent)
+            return prefix + self._output(indent)
+
+        kind = self.random.randrange(4)
+        if kind == 0:
+            return prefix + self._conditional(depth)
+        if kind == 1:
+            return prefix + self._for_loop(depth)
+        if kind == 2:
+            return prefix + self._while_loop(depth)
+        return prefix + f"{indent}{{\n{self._block_body(depth + 1)}{indent}}}"
+
+    def _assignment(self, indent: str) -> str:
+        """assignment : ID ASSIGN expression SEMI"""
+        expression = self._expression(self.random.randint(1, self.expression_width))
+        if self.random.random() < 0.2 or len(self.variables) < 4:
+            name = self._new_variable()
+        else:
+            name = self.random.choice(self.variables)
+        return f"{indent}{name} = {expression};"
+
+    def _output(self, indent: str) -> str:
+        """output : PRINT LPAREN expression RPAREN SEMI"""
+        if self.random.random() < 0.5:
+            expression = f'"{self._comment()}: " + {self.random.choice(self.variables)}'
+        else:
+            expression = self._expression(self.random.randint(1, self.expression_width))
+        return f"{indent}print({expression});"
+
+    def _conditional(self, depth: int) -> str:
+        """conditional : IF (condition) block (ELSE block)?"""
+        indent = '    ' * depth
+        text = f"{indent}if ({self._condition()}) {{\n{self._block_body(depth + 1)}{indent}}}"
+        if self.random.random() < 0.4:
+            text += f" else {{\n{self._block_body(depth + 1)}{indent}}}"
+        return text
+
+    def _for_loop(self, depth: int) -> str:
+        """loop : FOR ID IN RANGE LPAREN expression COMMA expression RPAREN block"""
+        indent = '    ' * depth
+        name = f"i{depth}"
+        start = self.random.randint(0, 3)
+        if self.random.random() < 0.5:
+            end = str(self.random.randint(start, start + 8))
+        else:
+            end = f"{self.random.choice(self.variables)} % 10"
+        self.variables.append(name)
+        body = self._block_body(depth + 1)
+        self.variables.remove(name)
+        return f"{indent}for {name} in range({start}, {end}) {{\n{body}{indent}}}"
+
+    def _while_loop(self, depth: int) -> str:
+        """loop : WHILE (condition) block - со счетчиком, чтобы цикл завершался"""
+        indent = '    ' * depth
+        # Счетчик регистрируется только после тела: иначе присваивание
+        # в теле может выбрать его целью, и цикл не завершится
+        self.counter += 1
+        counter = f"c{self.counter}"
+        body = self._block_body(depth + 1)
+        self.variables.append(counter)
+        inner = '    ' * (depth + 1)
+        return (f"{indent}{counter} = {self.random.randint(1, 5)};\n"
+                f"{indent}while ({counter} > 0) {{\n{body}{inner}{counter} = {counter} - 1;\n{indent}}}")
+
+    def _block_body(self, depth: int) -> str:
+        """block : LBRACE statement* RBRACE - тело без фигурных скобок"""
+        # Переменные, впервые определенные в блоке, не видны после него:
+        # блок может не выполниться, и чтение такой переменной было бы ошибкой
+        mark = len(self.variables)
+        count = self.random.randint(1, 3)
+        body = ''.join(self._statement(depth) + '\n' for _ in range(count))
+        del self.variables[mark:]
+        return body
+
+    def _condition(self) -> str:
+        """condition : expression (comparison expression)?"""
+        left = self._expression(self.random.randint(1, max(1, self.expression_width // 2)))
+        if self.random.random() < 0.1:
+            return left
+        right = self._expression(self.random.randint(1, max(1, self.expression_width // 2)))
+        return f"{left} {self.random.choice(self.grammar.comparisons)} {right}"
+
+    def _expression(self, width: int) -> str:
+        """expression : term ((PLUS | MINUS) term)*"""
+        parts = [self._term()]
+        for _ in range(width - 1):
+            if self.random.random() < 0.5:
+                operator = self.random.choice(self.grammar.additive)
+            else:
+                operator = self.random.choice(self.grammar.multiplicative)
+            parts.append(operator)
+            if operator in ('/', '%'):
+                # Делитель - ненулевой литерал, чтобы программы выполнялись
+                parts.append(str(self.random.randint(1, 100)))
+            else:
+                parts.append(self._term())
+        return ' '.join(parts)
+
+    def _term(self) -> str:
+        """factor : NUMBER | ID | LPAREN expression RPAREN | STRING (без строк в арифметике)"""
+        roll = self.random.random()
+        if roll < 0.45:
+            return self.random.choice(self.variables)
+        if roll < 0.9:
+            return str(self.random.randint(0, 100))
+        return f"({self._expression(2)})"
+
+    # ------------------------------------------------------------------
+    # Вспомогательные функции
+    # ------------------------------------------------------------------
+
+    def _new_variable(self, stem: Optional[str] = None) -> str:
+        self.counter += 1
+        name = f"{stem or self.random.choice(IDENTIFIER_STEMS)}{self.counter}"
+        self.variables.append(name)
+        return name
+
+    def _comment(self) -> str:
+        return ' '.join(self.random.choice(COMMENT_WORDS) for _ in range(self.random.randint(2, 6)))
+
+    def _inject_error(self, text: str) -> str:
+        """Вносит в оператор синтаксическую или лексическую ошибку."""
+        self.errors_injected += 1
+        kind = self.random.randrange(4)
+        if kind == 0 and ';' in text:
+            position = text.rindex(';')
+            return text[:position] + text[position + 1:]
+        if kind == 1 and '}' in text:
+            position = text.rindex('}')
+            return text[:position] + text[position + 1:]
+        if kind == 2 and ')' in text:
+            position = text.index(')')
+            return text[:position] + text[position + 1:]
+        position = self.random.randrange(len(text) + 1)
+        return text[:position] + ' @ ' + text[position:]
+
+
+def main():
+    """Точка входа командной строки."""
+    arg_parser = argparse.ArgumentParser(description="Генератор программ на псевдокоде")
+    arg_parser.add_argument('--size', default='64K', help="Размер программы: 512, 64K, 10M, 2G")
+    arg_parser.add_argument('--seed', type=int, default=0, help="Зерно генератора")
+    arg_parser.add_argument('--depth', type=int, default=4, help="Максимальная глубина вложенности")
+    arg_parser.add_argument('--width', type=int, default=4, help="Максимальная ширина выражений")
+    arg_parser.add_argument('--comments', type=float, default=0.1, help="Плотность комментариев (0..1)")
+    arg_parser.add_argument('--errors', type=float, default=0.0, help="Доля операторов с ошибками (0..1)")
+    arg_parser.add_argument('-o', '--output', help="Файл для записи (по умолчанию - stdout)")
+    args = arg_parser.parse_args()
+
+    generator = ProgramGenerator(seed=args.seed, max_depth=args.depth, expression_width=args.width,
+                                 comment_density=args.comments, error_rate=args.errors)
+    size = parse_size(args.size)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            written = generator.write(f, size)
+        print(f"✅ Записано {written} символов в {args.output} "
+              f"(внедрено ошибок: {generator.errors_injected})", file=sys.stderr)
+    else:
+        generator.write(sys.stdout, size)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
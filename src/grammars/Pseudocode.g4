@@ -1,13 +1,23 @@
 grammar Pseudocode;
 
 // Лексемы
+// Ключевые слова объявлены раньше ID: при равной длине совпадения
+// ANTLR выбирает правило, объявленное первым
+IF        : 'if';
+ELSE      : 'else';
+WHILE     : 'while';
+FOR       : 'for';
+IN        : 'in';
+RANGE     : 'range';
+PRINT     : 'print';
 NUMBER    : [0-9]+;
 ID        : [a-zA-Z_][a-zA-Z_0-9]*;
 ASSIGN    : '=';
 PLUS      : '+';
-MINUS     : '-';  
+MINUS     : '-';
 MUL       : '*';
 DIV       : '/';
+MOD       : '%';
 EQ        : '==';
 NEQ       : '!=';
 LT        : '<';
@@ -17,13 +27,6 @@ GEQ       : '>=';
 AND       : '&&';
 OR        : '||';
 NOT       : '!';
-IF        : 'if';
-ELSE      : 'else';
-WHILE     : 'while';
-FOR       : 'for';
-IN        : 'in';
-RANGE     : 'range';
-PRINT     : 'print';
 LBRACE    : '{';
 RBRACE    : '}';
 LPAREN    : '(';
@@ -31,20 +34,22 @@ RPAREN    : ')';
 SEMI      : ';';
 COMMA     : ',';
 STRING    : '"' ~["]* '"';
+COMMENT   : '#' ~[\n]* -> skip;
 WS        : [ \t\r\n]+ -> skip;
 
 // Синтаксис
-program     : statement+;
-statement   : assignment | conditional | loop | output;
+program     : statement+ EOF;
+statement   : assignment | conditional | loop | output | LBRACE statement* RBRACE;
 assignment  : ID ASSIGN expression SEMI;
-conditional : IF condition block (ELSE block)?;
-loop        : WHILE condition block | FOR ID IN RANGE LPAREN NUMBER COMMA NUMBER RPAREN block;
+conditional : IF LPAREN condition RPAREN block (ELSE block)?;
+loop        : WHILE LPAREN condition RPAREN (block | SEMI)
+            | FOR ID IN RANGE LPAREN expression COMMA expression RPAREN (block | SEMI);
 output      : PRINT LPAREN expression RPAREN SEMI;
 
 condition   : expression (comparison expression)?;
 comparison  : EQ | NEQ | LT | GT | LEQ | GEQ;
 expression  : term ( (PLUS | MINUS) term )*;
-term        : factor ( (MUL | DIV) factor )*;
+term        : factor ( (MUL | DIV | MOD) factor )*;
 factor      : NUMBER | ID | LPAREN expression RPAREN | string;
 string      : STRING;
 
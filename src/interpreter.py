@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+ИНТЕРПРЕТАТОР ПСЕВДОКОДА С ОГРАНИЧЕНИЕМ РЕСУРСОВ
+
+Выполняет AST, построенное синтаксическим анализатором, в «бюджетном»
+режиме: число шагов, время выполнения, объем вывода и размер значений
+ограничены. При превышении любого из лимитов выполнение прерывается
+с указанием причины и сохранением уже накопленного вывода.
+"""
+
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# Добавляем путь для импортов
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.parser import ASTNode, NodeType
+
+
+# Коды причин остановки выполнения
+STATUS_COMPLETED = 'completed'
+STATUS_STEP_LIMIT = 'step_limit'
+STATUS_TIME_LIMIT = 'time_limit'
+STATUS_OUTPUT_LIMIT = 'output_limit'
+STATUS_MEMORY_LIMIT = 'memory_limit'
+STATUS_RUNTIME_ERROR = 'runtime_error'
+
+# Как часто (в шагах) проверять время выполнения
+TIME_CHECK_INTERVAL = 1024
+
+
+class ExecutionLimits:
+    """
+    Бюджет ресурсов для одного запуска программы.
+
+    Значение None отключает соответствующее ограничение.
+    """
+
+    def __init__(self,
+                 max_steps: Optional[int] = 1_000_000,
+                 max_time: Optional[float] = 5.0,
+                 max_output_bytes: Optional[int] = 1 << 20,
+                 max_value_size: Optional[int] = 1_000_000):
+        """
+        Args:
+            max_steps: Максимальное число шагов (операторов и итераций циклов)
+            max_time: Максимальное время выполнения в секундах
+            max_output_bytes: Максимальный объем вывода в байтах (UTF-8)
+            max_value_size: Максимальный размер значения: длина строки,
+                число элементов массива или число байт целого числа
+        """
+        self.max_steps = max_steps
+        self.max_time = max_time
+        self.max_output_bytes = max_output_bytes
+        self.max_value_size = max_value_size
+
+
+class ExecutionAborted(RuntimeError):
+    """Прерывание выполнения программы с указанием причины."""
+
+    def __init__(self, status: str, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class ExecutionState:
+    """Изменяемое состояние одного запуска: переменные, вывод, счетчики."""
+
+    def __init__(self, limits: ExecutionLimits):
+        self.variables: Dict[str, Any] = {}
+        self.output: List[str] = []
+        self.output_bytes = 0
+        self.steps = 0
+        self.max_steps = limits.max_steps
+        self.max_output_bytes = limits.max_output_bytes
+        self.max_time = limits.max_time
+        self.started = time.perf_counter()
+        self.deadline = self.started + limits.max_time if limits.max_time is not None else None
+
+    def tick(self):
+        """Учитывает один шаг выполнения и проверяет бюджет."""
+        self.steps += 1
+        if self.max_steps is not None and self.steps > self.max_steps:
+            raise ExecutionAborted(STATUS_STEP_LIMIT,
+                                   f"Превышен лимит шагов: {self.max_steps}")
+        if (self.deadline is not None and self.steps % TIME_CHECK_INTERVAL == 0
+                and time.perf_counter() > self.deadline):
+            raise ExecutionAborted(STATUS_TIME_LIMIT,
+                                   f"Превышен лимит времени выполнения: {self.max_time} с")
+
+    def write(self, text: str):
+        """Добавляет строку вывода с учетом лимита на объем."""
+        data = text.encode('utf-8')
+        if self.max_output_bytes is not None and self.output_bytes + len(data) > self.max_output_bytes:
+            # Сохраняем ту часть вывода, которая помещается в лимит
+            remaining = self.max_output_bytes - self.output_bytes
+            self.output.append(data[:remaining].decode('utf-8', errors='ignore'))
+            self.output_bytes = self.max_output_bytes
+            raise ExecutionAborted(STATUS_OUTPUT_LIMIT,
+                                   f"Превышен лимит вывода: {self.max_output_bytes} байт")
+        self.output.append(text)
+        self.output_bytes += len(data)
+
+
+def value_size(value: Any) -> int:
+    """
+    Возвращает размер значения в единицах лимита max_value_size.
+
+    Строки измеряются в символах, массивы - в элементах,
+    целые числа - в байтах.
+    """
+    if isinstance(value, (str, list)):
+        return len(value)
+    if isinstance(value, int):
+        return (value.bit_length() + 7) // 8
+    return 0
+
+
+def format_value(value: Any) -> str:
+    """Преобразует значение в строку для вывода и конкатенации."""
+    if isinstance(value, list):
+        return '[' + ', '.join(format_value(item) for item in value) + ']'
+    try:
+        return str(value)
+    except ValueError:
+        # Python ограничивает число цифр при преобразовании int в строку
+        raise ExecutionAborted(STATUS_MEMORY_LIMIT, "Число слишком велико для преобразования в строку")
+
+
+class Interpreter:
+    """
+    Интерпретатор AST псевдокода.
+
+    Перед выполнением AST компилируется в дерево замыканий: каждый оператор
+    превращается в функцию от состояния выполнения, каждое выражение -
+    в функцию от словаря переменных. Это избавляет от повторной диспетчеризации
+    по типу узла на каждой итерации цикла.
+    """
+
+    COMPARISONS = {
+        'EQ': lambda a, b: a == b,
+        'NEQ': lambda a, b: a != b,
+        'LT': lambda a, b: a < b,
+        'GT': lambda a, b: a > b,
+        'LEQ': lambda a, b: a <= b,
+        'GEQ': lambda a, b: a >= b,
+    }
+
+    def __init__(self, limits: Optional[ExecutionLimits] = None):
+        """
+        Инициализация интерпретатора.
+
+        Args:
+            limits: Бюджет ресурсов (по умолчанию - ExecutionLimits())
+        """
+        self.limits = limits or ExecutionLimits()
+
+    def run(self, ast: ASTNode) -> Dict[str, Any]:
+        """
+        Выполняет программу в рамках бюджета.
+
+        Args:
+            ast: Корневой узел AST (программа)
+
+        Returns:
+            Словарь с результатами выполнения:
+                - success: программа завершилась штатно
+                - status: код причины остановки
+                - errors: список сообщений об ошибках
+                - output: накопленный (возможно, частичный) вывод
+                - steps: число выполненных шагов
+                - elapsed: время выполнения в секундах
+                - variables: значения переменных на момент остановки
+        """
+        state = ExecutionState(self.limits)
+        status = STATUS_COMPLETED
+        errors = []
+
+        try:
+            program = self.compile(ast)
+            program(state)
+        except ExecutionAborted as e:
+            status = e.status
+            errors.append(str(e))
+        except RecursionError:
+            status = STATUS_MEMORY_LIMIT
+            errors.append("Превышена глубина вложенности при выполнении")
+
+        return {
+            'success': status == STATUS_COMPLETED,
+            'status': status,
+            'errors': errors,
+            'output': ''.join(state.output),
+            'steps': state.steps,
+            'elapsed': time.perf_counter() - state.started,
+            'variables': state.variables
+        }
+
+    def compile(self, ast: ASTNode) -> Callable[[ExecutionState], None]:
+        """
+        Компилирует AST программы в исполняемую форму.
+
+        Args:
+            ast: Корневой узел AST (программа или оператор)
+
+        Returns:
+            Функция, выполняющая программу над переданным состоянием
+        """
+        return self._compile_statement(ast)
+
+    def _runtime_error(self, node: ASTNode, message: str) -> ExecutionAborted:
+        """Создает ошибку выполнения с указанием позиции узла."""
+        return ExecutionAborted(STATUS_RUNTIME_ERROR,
+                                f"Ошибка выполнения на строке {node.line}: {message}")
+
+    def _check_size(self, node: ASTNode, value: Any) -> Any:
+        """Проверяет размер значения относительно лимита."""
+        limit = self.limits.max_value_size
+        if limit is not None and value_size(value) > limit:
+            raise ExecutionAborted(STATUS_MEMORY_LIMIT,
+                                   f"Превышен лимит размера значения ({limit}) на строке {node.line}")
+        return value
+
+    # ------------------------------------------------------------------
+    # Операторы
+    # ------------------------------------------------------------------
+
+    def _compile_statement(self, node: ASTNode) -> Callable[[ExecutionState], None]:
+        """Компилирует оператор в функцию от состояния выполнения."""
+        compilers = {
+            NodeType.PROGRAM: self._compile_sequence,
+            NodeType.BLOCK: self._compile_sequence,
+            NodeType.ASSIGNMENT: self._compile_assignment,
+            NodeType.CONDITIONAL: self._compile_conditional,
+            NodeType.WHILE_LOOP: self._compile_while_loop,
+            NodeType.FOR_LOOP: self._compile_for_loop,
+            NodeType.OUTPUT: self._compile_output,
+        }
+        compiler = compilers.get(node.node_type)
+        if compiler is None:
+            raise self._runtime_error(node, f"Неподдерживаемый оператор {node.node_type.value}")
+        return compiler(node)
+
+    def _compile_sequence(self, node: ASTNode) -> Callable[[ExecutionState], None]:
+        """Компилирует программу или блок - последовательность операторов."""
+        statements = tuple(self._compile_statement(statement) for statement in node.statements)
+
+        def run_sequence(state):
+            for statement in statements:
+                statement(state)
+
+        return run_sequence
+
+    def _compile_assignment(self, node: ASTNode) -> Callable[[ExecutionState], None]:
+        """Компилирует оператор присваивания."""
+        name = node.variable.name
+        expr = self._compile_expression(node.value)
+        check_size = self._check_size
+
+        def run_assignment(state):
+            state.tick()
+            state.variables[name] = check_size(node, expr(state.variables))
+
+        return run_assignment
+
+    def _compile_conditional(self, node: ASTNode) -> Callable[[ExecutionState], None]:
+        """Компилирует условный оператор."""
+        condition = self._compile_condition(node.condition)
+        then_block = self._compile_statement(node.then_block)
+        else_block = self._compile_statement(node.else_block) if node.else_block else None
+
+        def run_conditional(state):
+            state.tick()
+            if condition(state.variables):
+                then_block(state)
+            elif else_block is not None:
+                else_block(state)
+
+        return run_conditional
+
+    def _compile_while_loop(self, node: ASTNode) -> Callable[[ExecutionState], None]:
+        """Компилирует цикл while. Каждая проверка условия - отдельный шаг."""
+        condition = self._compile_condition(node.condition)
+        body = self._compile_statement(node.body)
+
+        def run_while(state):
+            state.tick()
+            while condition(state.variables):
+                body(state)
+                state.tick()
+
+        return run_while
+
+    def _compile_for_loop(self, node: ASTNode) -> Callable[[ExecutionState], None]:
+        """Компилирует цикл for по диапазону range(start, end)."""
+        name = node.variable.name
+        start = self._compile_expression(node.start)
+        end = self._compile_expression(node.end)
+        body = self._compile_statement(node.body)
+
+        def run_for(state):
+            state.tick()
+            variables = state.variables
+            low, high = start(variables), end(variables)
+            if not isinstance(low, int) or not isinstance(high, int):
+                raise self._runtime_error(node, "Границы range должны быть целыми числами")
+            for value in range(low, high):
+                variables[name] = value
+                body(state)
+                state.tick()
+
+        return run_for
+
+    def _compile_output(self, node: ASTNode) -> Callable[[ExecutionState], None]:
+        """Компилирует оператор вывода."""
+        expr = self._compile_expression(node.expression)
+
+        def run_output(state):
+            state.tick()
+            state.write(format_value(expr(state.variables)) + '\n')
+
+        return run_output
+
+    # ------------------------------------------------------------------
+    # Выражения
+    # ------------------------------------------------------------------
+
+    def _compile_condition(self, node: ASTNode) -> Callable[[Dict[str, Any]], bool]:
+        """Компилирует условие."""
+        left = self._compile_expression(node.left)
+        if node.operator is None:
+            return lambda variables: bool(left(variables))
+
+        right = self._compile_expression(node.right)
+        compare = self.COMPARISONS[node.operator]
+
+        def run_condition(variables):
+            try:
+                return compare(left(variables), right(variables))
+            except TypeError:
+                raise self._runtime_error(node, f"Несовместимые типы в сравнении {node.operator}")
+
+        return run_condition
+
+    def _compile_expression(self, node: ASTNode) -> Callable[[Dict[str, Any]], Any]:
+        """Компилирует выражение в функцию от словаря переменных."""
+        node_type = node.node_type
+
+        if node_type in (NodeType.NUMBER, NodeType.STRING):
+            value = node.value
+            return lambda variables: value
+
+        if node_type == NodeType.VARIABLE:
+            name = node.name
+
+            def run_variable(variables):
+                try:
+                    return variables[name]
+                except KeyError:
+                    raise self._runtime_error(node, f"Переменная '{name}' не определена")
+
+            return run_variable
+
+        if node_type == NodeType.BINARY_OP:
+            return self._compile_binary_op(node)
+
+        if node_type == NodeType.ARRAY:
+            elements = tuple(self._compile_expression(element) for element in node.elements)
+            check_size = self._check_size
+            return lambda variables: check_size(node, [element(variables) for element in elements])
+
+        if node_type == NodeType.ARRAY_ACCESS:
+            array = self._compile_expression(node.array)
+            index = self._compile_expression(node.index)
+
+            def run_access(variables):
+                try:
+                    return array(variables)[index(variables)]
+                except (IndexError, TypeError):
+                    raise self._runtime_error(node, "Некорректный доступ к элементу массива")
+
+            return run_access
+
+        raise self._runtime_error(node, f"Неподдерживаемое выражение {node_type.value}")
+
+    def _compile_binary_op(self, node: ASTNode) -> Callable[[Dict[str, Any]], Any]:
+        """Компилирует бинарную операцию."""
+        left = self._compile_expression(node.left)
+        right = self._compile_expression(node.right)
+        operator = node.operator
+        check_size = self._check_size
+
+        def run_binary_op(variables):
+            a, b = left(variables), right(variables)
+            try:
+                if operator == 'PLUS':
+                    if isinstance(a, str) or isinstance(b, str):
+                        return check_size(node, format_value(a) + format_value(b))
+                    return check_size(node, a + b)
+                if operator == 'MINUS':
+                    return a - b
+                if operator == 'MUL':
+                    if not isinstance(a, int) or not isinstance(b, int):
+                        raise TypeError(operator)
+                    return check_size(node, a * b)
+                if operator == 'DIV':
+                    return a // b
+                if operator == 'MOD':
+                    return a % b
+            except ZeroDivisionError:
+                raise self._runtime_error(node, "Деление на ноль")
+            except TypeError:
+                raise self._runtime_error(node, f"Несовместимые типы в операции {operator}")
+            raise self._runtime_error(node, f"Неизвестная операция {operator}")
+
+        return run_binary_op
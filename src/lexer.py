@@ -10,7 +10,75 @@
 import re
 import os
 import sys
-from typing import List, Dict, Any
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+class InternTable:
+    """
+    Таблица интернирования текста токенов в пределах одного анализа.
+    
+    Все вхождения одного идентификатора или литерала получают один и тот же
+    объект str, поэтому сравнения имен сводятся к проверке identity (словари
+    сначала сравнивают ключи по identity), а повторяющиеся имена хранятся
+    в памяти в одном экземпляре. По запросу выдаются также небольшие
+    целочисленные идентификаторы в порядке первого обращения.
+    """
+    
+    def __init__(self):
+        self.strings: Dict[str, str] = {}
+        self.ids: Dict[str, int] = {}
+        self.texts: List[str] = []
+    
+    def intern(self, text: str) -> str:
+        """Возвращает общий экземпляр строки, равной text."""
+        return self.strings.setdefault(text, text)
+    
+    def id_of(self, text: str) -> int:
+        """Возвращает целочисленный идентификатор текста."""
+        symbol = self.ids.get(text)
+        if symbol is None:
+            symbol = self.ids[text] = len(self.texts)
+            self.texts.append(self.intern(text))
+        return symbol
+    
+    def text_of(self, symbol: int) -> str:
+        """Возвращает текст по целочисленному идентификатору."""
+        return self.texts[symbol]
+    
+    def __len__(self) -> int:
+        return len(self.strings)
+    
+    def __contains__(self, text: str) -> bool:
+        return text in self.strings
+
+
+class LineIndex:
+    """
+    Индекс начал строк исходного кода.
+    
+    Строится одним проходом по тексту и переводит абсолютное смещение
+    символа в пару (строка, столбец) двоичным поиском. Строки нумеруются
+    с 1, столбцы - с 0, как в токенах PseudocodeLexer.tokenize.
+    """
+    
+    def __init__(self, code: str):
+        # Начало каждой следующей строки - накопленная сумма длин
+        # предыдущих строк с учетом символа перевода строки
+        lengths = map(len, code.split('\n'))
+        self.line_starts: List[int] = [0]
+        self.line_starts.extend(accumulate(length + 1 for length in lengths))
+        self.line_starts.pop()
+    
+    def position(self, offset: int) -> Tuple[int, int]:
+        """Возвращает строку и столбец символа со смещением offset."""
+        line = bisect_right(self.line_starts, offset)
+        return line, offset - self.line_starts[line - 1]
+    
+    def line_count(self) -> int:
+        """Возвращает число строк исходного кода."""
+        return len(self.line_starts)
+
 
 class PseudocodeLexer:
     """
@@ -70,11 +138,25 @@ class PseudocodeLexer:
         ('MISMATCH',  r'.'),           # Любой другой символ (ошибка)
     ]
     
+    # Пропуск пробелов вместе с переводами строк в компактном режиме
+    COMPACT_SKIP = r'[ \t\n]+'
+    
     def __init__(self):
         """Инициализация лексического анализатора."""
         # Компилируем регулярное выражение для всех токенов
         token_regex = '|'.join(f'(?P<{name}>{pattern})' for name, pattern in self.TOKEN_SPECIFICATION)
         self.pattern = re.compile(token_regex)
+        
+        # Для компактного режима переводы строк пропускаются вместе с пробелами:
+        # позиции вычисляются по индексу строк, а не в цикле разбора
+        compact_specification = [
+            (name, self.COMPACT_SKIP if name == 'SKIP' else pattern)
+            for name, pattern in self.TOKEN_SPECIFICATION if name != 'NEWLINE'
+        ]
+        compact_regex = '|'.join(f'(?P<{name}>{pattern})' for name, pattern in compact_specification)
+        self.compact_pattern = re.compile(compact_regex)
+        self.intern_table = InternTable()
+        self.line_index = None
     
     def tokenize(self, code: str) -> List[Dict[str, Any]]:
         """
@@ -89,45 +171,107 @@ class PseudocodeLexer:
                 - value: значение токена
                 - line: номер строки
                 - column: позиция в строке
+            Текст идентификаторов, ключевых слов, операторов и строк
+            интернируется в новой таблице self.intern_table.
                 
+        Raises:
+            RuntimeError: При обнаружении неожиданного символа
+        """
+        self.intern_table = InternTable()
+        return list(self.iter_tokens(code, self.intern_table.intern))
+    
+    def tokenize_compact(self, code: str) -> List[Dict[str, Any]]:
+        """
+        Разбивает исходный код на токены с абсолютным смещением вместо позиции.
+        
+        Токены содержат поля type, value и offset; строка и столбец
+        вычисляются по self.line_index (LineIndex этого исходника).
+        
         Raises:
             RuntimeError: При обнаружении неожиданного символа
         """
         tokens = []
-        line_num = 1
-        line_start = 0
+        self.intern_table = InternTable()
+        self.line_index = LineIndex(code)
+        intern = self.intern_table.intern
         
-        for match in self.pattern.finditer(code):
+        for match in self.compact_pattern.finditer(code):
             kind = match.lastgroup
-            value = match.group()
-            column = match.start() - line_start
             
-            # Обработка специальных случаев
-            if kind == 'SKIP':
-                continue  # Пропускаем пробелы
-            elif kind == 'NEWLINE':
-                line_num += 1
-                line_start = match.end()
+            if kind == 'SKIP' or kind == 'COMMENT':
                 continue
-            elif kind == 'COMMENT':
-                continue  # Пропускаем комментарии
-            elif kind == 'NUMBER':
-                value = int(value)  # Преобразуем числа в int
+            
+            value = match.group()
+            if kind == 'NUMBER':
+                value = int(value)
             elif kind == 'STRING':
-                value = value[1:-1]  # Убираем кавычки у строк
+                value = intern(value[1:-1])
             elif kind == 'MISMATCH':
+                line_num = self.line_index.position(match.start())[0]
                 raise RuntimeError(f'Неожиданный символ {value!r} на строке {line_num}')
+            else:
+                value = intern(value)
             
-            # Добавляем токен в результат
             tokens.append({
                 'type': kind,
                 'value': value,
-                'line': line_num,
-                'column': column
+                'offset': match.start()
             })
-        
+
         return tokens
 
+    def iter_tokens(self, code: str,
+                    intern: Optional[Callable[[str], str]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Выдает токены по одному, не накапливая список.
+
+        Токены совпадают с результатом tokenize. Без intern текст не
+        интернируется: генератор предназначен для потоковой обработки,
+        где таблица интернирования росла бы вместе с корпусом.
+
+        Args:
+            code: Исходный код на псевдокоде
+            intern: Функция интернирования текста идентификаторов, ключевых
+                слов, операторов и строк (например, InternTable.intern)
+
+        Raises:
+            RuntimeError: При обнаружении неожиданного символа
+        """
+        line_num = 1
+        line_start = 0
+
+        for match in self.pattern.finditer(code):
+            kind = match.lastgroup
+
+            if kind == 'SKIP' or kind == 'COMMENT':
+                continue
+            if kind == 'NEWLINE':
+                line_num += 1
+                line_start = match.end()
+                continue
+
+            value = match.group()
+            if kind == 'NUMBER':
+                value = int(value)
+            elif kind == 'STRING':
+                value = value[1:-1]
+            elif kind == 'MISMATCH':
+                raise RuntimeError(f'Неожиданный символ {value!r} на строке {line_num}')
+            if intern is not None and kind != 'NUMBER':
+                value = intern(value)
+
+            yield {
+                'type': kind,
+                'value': value,
+                'line': line_num,
+                'column': match.start() - line_start
+            }
+
+            # Переводы строк внутри строкового литерала тоже сдвигают нумерацию
+            if kind == 'STRING' and '\n' in value:
+                line_num += value.count('\n')
+                line_start = match.start() + value.rindex('\n') + 2
+
 
 class LexerAnalyzer:
     """
@@ -154,11 +298,38 @@ class LexerAnalyzer:
         """
         self.tokens = []
         raw_tokens = self.lexer.tokenize(code)
+        return self.convert_tokens(raw_tokens)
+    
+    def convert_tokens(self, raw_tokens: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Преобразует токены лексера в формат, ожидаемый парсером.
+        
+        Args:
+            raw_tokens (List[Dict[str, Any]]): Результат PseudocodeLexer.tokenize
+            
+        Returns:
+            List[Dict[str, Any]]: Список токенов с текстом вместо значения;
+            токены компактного режима сохраняют offset вместо line и column
+        """
+        self.tokens = []
+        intern = self.lexer.intern_table.intern
+        
+        if raw_tokens and 'offset' in raw_tokens[0]:
+            for token in raw_tokens:
+                value = token['value']
+                self.tokens.append({
+                    'text': value if type(value) is str else intern(str(value)),
+                    'type': token['type'],
+                    'offset': token['offset']
+                })
+            return self.tokens
         
         # Преобразуем токены в удобный формат
         for token in raw_tokens:
+            value = token['value']
             token_info = {
-                'text': str(token['value']),
+                # Текст чисел интернируется здесь, остальное - уже в лексере
+                'text': value if type(value) is str else intern(str(value)),
                 'type': token['type'],
                 'line': token['line'],
                 'column': token['column']
@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+"""
+СЕРВЕР LANGUAGE SERVER PROTOCOL ДЛЯ ПСЕВДОКОДА
+
+JSON-RPC поверх stdin/stdout. Для каждого открытого документа сервер
+держит в памяти текст, лексер, токены, AST и таблицу символов последнего
+анализа и поддерживает:
+    - инкрементальную синхронизацию текста (textDocumentSync = 2);
+    - публикацию диагностик лексера, парсера, ASTValidator и чтений
+      переменных до присваивания;
+    - список символов документа и переход к определению по таблице символов.
+
+Анализ выполняется в отдельном потоке с задержкой (debounce) после
+последней правки. Анализ устаревшей версии прерывается между фазами, его
+результат не публикуется. Повторный лексический анализ начинается со
+строки первой правки: токены неизмененных строк выше нее переиспользуются.
+
+Позиции LSP считаются в символах Python-строки, что совпадает с единицами
+UTF-16 для текста без символов вне BMP.
+
+Использование (команда сервера в настройках редактора):
+    python src/lsp_server.py
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+from typing import Any, BinaryIO, Callable, Dict, List, Optional
+
+# Добавляем путь для импортов
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.lexer import LexerAnalyzer, LineIndex
+from src.parser import Parser, ASTValidator
+from src.symbols import SymbolTable, build_symbol_table
+
+
+# Коды и константы протокола
+PARSE_ERROR = -32700
+METHOD_NOT_FOUND = -32601
+SEVERITY_ERROR = 1
+SEVERITY_WARNING = 2
+SYMBOL_KIND_VARIABLE = 13
+SYNC_INCREMENTAL = 2
+
+_SYNTAX_POSITION = re.compile(r'на строке (\d+), позиция (\d+)')
+_LINE_POSITION = re.compile(r'на строке (\d+)')
+
+
+class AnalysisCancelled(Exception):
+    """Анализ прерван: документ изменился или закрыт."""
+
+
+class Document:
+    """Открытый документ и состояние его последнего анализа."""
+
+    def __init__(self, uri: str, text: str, version: int):
+        self.uri = uri
+        self.text = text
+        self.version = version
+        self.closed = False
+        # Первая строка (с 1), измененная после последнего анализа
+        self.dirty_line = 1
+        self.lexer_analyzer = LexerAnalyzer()
+        # Результаты последнего завершенного анализа
+        self.tokens: List[Dict[str, Any]] = []
+        self.tokens_valid = False
+        self.symbols: Optional[SymbolTable] = None
+        self.diagnostics: List[Dict[str, Any]] = []
+        self.analyzed_version: Optional[int] = None
+
+    def apply_change(self, change: Dict[str, Any]):
+        """Применяет одно изменение из didChange (с диапазоном или весь текст)."""
+        if 'range' not in change:
+            self.text = change['text']
+            self.dirty_line = 1
+            return
+        line_index = LineIndex(self.text)
+        start = self.offset(line_index, change['range']['start'])
+        end = self.offset(line_index, change['range']['end'])
+        self.text = self.text[:start] + change['text'] + self.text[end:]
+        self.dirty_line = min(self.dirty_line, change['range']['start']['line'] + 1)
+
+    def offset(self, line_index: LineIndex, position: Dict[str, int]) -> int:
+        """Смещение в тексте для позиции LSP (строки и символы с 0)."""
+        line = position['line']
+        if line >= line_index.line_count():
+            return len(self.text)
+        line_start = line_index.line_starts[line]
+        line_end = self.text.find('\n', line_start)
+        if line_end < 0:
+            line_end = len(self.text)
+        return min(line_start + position['character'], line_end)
+
+
+def _range(line: int, column: int, length: int = 1) -> Dict[str, Any]:
+    """Диапазон LSP по строке (с 1) и столбцу (с 0) анализатора."""
+    line = max(line - 1, 0)
+    return {'start': {'line': line, 'character': column},
+            'end': {'line': line, 'character': column + length}}
+
+
+def _diagnostic(message: str, severity: int = SEVERITY_ERROR) -> Dict[str, Any]:
+    """Диагностика по сообщению анализатора; позиция извлекается из текста."""
+    match = _SYNTAX_POSITION.search(message)
+    if match:
+        position = _range(int(match.group(1)), int(match.group(2)))
+    else:
+        match = _LINE_POSITION.search(message)
+        position = _range(int(match.group(1)) if match else 1, 0, 0)
+        position['end'] = {'line': position['start']['line'] + 1, 'character': 0}
+    return {'range': position, 'severity': severity, 'source': 'pseudocode', 'message': message}
+
+
+def relex(document: Document, text: str, dirty_line: int = 1) -> List[Dict[str, Any]]:
+    """
+    Токены документа с переиспользованием неизмененного начала.
+
+    Токены строк выше dirty_line (первой строки, измененной после прошлого
+    анализа) берутся из прошлого анализа, если он прошел лексический этап.
+    Многострочный строковый литерал, доходящий до dirty_line, заново
+    разбирается с его первой строки вместе с остальными токенами этой
+    строки. При лексической ошибке текст разбирается целиком, чтобы номер
+    строки в сообщении был верным.
+    """
+    restart_line = 1
+    prefix: List[Dict[str, Any]] = []
+    if document.tokens_valid:
+        restart_line = dirty_line
+        for token in document.tokens:
+            if token['line'] >= restart_line:
+                break
+            if token['type'] == 'STRING' and token['line'] + token['text'].count('\n') >= restart_line:
+                restart_line = token['line']
+                prefix = [previous for previous in prefix if previous['line'] < restart_line]
+                break
+            prefix.append(token)
+        if not prefix:
+            restart_line = 1
+
+    line_index = LineIndex(text)
+    start = line_index.line_starts[restart_line - 1] if restart_line <= line_index.line_count() else len(text)
+    analyzer = document.lexer_analyzer
+    try:
+        tokens = analyzer.convert_tokens(analyzer.lexer.tokenize(text[start:]))
+    except RuntimeError:
+        if restart_line == 1:
+            raise
+        return analyzer.convert_tokens(analyzer.lexer.tokenize(text))
+    if restart_line > 1:
+        for token in tokens:
+            token['line'] += restart_line - 1
+    return prefix + tokens
+
+
+def analyze_document(document: Document, text: str, version: int, dirty_line: int = 1,
+                     cancelled: Callable[[], bool] = lambda: False) -> List[Dict[str, Any]]:
+    """
+    Анализирует снимок документа и сохраняет результат в document.
+
+    Между фазами проверяется cancelled(); при отмене состояние документа
+    не меняется и возбуждается AnalysisCancelled.
+    """
+    def checkpoint():
+        if cancelled():
+            raise AnalysisCancelled()
+
+    diagnostics: List[Dict[str, Any]] = []
+    tokens: List[Dict[str, Any]] = []
+    tokens_valid = False
+    symbols = None
+    try:
+        tokens = relex(document, text, dirty_line)
+        tokens_valid = True
+        checkpoint()
+        ast = Parser(tokens).parse()
+        checkpoint()
+        diagnostics.extend(_diagnostic(error) for error in ASTValidator().validate(ast))
+        symbols = build_symbol_table(ast)
+        for occurrence in symbols.undefined_before_use():
+            diagnostics.append({
+                'range': _range(occurrence.line, occurrence.column, len(occurrence.name)),
+                'severity': SEVERITY_WARNING,
+                'source': 'pseudocode',
+                'message': f"Переменная {occurrence.name} используется до присваивания",
+            })
+    except (SyntaxError, RuntimeError) as e:
+        diagnostics.append(_diagnostic(str(e)))
+    checkpoint()
+
+    document.tokens = tokens
+    document.tokens_valid = tokens_valid
+    if symbols is not None:
+        document.symbols = symbols
+    document.diagnostics = diagnostics
+    document.analyzed_version = version
+    return diagnostics
+
+
+class LanguageServer:
+    """
+    Сервер LSP: чтение сообщений в основном потоке, анализ - в фоновом.
+
+    Args:
+        reader: Входной поток (stdin.buffer)
+        writer: Выходной поток (stdout.buffer)
+        debounce: Задержка анализа после последней правки, секунды
+    """
+
+    def __init__(self, reader: BinaryIO, writer: BinaryIO, debounce: float = 0.2):
+        self.reader = reader
+        self.writer = writer
+        self.debounce = debounce
+        self.documents: Dict[str, Document] = {}
+        # Время, когда пора анализировать документ
+        self.deadlines: Dict[str, float] = {}
+        self.condition = threading.Condition()
+        self.write_lock = threading.Lock()
+        self.running = True
+        self.shutdown_requested = False
+        self.stats = {'analyses': 0, 'cancelled': 0}
+        self.handlers = {
+            'initialize': self.initialize,
+            'initialized': lambda params: None,
+            'shutdown': self.shutdown,
+            'exit': self.exit,
+            'textDocument/didOpen': self.did_open,
+            'textDocument/didChange': self.did_change,
+            'textDocument/didClose': self.did_close,
+            'textDocument/documentSymbol': self.document_symbol,
+            'textDocument/definition': self.definition,
+            '$/cancelRequest': lambda params: None,
+        }
+
+    # -- транспорт --------------------------------------------------------
+
+    def read_message(self) -> Optional[Dict[str, Any]]:
+        """Читает одно сообщение с заголовком Content-Length (None в конце потока)."""
+        length = None
+        while True:
+            line = self.reader.readline()
+            if not line:
+                return None
+            line = line.strip()
+            if not line:
+                break
+            name, _, value = line.decode('ascii').partition(':')
+            if name.lower() == 'content-length':
+                length = int(value)
+        if length is None:
+            return {}
+        return json.loads(self.reader.read(length).decode('utf-8'))
+
+    def send(self, message: Dict[str, Any]):
+        body = json.dumps(dict(message, jsonrpc='2.0'), ensure_ascii=False).encode('utf-8')
+        with self.write_lock:
+            self.writer.write(b'Content-Length: %d\r\n\r\n' % len(body) + body)
+            self.writer.flush()
+
+    def notify(self, method: str, params: Dict[str, Any]):
+        self.send({'method': method, 'params': params})
+
+    def handle(self, message: Dict[str, Any]):
+        """Выполняет запрос или уведомление и отправляет ответ на запрос."""
+        method = message.get('method')
+        handler = self.handlers.get(method)
+        if 'id' not in message:
+            if handler:
+                handler(message.get('params') or {})
+            return
+        if handler is None:
+            self.send({'id': message['id'], 'error': {'code': METHOD_NOT_FOUND,
+                                                      'message': f"Метод не поддерживается: {method}"}})
+            return
+        self.send({'id': message['id'], 'result': handler(message.get('params') or {})})
+
+    def serve(self):
+        """Основной цикл: читает сообщения до exit или конца входного потока."""
+        worker = threading.Thread(target=self.analysis_loop, daemon=True)
+        worker.start()
+        while self.running:
+            try:
+                message = self.read_message()
+            except (ValueError, UnicodeDecodeError) as e:
+                self.send({'id': None, 'error': {'code': PARSE_ERROR, 'message': str(e)}})
+                continue
+            if message is None:
+                break
+            self.handle(message)
+        self.stop()
+        worker.join()
+
+    def stop(self):
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+
+    # -- фоновый анализ ---------------------------------------------------
+
+    def schedule(self, uri: str, delay: Optional[float] = None):
+        """Откладывает анализ документа; повторный вызов сдвигает срок."""
+        with self.condition:
+            self.deadlines[uri] = time.monotonic() + (self.debounce if delay is None else delay)
+            self.condition.notify_all()
+
+    def analysis_loop(self):
+        """Поток анализа: ждет ближайшего срока и анализирует документ."""
+        while True:
+            with self.condition:
+                while self.running:
+                    now = time.monotonic()
+                    due = [uri for uri, deadline in self.deadlines.items() if deadline <= now]
+                    if due:
+                        break
+                    timeout = min(self.deadlines.values()) - now if self.deadlines else None
+                    self.condition.wait(timeout)
+                if not self.running:
+                    return
+            for uri in due:
+                self.run_analysis(uri)
+
+    def run_pending(self):
+        """Синхронно выполняет все запланированные анализы (без ожидания сроков)."""
+        with self.condition:
+            pending = list(self.deadlines)
+        for uri in pending:
+            self.run_analysis(uri)
+
+    def run_analysis(self, uri: str):
+        with self.condition:
+            self.deadlines.pop(uri, None)
+            document = self.documents.get(uri)
+            if document is None:
+                return
+            text, version = document.text, document.version
+            document.dirty_line, dirty_line = sys.maxsize, document.dirty_line
+
+        def cancelled():
+            return document.closed or document.version != version
+
+        try:
+            diagnostics = analyze_document(document, text, version, dirty_line, cancelled)
+        except AnalysisCancelled:
+            with self.condition:
+                document.dirty_line = min(document.dirty_line, dirty_line)
+            self.stats['cancelled'] += 1
+            return
+        self.stats['analyses'] += 1
+        self.notify('textDocument/publishDiagnostics',
+                    {'uri': uri, 'version': version, 'diagnostics': diagnostics})
+
+    # -- обработчики ------------------------------------------------------
+
+    def initialize(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'capabilities': {
+                'textDocumentSync': {'openClose': True, 'change': SYNC_INCREMENTAL},
+                'documentSymbolProvider': True,
+                'definitionProvider': True,
+            },
+            'serverInfo': {'name': 'pseudocode-lsp'},
+        }
+
+    def shutdown(self, params: Dict[str, Any]):
+        self.shutdown_requested = True
+        return None
+
+    def exit(self, params: Dict[str, Any]):
+        self.stop()
+
+    def did_open(self, params: Dict[str, Any]):
+        item = params['textDocument']
+        with self.condition:
+            self.documents[item['uri']] = Document(item['uri'], item['text'], item.get('version', 0))
+        self.schedule(item['uri'], delay=0)
+
+    def did_change(self, params: Dict[str, Any]):
+        uri = params['textDocument']['uri']
+        with self.condition:
+            document = self.documents.get(uri)
+            if document is None:
+                return
+            for change in params['contentChanges']:
+                document.apply_change(change)
+            document.version = params['textDocument'].get('version', document.version + 1)
+        self.schedule(uri)
+
+    def did_close(self, params: Dict[str, Any]):
+        uri = params['textDocument']['uri']
+        with self.condition:
+            document = self.documents.pop(uri, None)
+            self.deadlines.pop(uri, None)
+        if document is not None:
+            document.closed = True
+            self.notify('textDocument/publishDiagnostics', {'uri': uri, 'diagnostics': []})
+
+    def document_symbol(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Переменные документа с местом первого определения (или использования)."""
+        document = self.documents.get(params['textDocument']['uri'])
+        if document is None or document.symbols is None:
+            return []
+        result = []
+        for name in document.symbols.names():
+            occurrences = document.symbols.defs(name) or document.symbols.uses(name)
+            first = occurrences[0]
+            result.append({
+                'name': name,
+                'kind': SYMBOL_KIND_VARIABLE,
+                'location': {'uri': document.uri, 'range': _range(first.line, first.column, len(name))},
+            })
+        return result
+
+    def definition(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Определения переменной под курсором."""
+        document = self.documents.get(params['textDocument']['uri'])
+        if document is None or document.symbols is None:
+            return []
+        line = params['position']['line'] + 1
+        character = params['position']['character']
+        for token in document.tokens:
+            if token['line'] > line:
+                break
+            if token['type'] == 'ID' and token['line'] == line \
+                    and token['column'] <= character <= token['column'] + len(token['text']):
+                return [{'uri': document.uri, 'range': _range(o.line, o.column, len(o.name))}
+                        for o in document.symbols.defs(token['text'])]
+        return []
+
+
+def main():
+    """Запускает сервер на stdin/stdout."""
+    server = LanguageServer(sys.stdin.buffer, sys.stdout.buffer)
+    server.serve()
+    return 0 if server.shutdown_requested else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+ИНСТРУМЕНТИРОВАНИЕ АНАЛИЗА
+
+Сбор времени и числа выделений памяти по фазам анализа (лексический
+анализ, преобразование токенов, синтаксический анализ вместе с валидацией,
+построение таблицы символов, сериализация), а также счетчиков узлов
+AST по типам и максимальной глубины вложенности.
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional, TextIO
+
+# Добавляем путь для импортов
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.parser import ASTNode, iter_child_nodes
+
+
+# Порядок фаз анализа в отчетах. Правила ASTValidator проверяются
+# при создании узлов, поэтому время валидации входит в фазу parsing
+PHASES = ('lexing', 'token_conversion', 'parsing', 'symbols', 'to_dict')
+
+# Тип функции обратного вызова, получающей собранные метрики
+MetricsCallback = Callable[[Dict[str, Any]], None]
+
+
+class AnalysisMetrics:
+    """
+    Метрики одного запуска анализа.
+
+    Для каждой фазы записываются время (секунды) и прирост числа выделенных
+    блоков памяти интерпретатора (sys.getallocatedblocks). При trace_memory=True
+    дополнительно записывается пиковый объем памяти фазы через tracemalloc -
+    это точнее, но заметно замедляет анализ. Пиковая память фазы требует
+    tracemalloc.reset_peak (Python 3.9+), на Python 3.8 она не записывается.
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        """
+        Args:
+            trace_memory: Включить измерение пиковой памяти через tracemalloc
+        """
+        self.trace_memory = trace_memory
+        self.phases: Dict[str, Dict[str, Any]] = {}
+        self.node_counts: Dict[str, int] = {}
+        self.node_total = 0
+        self.max_depth = 0
+
+    @contextmanager
+    def phase(self, name: str):
+        """Контекст измерения одной фазы анализа."""
+        # reset_peak появился в Python 3.9: без него пик нельзя отнести к фазе
+        tracing = (self.trace_memory and tracemalloc.is_tracing()
+                   and hasattr(tracemalloc, 'reset_peak'))
+        if tracing:
+            tracemalloc.reset_peak()
+            base_memory = tracemalloc.get_traced_memory()[0]
+        blocks = sys.getallocatedblocks()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            record = {
+                'time': time.perf_counter() - started,
+                'allocated_blocks': sys.getallocatedblocks() - blocks
+            }
+            if tracing:
+                record['peak_memory'] = tracemalloc.get_traced_memory()[1] - base_memory
+            self.phases[name] = record
+
+    def count_nodes(self, ast: ASTNode):
+        """Подсчитывает узлы AST по типам и максимальную глубину вложенности."""
+        counts: Dict[str, int] = {}
+        max_depth = 0
+        stack = [(ast, 1)]
+        while stack:
+            node, depth = stack.pop()
+            key = node.node_type.value
+            counts[key] = counts.get(key, 0) + 1
+            if depth > max_depth:
+                max_depth = depth
+            for child in iter_child_nodes(node):
+                stack.append((child, depth + 1))
+
+        self.node_counts = counts
+        self.node_total = sum(counts.values())
+        self.max_depth = max_depth
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Преобразует метрики в словарь для результата анализа."""
+        phases = {name: self.phases[name] for name in PHASES if name in self.phases}
+        return {
+            'phases': phases,
+            'total_time': sum(record['time'] for record in phases.values()),
+            'node_counts': self.node_counts,
+            'node_total': self.node_total,
+            'max_depth': self.max_depth
+        }
+
+
+def print_metrics(metrics: Dict[str, Any], file: Optional[TextIO] = None):
+    """Выводит метрики анализа в виде таблицы (в file или sys.stdout)."""
+    print(f"\n⏱️  МЕТРИКИ АНАЛИЗА:", file=file)
+    print(f"   {'ФАЗА':<20} {'ВРЕМЯ, мс':>12} {'БЛОКОВ':>10}", file=file)
+    for name, record in metrics['phases'].items():
+        print(f"   {name:<20} {record['time'] * 1000:>12.3f} {record['allocated_blocks']:>10}", file=file)
+    print(f"   Всего: {metrics['total_time'] * 1000:.3f} мс (parsing включает валидацию AST)", file=file)
+    print(f"   Узлов AST: {metrics['node_total']}, максимальная глубина: {metrics['max_depth']}", file=file)
+    for node_type, count in sorted(metrics['node_counts'].items()):
+        print(f"     {node_type}: {count}", file=file)
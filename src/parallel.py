@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+ПАРАЛЛЕЛЬНЫЙ РАЗБОР БОЛЬШОГО ФАЙЛА
+
+Файл лексически анализируется один раз, затем поток токенов делится на
+части по безопасным границам - перед оператором верхнего уровня: глубина
+фигурных скобок равна нулю, предыдущий токен завершает оператор (';' или
+'}'), а текущий не является else. Части разбираются в пуле процессов, и
+списки операторов склеиваются в одну программу.
+
+Токены несут абсолютные позиции, поэтому позиции узлов после склейки
+верны, а первая синтаксическая ошибка совпадает с ошибкой обычного разбора:
+до границы последовательный парсер доходит в том же состоянии - в начале
+оператора верхнего уровня.
+
+Рабочие процессы получают токены при запуске пула (при fork - без
+копирования) и по заданию принимают только границы части. Результат
+части возвращается как FlatAST: его массивы передаются между процессами
+на порядки быстрее, чем дерево объектов ASTNode.
+
+Использование:
+    python src/parallel.py big.pseudo --workers 8
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+# Добавляем путь для импортов
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.flat_ast import FlatAST
+from src.lexer import LexerAnalyzer, LineIndex
+from src.parser import ASTNode, NodeType, Parser
+
+# Токены, завершающие оператор верхнего уровня
+TERMINATORS = ('SEMI', 'RBRACE')
+
+# Меньшие части не окупают передачу результата между процессами
+DEFAULT_MIN_CHUNK_TOKENS = 20000
+
+
+def find_split_points(tokens: List[Dict[str, Any]]) -> List[int]:
+    """Индексы токенов, перед которыми можно разрезать программу."""
+    points = []
+    depth = 0
+    previous = None
+    for index, token in enumerate(tokens):
+        token_type = token['type']
+        if depth == 0 and previous in TERMINATORS and token_type != 'ELSE':
+            points.append(index)
+        if token_type == 'LBRACE':
+            depth += 1
+        elif token_type == 'RBRACE':
+            depth -= 1
+        previous = token_type
+    return points
+
+
+def plan_chunks(tokens: List[Dict[str, Any]], chunks: int,
+                min_chunk_tokens: int = DEFAULT_MIN_CHUNK_TOKENS) -> List[Tuple[int, int]]:
+    """
+    Делит токены примерно на chunks равных частей по безопасным границам.
+
+    Returns:
+        Список границ (начало, конец) частей, покрывающих все токены
+    """
+    total = len(tokens)
+    chunks = max(1, min(chunks, total // max(min_chunk_tokens, 1)))
+    if chunks == 1:
+        return [(0, total)]
+
+    points = find_split_points(tokens)
+    bounds = []
+    start = 0
+    position = 0
+    for part in range(1, chunks):
+        target = total * part // chunks
+        # Первая граница не раньше целевой позиции
+        while position < len(points) and points[position] < max(target, start + 1):
+            position += 1
+        if position == len(points):
+            break
+        bounds.append((start, points[position]))
+        start = points[position]
+    bounds.append((start, total))
+    return bounds
+
+
+# Состояние рабочего процесса: токены файла и индекс строк
+_worker_tokens: Optional[List[Dict[str, Any]]] = None
+_worker_line_index: Optional[LineIndex] = None
+
+
+def _init_worker(tokens: List[Dict[str, Any]], line_index: Optional[LineIndex]):
+    global _worker_tokens, _worker_line_index
+    _worker_tokens = tokens
+    _worker_line_index = line_index
+
+
+def _parse_chunk(bounds: Tuple[int, int], flat: bool) -> Union[FlatAST, List[ASTNode]]:
+    """Разбирает часть токенов в рабочем процессе."""
+    start, end = bounds
+    if flat:
+        program = Parser(_worker_tokens[start:end], line_index=_worker_line_index).parse()
+        tree = FlatAST.from_ast(program, _worker_line_index)
+        # Индекс строк у основного процесса свой - не передаем его обратно
+        tree.line_index = None
+        return tree
+    return Parser(_worker_tokens[start:end]).parse().statements
+
+
+def parse_parallel(code: str, workers: Optional[int] = None, flat: bool = True,
+                   min_chunk_tokens: int = DEFAULT_MIN_CHUNK_TOKENS,
+                   stats: Optional[Dict[str, Any]] = None) -> Union[FlatAST, ASTNode]:
+    """
+    Разбирает программу, распределяя части по процессам.
+
+    Args:
+        code: Исходный код
+        workers: Число процессов (по умолчанию - число ядер)
+        flat: Вернуть FlatAST (иначе - ASTNode программы; передача
+            деревьев объектов между процессами заметно дороже)
+        min_chunk_tokens: Минимальный размер части в токенах
+        stats: Словарь, в который записываются время этапов и число частей
+
+    Returns:
+        FlatAST или корневой узел PROGRAM
+
+    Raises:
+        SyntaxError: Первая синтаксическая ошибка программы
+    """
+    workers = workers or os.cpu_count() or 1
+    started = time.perf_counter()
+    lexer = LexerAnalyzer()
+    if flat:
+        tokens = lexer.convert_tokens(lexer.lexer.tokenize_compact(code))
+        line_index = lexer.lexer.line_index
+    else:
+        tokens = lexer.convert_tokens(lexer.lexer.tokenize(code))
+        line_index = None
+    lexed = time.perf_counter()
+
+    bounds = plan_chunks(tokens, workers, min_chunk_tokens)
+    if len(bounds) == 1:
+        _init_worker(tokens, line_index)
+        try:
+            parts = [_parse_chunk(bounds[0], flat)]
+        finally:
+            _init_worker(None, None)
+    else:
+        context = multiprocessing.get_context('fork') if 'fork' in multiprocessing.get_all_start_methods() else None
+        with ProcessPoolExecutor(min(workers, len(bounds)), mp_context=context,
+                                 initializer=_init_worker, initargs=(tokens, line_index)) as pool:
+            parts = list(pool.map(_parse_chunk, bounds, [flat] * len(bounds)))
+    parsed = time.perf_counter()
+
+    if flat and len(parts) == 1:
+        result = parts[0]
+        result.line_index = line_index
+    elif flat:
+        result = FlatAST.join_programs(parts, line_index)
+    else:
+        result = ASTNode(NodeType.PROGRAM, statements=[statement for part in parts for statement in part])
+    if stats is not None:
+        stats.update({
+            'chunks': len(bounds),
+            'tokens': len(tokens),
+            'lexing': lexed - started,
+            'parsing': parsed - lexed,
+            'joining': time.perf_counter() - parsed,
+        })
+    return result
+
+
+def main():
+    """Точка входа командной строки."""
+    arg_parser = argparse.ArgumentParser(description="Параллельный разбор большого файла")
+    arg_parser.add_argument('file', help="Файл с псевдокодом")
+    arg_parser.add_argument('--workers', type=int, default=None, help="Число процессов")
+    arg_parser.add_argument('--min-chunk', type=int, default=DEFAULT_MIN_CHUNK_TOKENS,
+                            help="Минимальный размер части в токенах")
+    args = arg_parser.parse_args()
+
+    with open(args.file, 'r', encoding='utf-8') as f:
+        code = f.read()
+
+    stats: Dict[str, Any] = {}
+    try:
+        tree = parse_parallel(code, args.workers, min_chunk_tokens=args.min_chunk, stats=stats)
+    except (SyntaxError, RuntimeError) as e:
+        print(f"❌ {e}")
+        return 1
+    print(f"✅ {args.file}: {stats['tokens']} токенов, {len(tree)} узлов, частей: {stats['chunks']}")
+    print(f"⏱️  лексер {stats['lexing']:.2f} с, разбор {stats['parsing']:.2f} с, склейка {stats['joining']:.2f} с")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
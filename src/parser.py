@@ -9,9 +9,15 @@
 
 import os
 import sys
-from typing import List, Dict, Any, Optional, Union
+import weakref
+from typing import List, Dict, Any, Optional, Union, Iterator, Tuple, Type, Callable
 from enum import Enum
 
+# Добавляем путь для импортов
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.lexer import LineIndex
+
 class NodeType(Enum):
     """Типы узлов AST."""
     PROGRAM = "PROGRAM"
@@ -35,6 +41,9 @@ class NodeType(Enum):
 class ASTNode:
     """Базовый класс для узлов AST."""
     
+    # Переопределяется узлами с собственным хранением полей (см. iter_fields)
+    _field_items = None
+    
     def __init__(self, node_type: NodeType, **kwargs):
         self.node_type = node_type
         self.line = kwargs.get('line', 0)
@@ -77,6 +86,199 @@ class ASTNode:
         return result
 
 
+class OffsetASTNode(ASTNode):
+    """
+    Узел AST, хранящий вместо строки и столбца одно абсолютное смещение.
+    
+    Строка и столбец вычисляются по индексу начал строк только при
+    обращении (в диагностике и отчетах). Индекс задается атрибутом класса,
+    поэтому для каждого разбора создается свой подкласс (см.
+    offset_node_class), а сам узел не хранит ссылку на индекс.
+    """
+    
+    _line_index: Optional[LineIndex] = None
+    
+    def __init__(self, node_type: NodeType, _offset: Optional[int] = None, **kwargs):
+        self.node_type = node_type
+        self._offset = _offset
+        
+        # Динамически устанавливаем атрибуты
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+    
+    @property
+    def line(self) -> int:
+        if self._offset is None:
+            return 0
+        return self._line_index.position(self._offset)[0]
+    
+    @property
+    def column(self) -> int:
+        if self._offset is None:
+            return 0
+        return self._line_index.position(self._offset)[1]
+
+
+def offset_node_class(line_index: LineIndex) -> Type[OffsetASTNode]:
+    """Создает подкласс OffsetASTNode, привязанный к индексу строк одного исходника."""
+    return type('OffsetASTNode', (OffsetASTNode,), {'_line_index': line_index})
+
+
+def iter_fields(node: ASTNode) -> Iterator[Tuple[str, Any]]:
+    """
+    Перебирает поля узла в порядке их задания при построении.
+    
+    В отличие от обхода через dir(), не сортирует имена и не затрагивает
+    методы класса; служебные поля (тип узла и позиция) пропускаются.
+    Отложенный блок при этом разбирается. Узлы, не хранящие поля в
+    атрибутах (посредники FlatNode), перечисляют их методом _field_items.
+    """
+    if isinstance(node, LazyBlockNode):
+        node._materialize()
+    if node._field_items is not None:
+        yield from node._field_items()
+        return
+    for key, value in vars(node).items():
+        if not key.startswith('_') and key not in ('node_type', 'line', 'column'):
+            yield key, value
+
+
+def iter_child_nodes(node: ASTNode) -> Iterator[ASTNode]:
+    """Перебирает непосредственные дочерние узлы в порядке следования полей."""
+    for _, value in iter_fields(node):
+        if isinstance(value, ASTNode):
+            yield value
+        elif isinstance(value, list):
+            for item in value:
+                if isinstance(item, ASTNode):
+                    yield item
+
+
+class HashConsFactory:
+    """
+    Фабрика узлов AST с разделением одинаковых поддеревьев (hash-consing).
+    
+    Узлы NUMBER, STRING, VARIABLE и BINARY_OP не хранят позицию и создаются
+    один раз на структуру: повторный запрос возвращает уже существующий узел
+    из таблицы со слабыми ссылками. Дочерние узлы BINARY_OP сами разделены,
+    поэтому структурное равенство таких узлов сводится к проверке identity,
+    а структурный хеш (атрибут _hash) вычисляется из идентификаторов детей.
+    Узлы операторов сохраняют позиции и не разделяются.
+    
+    Разделенные узлы нельзя изменять: изменение видно во всех местах дерева.
+    Сама таблица занимает заметную память (слабая ссылка и ключ на узел),
+    поэтому после разбора фабрику стоит очистить (clear) или отпустить -
+    построенные деревья при этом остаются разделенными.
+    """
+    
+    SHARED_TYPES = frozenset([NodeType.NUMBER, NodeType.STRING, NodeType.VARIABLE, NodeType.BINARY_OP])
+    
+    def __init__(self):
+        self.table = weakref.WeakValueDictionary()
+        self.hits = 0
+        self.misses = 0
+    
+    def wrap(self, make_node: Callable[..., ASTNode]) -> Callable[..., ASTNode]:
+        """Оборачивает функцию создания узлов парсера (см. Parser._make_node)."""
+        shared_types = self.SHARED_TYPES
+        table = self.table
+        
+        def make_shared_node(node_type: NodeType, source, **fields) -> ASTNode:
+            if node_type not in shared_types:
+                return make_node(node_type, source, **fields)
+            
+            if node_type is NodeType.BINARY_OP:
+                key = (node_type, fields['operator'], id(fields['left']), id(fields['right']))
+            elif node_type is NodeType.VARIABLE:
+                key = (node_type, fields['name'])
+            else:
+                # type() различает, например, 1 и '1'
+                value = fields['value']
+                key = (node_type, type(value), value)
+            
+            node = table.get(key)
+            if node is None:
+                self.misses += 1
+                node = make_node(node_type, None, **fields)
+                node._hash = hash(key)
+                table[key] = node
+            else:
+                self.hits += 1
+            return node
+        
+        return make_shared_node
+    
+    def clear(self):
+        """Очищает таблицу; уже построенные узлы остаются разделенными."""
+        self.table.clear()
+    
+    def stats(self) -> Dict[str, int]:
+        """Возвращает число живых разделенных узлов, попаданий и промахов."""
+        return {'shared_nodes': len(self.table), 'hits': self.hits, 'misses': self.misses}
+
+
+def match_braces(tokens: List[Dict[str, Any]]) -> Dict[int, int]:
+    """
+    Сопоставляет фигурные скобки за один проход по токенам.
+    
+    Returns:
+        Словарь: индекс LBRACE -> индекс парной RBRACE (незакрытые скобки
+        в словарь не попадают, лишние закрывающие пропускаются)
+    """
+    matches = {}
+    stack = []
+    for i, token in enumerate(tokens):
+        token_type = token['type']
+        if token_type == 'LBRACE':
+            stack.append(i)
+        elif token_type == 'RBRACE' and stack:
+            matches[stack.pop()] = i
+    return matches
+
+
+class LazyBlockNode(ASTNode):
+    """
+    Блок в фигурных скобках, тело которого разбирается при первом обращении.
+    
+    До обращения к statements узел хранит только ссылку на список токенов
+    и диапазон [start, end) между скобками. Синтаксические ошибки внутри
+    тела обнаруживаются при разборе, т.е. при первом обращении к statements
+    (а также при to_dict, валидации и любом обходе дочерних узлов).
+    """
+    
+    def __init__(self, parser: 'Parser', start: int, end: int, line: int, column: int):
+        super().__init__(NodeType.BLOCK, line=line, column=column)
+        self._parser = parser
+        self._start = start
+        self._end = end
+    
+    def __getattr__(self, name: str):
+        # Вызывается только для отсутствующих атрибутов
+        if name == 'statements' and self.__dict__.get('_parser') is not None:
+            self._materialize()
+            return self.__dict__['statements']
+        raise AttributeError(name)
+    
+    def __dir__(self):
+        # to_dict, __repr__ и ASTValidator перебирают поля через dir()
+        self._materialize()
+        return super().__dir__()
+    
+    def _materialize(self):
+        """Разбирает тело блока, если оно еще не разобрано."""
+        if self.__dict__.get('_parser') is None:
+            return
+        parser = self._parser.spawn(self._start)
+        
+        statements = []
+        while parser.current_pos < self._end:
+            statements.append(parser.parse_statement())
+        
+        self.statements = statements
+        # Токены и парсер больше не нужны этому узлу
+        self._parser = None
+
+
 class Parser:
     """
     Синтаксический анализатор для псевдокода.
@@ -84,21 +286,116 @@ class Parser:
     Преобразует последовательность токенов в AST (Abstract Syntax Tree).
     """
     
-    def __init__(self, tokens: List[Dict[str, Any]]):
+    def __init__(self, tokens: List[Dict[str, Any]], lazy_blocks: bool = False,
+                 line_index: Optional[LineIndex] = None,
+                 node_factory: Optional[HashConsFactory] = None,
+                 validate: bool = False, validator: Optional['ASTValidator'] = None):
         """
         Инициализация парсера.
         
         Args:
             tokens: Список токенов от лексического анализатора
+            lazy_blocks: Откладывать разбор тел блоков в фигурных скобках
+                до первого обращения к ним (см. LazyBlockNode)
+            line_index: Индекс строк исходника для токенов с полем offset
+                (PseudocodeLexer.tokenize_compact); узлы тогда хранят
+                смещение вместо строки и столбца (см. OffsetASTNode)
+            node_factory: Фабрика, разделяющая одинаковые поддеревья выражений
+                (HashConsFactory); может быть общей для нескольких разборов
+            validate: Проверять узлы правилами ASTValidator при их создании;
+                ошибки в том же порядке, что и у ASTValidator.validate,
+                доступны после parse() в self.validation_errors
+            validator: Валидатор с правилами для проверки при разборе
+                (включает validate)
         """
         self.tokens = tokens
         self.current_pos = 0
         self.current_token = self.tokens[0] if tokens else None
+        self.lazy_blocks = lazy_blocks
+        self.line_index = line_index
+        self._brace_matches = None
+        if line_index is None:
+            self._node_class = ASTNode
+            self._make_node = self._make_line_node
+        else:
+            self._node_class = offset_node_class(line_index)
+            self._make_node = self._make_offset_node
+        if node_factory is not None:
+            self._make_node = node_factory.wrap(self._make_node)
+        self.validation_errors: List[str] = []
+        if validate or validator is not None:
+            if lazy_blocks:
+                raise ValueError("Проверка при разборе несовместима с отложенным разбором блоков")
+            self._make_node = self._validating(self._make_node, validator or ASTValidator())
+    
+    def _validating(self, make_node: Callable[..., ASTNode],
+                    validator: 'ASTValidator') -> Callable[..., ASTNode]:
+        """
+        Оборачивает создание узлов проверкой правилами валидатора.
+        
+        Дети создаются раньше родителя, а ASTValidator выдает ошибки в
+        прямом порядке обхода (узел, затем дети в порядке имен полей).
+        Поэтому для каждого узла с ошибками в поддереве хранится их список,
+        и список родителя собирается из собственных ошибок и списков детей.
+        """
+        # id(узла) -> (узел, ошибки поддерева); только для узлов с ошибками
+        subtree_errors: Dict[int, Tuple[ASTNode, List[str]]] = {}
+        self._subtree_errors = subtree_errors
+        check_node = validator.check_node
+        
+        def make_validated_node(node_type: NodeType, source, **fields) -> ASTNode:
+            node = make_node(node_type, source, **fields)
+            errors = check_node(node)
+            if subtree_errors:
+                for name in sorted(fields):
+                    value = fields[name]
+                    for child in (value if isinstance(value, list) else (value,)):
+                        entry = subtree_errors.get(id(child))
+                        if entry is not None and entry[0] is child:
+                            errors.extend(entry[1])
+            if errors:
+                subtree_errors[id(node)] = (node, errors)
+            if node_type is NodeType.PROGRAM:
+                self.validation_errors = errors
+            return node
+        
+        return make_validated_node
+    
+    def spawn(self, position: int) -> 'Parser':
+        """Создает парсер с теми же токенами и настройками, начинающий с position."""
+        parser = Parser.__new__(Parser)
+        parser.__dict__.update(self.__dict__)
+        parser.current_pos = position
+        parser.current_token = self.tokens[position] if position < len(self.tokens) else None
+        return parser
+    
+    def _make_line_node(self, node_type: NodeType, source: Union[Dict[str, Any], ASTNode, None],
+                        **fields) -> ASTNode:
+        """Создает узел с позицией токена или узла source."""
+        if source is None:
+            return ASTNode(node_type, **fields)
+        if isinstance(source, dict):
+            return ASTNode(node_type, line=source['line'], column=source['column'], **fields)
+        return ASTNode(node_type, line=source.line, column=source.column, **fields)
+    
+    def _make_offset_node(self, node_type: NodeType, source: Union[Dict[str, Any], ASTNode, None],
+                          **fields) -> ASTNode:
+        """Создает узел со смещением токена или узла source."""
+        if source is None:
+            return self._node_class(node_type, **fields)
+        if isinstance(source, dict):
+            return self._node_class(node_type, source['offset'], **fields)
+        return self._node_class(node_type, source._offset, **fields)
+    
+    def token_position(self, token: Dict[str, Any]) -> Tuple[int, int]:
+        """Возвращает строку и столбец токена."""
+        if self.line_index is None:
+            return token.get('line', 0), token.get('column', 0)
+        return self.line_index.position(token['offset'])
     
     def error(self, message: str):
         """Генерирует ошибку синтаксического анализа."""
-        line = self.current_token.get('line', 0) if self.current_token else 0
-        column = self.current_token.get('column', 0) if self.current_token else 0
+        line, column = self.token_position(self.current_token) if self.current_token else (0, 0)
         raise SyntaxError(f"Синтаксическая ошибка на строке {line}, позиция {column}: {message}")
     
     def eat(self, token_type: str) -> Dict[str, Any]:
@@ -145,7 +442,7 @@ class Parser:
             if statement:
                 statements.append(statement)
         
-        return ASTNode(NodeType.PROGRAM, statements=statements)
+        return self._make_node(NodeType.PROGRAM, None, statements=statements)
     
     def parse_statement(self) -> Optional[ASTNode]:
         """Разбирает оператор."""
@@ -176,17 +473,15 @@ class Parser:
         expr = self.parse_expression()
         self.eat('SEMI')
         
-        return ASTNode(
+        return self._make_node(
             NodeType.ASSIGNMENT,
-            variable=ASTNode(
+            variable_token,
+            variable=self._make_node(
                 NodeType.VARIABLE,
-                name=variable_token['text'],
-                line=variable_token['line'],
-                column=variable_token['column']
+                variable_token,
+                name=variable_token['text']
             ),
-            value=expr,
-            line=variable_token['line'],
-            column=variable_token['column']
+            value=expr
         )
     
     def parse_conditional(self) -> ASTNode:
@@ -203,13 +498,12 @@ class Parser:
             self.eat('ELSE')
             else_block = self.parse_block()
         
-        return ASTNode(
+        return self._make_node(
             NodeType.CONDITIONAL,
+            if_token,
             condition=condition,
             then_block=then_block,
-            else_block=else_block,
-            line=if_token['line'],
-            column=if_token['column']
+            else_block=else_block
         )
     
     def parse_while_loop(self) -> ASTNode:
@@ -223,22 +517,20 @@ class Parser:
         if self.peek('SEMI'):
             # Цикл без тела - просто потребляем точку с запятой
             self.eat('SEMI')
-            body = ASTNode(
+            body = self._make_node(
                 NodeType.BLOCK,
-                statements=[],
-                line=while_token['line'],
-                column=while_token['column']
+                while_token,
+                statements=[]
             )
         else:
             # Цикл с телом
             body = self.parse_block()
         
-        return ASTNode(
+        return self._make_node(
             NodeType.WHILE_LOOP,
+            while_token,
             condition=condition,
-            body=body,
-            line=while_token['line'],
-            column=while_token['column']
+            body=body
         )
     
     def parse_for_loop(self) -> ASTNode:
@@ -257,29 +549,26 @@ class Parser:
         if self.peek('SEMI'):
             # Цикл без тела - просто потребляем точку с запятой
             self.eat('SEMI')
-            body = ASTNode(
+            body = self._make_node(
                 NodeType.BLOCK,
-                statements=[],
-                line=for_token['line'],
-                column=for_token['column']
+                for_token,
+                statements=[]
             )
         else:
             # Цикл с телом
             body = self.parse_block()
         
-        return ASTNode(
+        return self._make_node(
             NodeType.FOR_LOOP,
-            variable=ASTNode(
+            for_token,
+            variable=self._make_node(
                 NodeType.VARIABLE,
-                name=variable_token['text'],
-                line=variable_token['line'],
-                column=variable_token['column']
+                variable_token,
+                name=variable_token['text']
             ),
             start=start,
             end=end,
-            body=body,
-            line=for_token['line'],
-            column=for_token['column']
+            body=body
         )
     
     def parse_output(self) -> ASTNode:
@@ -290,15 +579,19 @@ class Parser:
         self.eat('RPAREN')
         self.eat('SEMI')
         
-        return ASTNode(
+        return self._make_node(
             NodeType.OUTPUT,
-            expression=expr,
-            line=print_token['line'],
-            column=print_token['column']
+            print_token,
+            expression=expr
         )
     
     def parse_block(self) -> ASTNode:
         """Разбирает блок кода."""
+        if self.lazy_blocks and self.peek('LBRACE'):
+            lazy_block = self.skip_block()
+            if lazy_block:
+                return lazy_block
+        
         if self.peek('LBRACE'):
             lbrace_token = self.eat('LBRACE')
             statements = []
@@ -310,22 +603,43 @@ class Parser:
             
             self.eat('RBRACE')
             
-            return ASTNode(
+            return self._make_node(
                 NodeType.BLOCK,
-                statements=statements,
-                line=lbrace_token['line'],
-                column=lbrace_token['column']
+                lbrace_token,
+                statements=statements
             )
         else:
             # Одиночный оператор как блок
             statement = self.parse_statement()
-            return ASTNode(
+            return self._make_node(
                 NodeType.BLOCK,
-                statements=[statement] if statement else [],
-                line=statement.line if statement else 0,
-                column=statement.column if statement else 0
+                statement,
+                statements=[statement] if statement else []
             )
     
+    def skip_block(self) -> Optional[ASTNode]:
+        """
+        Пропускает блок в фигурных скобках, не разбирая его тело.
+        
+        Returns:
+            LazyBlockNode с диапазоном токенов тела или None, если у скобки
+            нет пары (тогда блок разбирается обычным образом ради сообщения
+            об ошибке)
+        """
+        if self._brace_matches is None:
+            self._brace_matches = match_braces(self.tokens)
+        
+        lbrace_pos = self.current_pos
+        rbrace_pos = self._brace_matches.get(lbrace_pos)
+        if rbrace_pos is None:
+            return None
+        
+        line, column = self.token_position(self.current_token)
+        self.current_pos = rbrace_pos + 1
+        self.current_token = self.tokens[self.current_pos] if self.current_pos < len(self.tokens) else None
+        
+        return LazyBlockNode(self, lbrace_pos + 1, rbrace_pos, line=line, column=column)
+    
     def parse_condition(self) -> ASTNode:
         """Разбирает условие."""
         left = self.parse_expression()
@@ -335,23 +649,21 @@ class Parser:
             operator = self.eat(self.current_token['type'])
             right = self.parse_expression()
             
-            return ASTNode(
+            return self._make_node(
                 NodeType.CONDITION,
+                left,
                 left=left,
                 operator=operator['type'],
-                right=right,
-                line=left.line,
-                column=left.column
+                right=right
             )
         else:
             # Одиночное выражение как условие
-            return ASTNode(
+            return self._make_node(
                 NodeType.CONDITION,
+                left,
                 left=left,
                 operator=None,
-                right=None,
-                line=left.line,
-                column=left.column
+                right=None
             )
     
     def parse_expression(self) -> ASTNode:
@@ -366,13 +678,12 @@ class Parser:
             operator = self.eat(self.current_token['type'])
             right = self.parse_multiplicative()
             
-            node = ASTNode(
+            node = self._make_node(
                 NodeType.BINARY_OP,
+                node,
                 left=node,
                 operator=operator['type'],
-                right=right,
-                line=node.line,
-                column=node.column
+                right=right
             )
         
         return node
@@ -385,13 +696,12 @@ class Parser:
             operator = self.eat(self.current_token['type'])
             right = self.parse_primary()
             
-            node = ASTNode(
+            node = self._make_node(
                 NodeType.BINARY_OP,
+                node,
                 left=node,
                 operator=operator['type'],
-                right=right,
-                line=node.line,
-                column=node.column
+                right=right
             )
         
         return node
@@ -405,19 +715,17 @@ class Parser:
         
         if token['type'] == 'NUMBER':
             self.eat('NUMBER')
-            return ASTNode(
+            return self._make_node(
                 NodeType.NUMBER,
-                value=int(token['text']),
-                line=token['line'],
-                column=token['column']
+                token,
+                value=int(token['text'])
             )
         elif token['type'] == 'STRING':
             self.eat('STRING')
-            return ASTNode(
+            return self._make_node(
                 NodeType.STRING,
-                value=token['text'],
-                line=token['line'],
-                column=token['column']
+                token,
+                value=token['text']
             )
         elif token['type'] == 'ID':
             return self.parse_variable_or_array_access()
@@ -434,11 +742,10 @@ class Parser:
     def parse_variable_or_array_access(self) -> ASTNode:
         """Разбирает переменную или доступ к элементу массива."""
         variable_token = self.eat('ID')
-        base_node = ASTNode(
+        base_node = self._make_node(
             NodeType.VARIABLE,
-            name=variable_token['text'],
-            line=variable_token['line'],
-            column=variable_token['column']
+            variable_token,
+            name=variable_token['text']
         )
         
         # Обработка цепочки доступов к массиву: arr[i][j]...
@@ -446,12 +753,11 @@ class Parser:
             self.eat('LBRACKET')
             index = self.parse_expression()
             self.eat('RBRACKET')
-            base_node = ASTNode(
+            base_node = self._make_node(
                 NodeType.ARRAY_ACCESS,
+                variable_token,
                 array=base_node,
-                index=index,
-                line=variable_token['line'],
-                column=variable_token['column']
+                index=index
             )
         
         return base_node
@@ -470,11 +776,10 @@ class Parser:
         
         self.eat('RBRACKET')
         
-        return ASTNode(
+        return self._make_node(
             NodeType.ARRAY,
-            elements=elements,
-            line=lbrace_token['line'],
-            column=lbrace_token['column']
+            lbrace_token,
+            elements=elements
         )
 
 
@@ -500,20 +805,38 @@ class ASTValidator:
         self._validate_node(ast)
         return self.errors
     
+    # Правила проверки по типу узла
+    RULES = {
+        NodeType.PROGRAM: '_validate_program',
+        NodeType.ASSIGNMENT: '_validate_assignment',
+        NodeType.CONDITIONAL: '_validate_conditional',
+        NodeType.WHILE_LOOP: '_validate_while_loop',
+        NodeType.FOR_LOOP: '_validate_for_loop',
+        NodeType.BLOCK: '_validate_block',
+    }
+    
+    def check_node(self, node: ASTNode) -> List[str]:
+        """
+        Проверяет один узел без обхода детей.
+        
+        Используется парсером для проверки узлов при создании
+        (Parser(validate=True)).
+        """
+        rule = self.RULES.get(node.node_type)
+        if rule is None:
+            return []
+        saved, self.errors = self.errors, []
+        try:
+            getattr(self, rule)(node)
+            return self.errors
+        finally:
+            self.errors = saved
+    
     def _validate_node(self, node: ASTNode):
         """Рекурсивно валидирует узел AST."""
-        if node.node_type == NodeType.PROGRAM:
-            self._validate_program(node)
-        elif node.node_type == NodeType.ASSIGNMENT:
-            self._validate_assignment(node)
-        elif node.node_type == NodeType.CONDITIONAL:
-            self._validate_conditional(node)
-        elif node.node_type == NodeType.WHILE_LOOP:
-            self._validate_while_loop(node)
-        elif node.node_type == NodeType.FOR_LOOP:
-            self._validate_for_loop(node)
-        elif node.node_type == NodeType.BLOCK:
-            self._validate_block(node)
+        rule = self.RULES.get(node.node_type)
+        if rule is not None:
+            getattr(self, rule)(node)
         
         # Рекурсивная валидация дочерних узлов
         for attr_name in dir(node):
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+ПРОФИЛИРОВЩИК ПРОГРАММ НА ПСЕВДОКОДЕ
+
+Показывает, какие строки псевдокода выполняются чаще всего и дольше всего
+(а не строки интерпретатора на Python). Счетчики встраиваются прямо
+в дерево замыканий при компиляции: каждый оператор оборачивается
+функцией, которая увеличивает число его выполнений, число шагов
+и (при timing=True) время. Трассировка через sys.settrace не используется,
+поэтому накладные расходы - один вызов обертки на выполнение оператора.
+
+Шаги и время накапливаются включительно, а собственные значения оператора
+вычисляются после выполнения вычитанием значений вложенных операторов.
+Собственные шаги цикла - проверки условия или итерации range, поэтому
+сумма собственных шагов всех операторов равна steps результата выполнения.
+
+Результат выводится как исходный текст с аннотациями по строкам и как
+свернутые стеки (collapsed stacks, формат flamegraph.pl и speedscope),
+где кадрами служат циклы FOR_LOOP/WHILE_LOOP.
+
+Использование:
+    python src/profiler.py examples/factorial.pseudo
+    python src/profiler.py program.pseudo --collapsed program.folded --metric time
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, TextIO
+
+# Добавляем путь для импортов
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.interpreter import ExecutionLimits, ExecutionState, Interpreter
+from src.parser import ASTNode, NodeType
+
+# Операторы, которые служат кадрами свернутых стеков
+LOOP_TYPES = (NodeType.FOR_LOOP.value, NodeType.WHILE_LOOP.value)
+
+# Метрики для свернутых стеков: собственные шаги или время в микросекундах
+METRICS = ('steps', 'time')
+
+
+class StatementRecord:
+    """Счетчики одного оператора; parent - номер объемлющего оператора."""
+
+    __slots__ = ('node_type', 'line', 'column', 'parent', 'count', 'steps', 'time')
+
+    def __init__(self, node: ASTNode, parent: Optional[int]):
+        self.node_type = node.node_type.value
+        self.line = node.line
+        self.column = node.column
+        self.parent = parent
+        self.count = 0
+        self.steps = 0
+        self.time = 0.0
+
+
+class ProfilingInterpreter(Interpreter):
+    """
+    Интерпретатор со счетчиками выполнения операторов.
+
+    Args:
+        limits: Бюджет ресурсов (по умолчанию - ExecutionLimits())
+        timing: Измерять время операторов (без него остаются только счетчики)
+    """
+
+    def __init__(self, limits: Optional[ExecutionLimits] = None, timing: bool = True):
+        super().__init__(limits)
+        self.timing = timing
+        self.records: List[StatementRecord] = []
+        self._parents: List[int] = []
+
+    def run(self, ast: ASTNode) -> Dict[str, Any]:
+        """Выполняет программу (см. Interpreter.run) и добавляет в результат профиль."""
+        result = super().run(ast)
+        result['profile'] = self.profile()
+        return result
+
+    def compile(self, ast: ASTNode) -> Callable[[ExecutionState], None]:
+        """Компилирует программу со встроенными счетчиками; счетчики обнуляются."""
+        self.records = []
+        self._parents = []
+        return super().compile(ast)
+
+    def _compile_statement(self, node: ASTNode) -> Callable[[ExecutionState], None]:
+        # Программа и блоки - только последовательности, своих строк у них нет
+        if node.node_type in (NodeType.PROGRAM, NodeType.BLOCK):
+            return super()._compile_statement(node)
+
+        record = StatementRecord(node, self._parents[-1] if self._parents else None)
+        self._parents.append(len(self.records))
+        self.records.append(record)
+        try:
+            statement = super()._compile_statement(node)
+        finally:
+            self._parents.pop()
+        return self._instrument(statement, record)
+
+    def _instrument(self, statement: Callable[[ExecutionState], None],
+                    record: StatementRecord) -> Callable[[ExecutionState], None]:
+        """Оборачивает скомпилированный оператор счетчиками."""
+        if not self.timing:
+            def run_counted(state):
+                record.count += 1
+                steps = state.steps
+                try:
+                    statement(state)
+                finally:
+                    record.steps += state.steps - steps
+
+            return run_counted
+
+        perf_counter = time.perf_counter
+
+        def run_timed(state):
+            record.count += 1
+            steps = state.steps
+            started = perf_counter()
+            try:
+                statement(state)
+            finally:
+                record.time += perf_counter() - started
+                record.steps += state.steps - steps
+
+        return run_timed
+
+    def profile(self) -> Dict[str, Any]:
+        """
+        Профиль последнего запуска.
+
+        Returns:
+            Словарь с ключами:
+                - statements: операторы в порядке исходного текста с полями
+                  node_type, line, column, parent, count, steps, time
+                  (включительно) и self_steps, self_time (собственные)
+                - lines: суммы по строкам {строка: {count, steps, time}}
+                  по собственным значениям операторов строки
+                - loops: циклы с числом выполнений и итераций
+                - steps, time: итоги по всем операторам
+        """
+        statements = [{
+            'node_type': record.node_type, 'line': record.line, 'column': record.column,
+            'parent': record.parent, 'count': record.count, 'steps': record.steps,
+            'time': record.time, 'self_steps': record.steps, 'self_time': record.time,
+        } for record in self.records]
+        for statement in statements:
+            if statement['parent'] is not None:
+                parent = statements[statement['parent']]
+                parent['self_steps'] -= statement['steps']
+                parent['self_time'] -= statement['time']
+
+        lines: Dict[int, Dict[str, Any]] = {}
+        for statement in statements:
+            totals = lines.setdefault(statement['line'], {'count': 0, 'steps': 0, 'time': 0.0})
+            totals['count'] += statement['count']
+            totals['steps'] += statement['self_steps']
+            totals['time'] += max(statement['self_time'], 0.0)
+
+        # Каждая проверка условия (итерация range) - шаг цикла; первый шаг
+        # каждого выполнения цикла приходится на сам оператор
+        loops = [{
+            'node_type': statement['node_type'], 'line': statement['line'], 'index': index,
+            'count': statement['count'],
+            'iterations': statement['self_steps'] - statement['count'],
+            'steps': statement['steps'], 'time': statement['time'],
+        } for index, statement in enumerate(statements) if statement['node_type'] in LOOP_TYPES]
+
+        return {
+            'statements': statements,
+            'lines': lines,
+            'loops': loops,
+            'steps': sum(statement['self_steps'] for statement in statements),
+            'time': sum(statement['time'] for statement in statements if statement['parent'] is None),
+        }
+
+
+def frame_name(statement: Dict[str, Any]) -> str:
+    """Имя кадра свернутого стека, например WHILE_LOOP:3."""
+    return f"{statement['node_type']}:{statement['line']}"
+
+
+def collapsed_stacks(profile: Dict[str, Any], metric: str = 'steps', root: str = 'program') -> List[str]:
+    """
+    Свернутые стеки профиля: строки вида «program;FOR_LOOP:3;ASSIGNMENT:4 120».
+
+    Кадры стека - объемлющие циклы оператора; значение - собственные шаги
+    или собственное время в микросекундах. Одинаковые стеки суммируются.
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Неизвестная метрика {metric!r}, ожидалось одно из {METRICS}")
+    statements = profile['statements']
+    stacks: Dict[str, int] = {}
+    paths: List[str] = []
+    for statement in statements:
+        # Родитель всегда предшествует вложенным операторам
+        parent = statement['parent']
+        prefix = paths[parent] if parent is not None else root
+        path = f"{prefix};{frame_name(statement)}"
+        paths.append(path if statement['node_type'] in LOOP_TYPES else prefix)
+
+        value = statement['self_steps'] if metric == 'steps' else round(statement['self_time'] * 1_000_000)
+        if value > 0:
+            stacks[path] = stacks.get(path, 0) + value
+    return [f"{path} {value}" for path, value in stacks.items()]
+
+
+def render_listing(code: str, profile: Dict[str, Any], stream: Optional[TextIO] = None):
+    """
+    Выводит исходный текст с числом выполнений, собственными шагами
+    и временем каждой строки; у циклов указывается число итераций.
+    """
+    stream = stream if stream is not None else sys.stdout
+    lines = profile['lines']
+    total_steps = profile['steps'] or 1
+    iterations: Dict[int, int] = {}
+    for loop in profile['loops']:
+        iterations[loop['line']] = iterations.get(loop['line'], 0) + loop['iterations']
+
+    parts = [f"{'строка':>6} {'выполн.':>9} {'шаги':>10} {'%':>6} {'время, мс':>10}  | код\n"]
+    for number, text in enumerate(code.splitlines(), 1):
+        totals = lines.get(number)
+        if totals is None:
+            parts.append(f"{number:>6} {'':>9} {'':>10} {'':>6} {'':>10}  | {text}\n")
+            continue
+        share = totals['steps'] / total_steps * 100
+        parts.append(f"{number:>6} {totals['count']:>9} {totals['steps']:>10} {share:>5.1f}% "
+                     f"{totals['time'] * 1000:>10.3f}  | {text}")
+        if number in iterations:
+            parts.append(f"    ⟳ итераций: {iterations[number]}")
+        parts.append('\n')
+    stream.write(''.join(parts))
+
+
+def print_hot_lines(profile: Dict[str, Any], limit: int = 5):
+    """Выводит самые нагруженные строки по собственным шагам."""
+    total_steps = profile['steps'] or 1
+    hot = sorted(profile['lines'].items(), key=lambda entry: -entry[1]['steps'])[:limit]
+    print(f"\n🔥 Самые нагруженные строки (всего шагов: {profile['steps']}):")
+    for number, totals in hot:
+        print(f"   строка {number}: {totals['steps']} шагов ({totals['steps'] / total_steps * 100:.1f}%), "
+              f"{totals['time'] * 1000:.3f} мс")
+
+
+def main():
+    """Точка входа командной строки."""
+    from src.analyzer import PseudocodeAnalyzer
+
+    arg_parser = argparse.ArgumentParser(description="Профилирование программы на псевдокоде")
+    arg_parser.add_argument('file', help="Файл с псевдокодом")
+    arg_parser.add_argument('--collapsed', help="Сохранить свернутые стеки в файл")
+    arg_parser.add_argument('--metric', choices=METRICS, default='steps', help="Значение в свернутых стеках")
+    arg_parser.add_argument('--no-timing', action='store_true', help="Только счетчики, без замера времени")
+    arg_parser.add_argument('--max-steps', type=int, default=ExecutionLimits().max_steps, help="Лимит шагов")
+    arg_parser.add_argument('--max-time', type=float, default=ExecutionLimits().max_time, help="Лимит времени, с")
+    args = arg_parser.parse_args()
+    if args.metric == 'time' and args.no_timing:
+        arg_parser.error("--metric time требует замера времени")
+
+    with open(args.file, 'r', encoding='utf-8') as f:
+        code = f.read()
+    limits = ExecutionLimits(max_steps=args.max_steps, max_time=args.max_time)
+    result = PseudocodeAnalyzer().execute(code, interpreter=ProfilingInterpreter(limits, timing=not args.no_timing))
+    if result['status'] == 'analysis_error':
+        print("❌ ОШИБКИ АНАЛИЗА:")
+        for error in result['errors']:
+            print(f"   • {error}")
+        return 1
+
+    render_listing(code, result['profile'])
+    print_hot_lines(result['profile'])
+    if not result['success']:
+        print(f"\n⚠️  Выполнение остановлено ({result['status']}): {result['errors'][0]}")
+
+    if args.collapsed:
+        with open(args.collapsed, 'w', encoding='utf-8') as f:
+            for line in collapsed_stacks(result['profile'], args.metric):
+                f.write(line + '\n')
+        print(f"💾 Свернутые стеки сохранены в {args.collapsed}")
+    return 0 if result['success'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""
+ЯЗЫК ЗАПРОСОВ К AST
+
+Поиск узлов по шаблону в духе CSS-селекторов:
+
+    WHILE_LOOP                      все циклы while
+    FOR_LOOP FOR_LOOP FOR_LOOP      цикл for, вложенный в два других
+    CONDITIONAL > BLOCK             блоки, непосредственно вложенные в if
+    BINARY_OP[operator=DIV]         деления
+    VARIABLE[name=i]:field(variable)  переменная i как цель присваивания/цикла
+    WHILE_LOOP:invariant-condition  while, условие которого не меняется в теле
+    OUTPUT:not(:has(STRING))        вывод без строковых литералов
+    ASSIGNMENT, OUTPUT              объединение запросов
+
+Селектор состоит из составных частей, разделенных комбинаторами: пробел
+означает потомка, '>' - непосредственного ребенка. Составная часть - тип
+узла или '*', затем условия на поля [поле], [поле=значение], [поле!=значение]
+и псевдоклассы :has(селектор), :not(селектор), :field(имя),
+:invariant-condition.
+
+Запросы выполняются по индексам, которые строятся один раз на AST: узлы
+по типу, родители, нумерация в прямом порядке с размерами поддеревьев
+(проверка предка за O(1)) и индекс определений и использований переменных.
+"""
+
+import os
+import re
+import sys
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# Добавляем путь для импортов
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.parser import ASTNode, NodeType, iter_fields
+
+
+class QuerySyntaxError(ValueError):
+    """Ошибка в тексте запроса."""
+
+
+# ----------------------------------------------------------------------
+# Разбор запросов
+# ----------------------------------------------------------------------
+
+class _Compound:
+    """Составная часть селектора: тип, условия на поля и псевдоклассы."""
+
+    __slots__ = ('node_type', 'attributes', 'pseudo')
+
+    def __init__(self):
+        self.node_type: Optional[NodeType] = None
+        self.attributes: List[Tuple[str, Optional[str], Optional[str]]] = []
+        self.pseudo: List[Tuple[str, Any]] = []
+
+
+# Селектор - список пар (комбинатор, составная часть); у первой комбинатор None
+_Selector = List[Tuple[Optional[str], _Compound]]
+
+_TOKEN = re.compile(r"""
+    (?P<space>\s+)
+  | (?P<name>[A-Za-z_*][A-Za-z0-9_\-]*)
+  | (?P<string>"[^"]*"|'[^']*')
+  | (?P<number>-?\d+)
+  | (?P<op>!=|[\[\]=>:(),])
+""", re.VERBOSE)
+
+PSEUDO_CLASSES = {'has', 'not', 'field', 'invariant-condition'}
+
+
+class _QueryParser:
+    """Рекурсивный разбор текста запроса."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens: List[Tuple[str, str]] = []
+        position = 0
+        while position < len(text):
+            match = _TOKEN.match(text, position)
+            if not match:
+                raise QuerySyntaxError(f"Неожиданный символ {text[position]!r} в позиции {position}: {text}")
+            self.tokens.append((match.lastgroup, match.group()))
+            position = match.end()
+        self.position = 0
+
+    def peek(self, skip_space: bool = True) -> Tuple[Optional[str], Optional[str]]:
+        position = self.position
+        while skip_space and position < len(self.tokens) and self.tokens[position][0] == 'space':
+            position += 1
+        return self.tokens[position] if position < len(self.tokens) else (None, None)
+
+    def take(self, skip_space: bool = True) -> Tuple[Optional[str], Optional[str]]:
+        if skip_space:
+            self.skip_space()
+        if self.position >= len(self.tokens):
+            raise QuerySyntaxError(f"Неожиданный конец запроса: {self.text}")
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def expect(self, value: str):
+        kind, text = self.take()
+        if text != value:
+            raise QuerySyntaxError(f"Ожидалось {value!r}, получено {text!r}: {self.text}")
+
+    def skip_space(self) -> bool:
+        skipped = False
+        while self.position < len(self.tokens) and self.tokens[self.position][0] == 'space':
+            self.position += 1
+            skipped = True
+        return skipped
+
+    def parse(self) -> List[_Selector]:
+        """Разбирает список селекторов через запятую до конца текста."""
+        selectors = self.parse_list()
+        if self.peek()[0] is not None:
+            raise QuerySyntaxError(f"Лишний текст {self.peek()[1]!r} в запросе: {self.text}")
+        return selectors
+
+    def parse_list(self) -> List[_Selector]:
+        selectors = [self.parse_selector()]
+        while self.peek()[1] == ',':
+            self.take()
+            selectors.append(self.parse_selector())
+        return selectors
+
+    def parse_selector(self) -> _Selector:
+        self.skip_space()
+        selector: _Selector = [(None, self.parse_compound())]
+        while True:
+            had_space = self.skip_space()
+            kind, text = self.peek()
+            if text == '>':
+                self.take()
+                selector.append(('>', self.parse_compound()))
+            elif had_space and kind is not None and text not in (',', ')'):
+                selector.append((' ', self.parse_compound()))
+            else:
+                return selector
+
+    def parse_compound(self) -> _Compound:
+        self.skip_space()
+        compound = _Compound()
+        kind, text = self.peek(skip_space=False)
+        if kind == 'name':
+            self.take(skip_space=False)
+            if text != '*':
+                try:
+                    compound.node_type = NodeType[text]
+                except KeyError:
+                    raise QuerySyntaxError(f"Неизвестный тип узла {text!r}: {self.text}") from None
+        elif text not in ('[', ':'):
+            raise QuerySyntaxError(f"Ожидался тип узла, получено {text!r}: {self.text}")
+
+        while True:
+            kind, text = self.peek(skip_space=False)
+            if text == '[':
+                self.take(skip_space=False)
+                compound.attributes.append(self.parse_attribute())
+            elif text == ':':
+                self.take(skip_space=False)
+                compound.pseudo.append(self.parse_pseudo())
+            else:
+                return compound
+
+    def parse_attribute(self) -> Tuple[str, Optional[str], Optional[str]]:
+        kind, field = self.take()
+        if kind != 'name':
+            raise QuerySyntaxError(f"Ожидалось имя поля, получено {field!r}: {self.text}")
+        kind, text = self.take()
+        if text == ']':
+            return field, None, None
+        if text not in ('=', '!='):
+            raise QuerySyntaxError(f"Ожидалось '=' или '!=', получено {text!r}: {self.text}")
+        value_kind, value = self.take()
+        if value_kind == 'string':
+            value = value[1:-1]
+        elif value_kind not in ('name', 'number'):
+            raise QuerySyntaxError(f"Ожидалось значение поля, получено {value!r}: {self.text}")
+        self.expect(']')
+        return field, text, value
+
+    def parse_pseudo(self) -> Tuple[str, Any]:
+        kind, name = self.take(skip_space=False)
+        if name not in PSEUDO_CLASSES:
+            raise QuerySyntaxError(f"Неизвестный псевдокласс :{name}: {self.text}")
+        if name in ('has', 'not'):
+            self.expect('(')
+            argument = self.parse_list()
+            self.expect(')')
+            return name, argument
+        if name == 'field':
+            self.expect('(')
+            kind, field = self.take()
+            self.expect(')')
+            return name, field
+        return name, None
+
+
+_query_cache: Dict[str, List[_Selector]] = {}
+
+
+def parse_query(text: str) -> List[_Selector]:
+    """Разбирает запрос (разобранные запросы кешируются)."""
+    selectors = _query_cache.get(text)
+    if selectors is None:
+        selectors = _QueryParser(text).parse()
+        if len(_query_cache) > 256:
+            _query_cache.clear()
+        _query_cache[text] = selectors
+    return selectors
+
+
+# ----------------------------------------------------------------------
+# Индексы и выполнение
+# ----------------------------------------------------------------------
+
+class QueryIndex:
+    """
+    Индексы одного AST для выполнения запросов без обхода дерева.
+
+    Узлы нумеруются в прямом порядке обхода; узел b - потомок a, если
+    pre(a) < pre(b) < pre(a) + size(a). Узлы ищутся по id, поэтому дерево
+    с общими поддеревьями (HashConsFactory) индексировать нельзя.
+    """
+
+    def __init__(self, ast: ASTNode):
+        self.nodes: List[ASTNode] = []
+        self.parent: List[int] = []
+        self.field: List[Optional[str]] = []
+        self.size: List[int] = []
+        self.by_type: Dict[NodeType, List[int]] = {}
+        self._numbers: Dict[int, int] = {}
+        self._defs: Dict[str, List[int]] = {}
+        self._uses: Dict[str, List[int]] = {}
+        self._has_cache: Dict[str, List[int]] = {}
+
+        stack: List[Tuple[ASTNode, int, Optional[str]]] = [(ast, -1, None)]
+        while stack:
+            node, parent, field = stack.pop()
+            number = len(self.nodes)
+            self.nodes.append(node)
+            self.parent.append(parent)
+            self.field.append(field)
+            self.size.append(1)
+            self._numbers[id(node)] = number
+            self.by_type.setdefault(node.node_type, []).append(number)
+
+            if node.node_type == NodeType.VARIABLE:
+                is_def = field == 'variable' and parent >= 0 and \
+                    self.nodes[parent].node_type in (NodeType.ASSIGNMENT, NodeType.FOR_LOOP)
+                (self._defs if is_def else self._uses).setdefault(node.name, []).append(number)
+
+            children = []
+            for name, value in iter_fields(node):
+                if isinstance(value, ASTNode):
+                    children.append((value, number, name))
+                elif isinstance(value, list):
+                    children.extend((item, number, name) for item in value if isinstance(item, ASTNode))
+            stack.extend(reversed(children))
+
+        # Размеры поддеревьев: потомки имеют большие номера, чем предок
+        for number in range(len(self.nodes) - 1, 0, -1):
+            self.size[self.parent[number]] += self.size[number]
+
+    # -- навигация --------------------------------------------------------
+
+    def number_of(self, node: ASTNode) -> int:
+        """Номер узла в прямом порядке обхода."""
+        return self._numbers[id(node)]
+
+    def parent_of(self, node: ASTNode) -> Optional[ASTNode]:
+        """Родитель узла (None для корня)."""
+        parent = self.parent[self.number_of(node)]
+        return self.nodes[parent] if parent >= 0 else None
+
+    def ancestors(self, node: ASTNode) -> List[ASTNode]:
+        """Предки узла от родителя к корню."""
+        result = []
+        parent = self.parent[self.number_of(node)]
+        while parent >= 0:
+            result.append(self.nodes[parent])
+            parent = self.parent[parent]
+        return result
+
+    def is_ancestor(self, ancestor: ASTNode, node: ASTNode) -> bool:
+        """Проверяет, что ancestor - собственный предок node."""
+        a, b = self.number_of(ancestor), self.number_of(node)
+        return a < b < a + self.size[a]
+
+    def defs(self, name: str) -> List[ASTNode]:
+        """Узлы VARIABLE, в которые записывается переменная."""
+        return [self.nodes[number] for number in self._defs.get(name, [])]
+
+    def uses(self, name: str) -> List[ASTNode]:
+        """Узлы VARIABLE, из которых читается переменная."""
+        return [self.nodes[number] for number in self._uses.get(name, [])]
+
+    def _in_subtree(self, numbers: List[int], root: int) -> List[int]:
+        """Номера из отсортированного списка, попадающие в поддерево root."""
+        start = bisect_right(numbers, root)
+        end = bisect_left(numbers, root + self.size[root])
+        return numbers[start:end]
+
+    # -- выполнение запросов ----------------------------------------------
+
+    def select(self, query: str) -> List[ASTNode]:
+        """Возвращает узлы, подходящие под запрос, в порядке следования в тексте."""
+        return [self.nodes[number] for number in self._select_numbers(parse_query(query))]
+
+    def select_one(self, query: str) -> Optional[ASTNode]:
+        """Возвращает первый подходящий узел или None."""
+        numbers = self._select_numbers(parse_query(query))
+        return self.nodes[numbers[0]] if numbers else None
+
+    def count(self, query: str) -> int:
+        """Число подходящих узлов."""
+        return len(self._select_numbers(parse_query(query)))
+
+    def _select_numbers(self, selectors: List[_Selector]) -> List[int]:
+        found: Set[int] = set()
+        for selector in selectors:
+            _, last = selector[-1]
+            candidates = self.by_type.get(last.node_type, []) if last.node_type else range(len(self.nodes))
+            found.update(number for number in candidates if self._matches(number, selector, len(selector) - 1))
+        return sorted(found)
+
+    def _matches(self, number: int, selector: _Selector, position: int) -> bool:
+        """Проверяет узел на соответствие части селектора, заканчивающейся на position."""
+        combinator, compound = selector[position]
+        if not self._matches_compound(number, compound):
+            return False
+        if position == 0:
+            return True
+
+        parent = self.parent[number]
+        if combinator == '>':
+            return parent >= 0 and self._matches(parent, selector, position - 1)
+        while parent >= 0:
+            if self._matches(parent, selector, position - 1):
+                return True
+            parent = self.parent[parent]
+        return False
+
+    def _matches_compound(self, number: int, compound: _Compound) -> bool:
+        node = self.nodes[number]
+        if compound.node_type is not None and node.node_type != compound.node_type:
+            return False
+
+        for field, operator, expected in compound.attributes:
+            # getattr, а не vars(): у посредников FlatNode поля не хранятся в __dict__
+            value = getattr(node, field, None)
+            if callable(value):
+                value = None
+            if operator is None:
+                if value is None:
+                    return False
+                continue
+            if isinstance(value, ASTNode) or isinstance(value, list):
+                return False
+            matched = value is not None and str(value) == expected
+            if matched != (operator == '='):
+                return False
+
+        for name, argument in compound.pseudo:
+            if name == 'field':
+                if self.field[number] != argument:
+                    return False
+            elif name == 'has':
+                if not self._has(number, argument):
+                    return False
+            elif name == 'not':
+                if any(self._matches(number, selector, len(selector) - 1) for selector in argument):
+                    return False
+            elif name == 'invariant-condition':
+                if not self._invariant_condition(number):
+                    return False
+        return True
+
+    def _has(self, number: int, selectors: List[_Selector]) -> bool:
+        """Есть ли в поддереве узла потомок, подходящий под selectors."""
+        key = repr([[(c, p.node_type, p.attributes, p.pseudo) for c, p in s] for s in selectors])
+        matches = self._has_cache.get(key)
+        if matches is None:
+            matches = self._has_cache[key] = self._select_numbers(selectors)
+        start = bisect_right(matches, number)
+        return start < len(matches) and matches[start] < number + self.size[number]
+
+    def _invariant_condition(self, number: int) -> bool:
+        """
+        Цикл while, ни одна переменная условия которого не записывается в теле.
+
+        Такой цикл либо не выполняется ни разу, либо не завершается.
+        """
+        node = self.nodes[number]
+        if node.node_type != NodeType.WHILE_LOOP:
+            return False
+        condition = self.number_of(node.condition)
+        body = self.number_of(node.body)
+        variables = self._in_subtree(self.by_type.get(NodeType.VARIABLE, []), condition)
+        if self.nodes[condition].node_type == NodeType.VARIABLE:
+            variables.append(condition)
+        for variable in variables:
+            if self._in_subtree(self._defs.get(self.nodes[variable].name, []), body):
+                return False
+        return True
+
+
+def query(ast: ASTNode, text: str) -> List[ASTNode]:
+    """Выполняет один запрос (для повторных запросов используйте QueryIndex)."""
+    return QueryIndex(ast).select(text)
+
+
+def main():
+    """Выполняет запрос к программам из файлов: query.py 'ЗАПРОС' файл..."""
+    from src.analyzer import PseudocodeAnalyzer
+
+    if len(sys.argv) < 3:
+        print("Использование: python src/query.py 'WHILE_LOOP:invariant-condition' файл.pseudo ...")
+        return 2
+
+    analyzer = PseudocodeAnalyzer()
+    total = 0
+    for path in sys.argv[2:]:
+        result = analyzer.analyze_file(path)
+        if not result['ast']:
+            print(f"❌ {path}: {result['errors']}")
+            continue
+        for node in analyzer.query(sys.argv[1]):
+            total += 1
+            print(f"{path}:{node.line}:{node.column}: {node.node_type.value}")
+    print(f"🔎 Найдено узлов: {total}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+ВЫВОД ОТЧЕТА АНАЛИЗА
+
+Отчет и дерево AST собираются в буфере и выводятся крупными порциями
+одним вызовом write, а не отдельным print на каждую строку. Поля узла
+перечисляются через iter_fields, без dir() на каждом уровне, а JSON
+пишется в тот же буфер потоково, без построения полной строки, и только
+если он запрошен.
+
+Для больших деревьев вывод ограничивается глубиной и числом дочерних
+элементов списка; пропущенное отмечается строкой «…» (или не
+отмечается вовсе). Режим summary выводит только сводку без дерева.
+
+Использование:
+    python src/report.py examples/factorial.pseudo --max-depth 4 --max-children 10
+    python src/report.py big.pseudo --summary
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import Any, Dict, List, Optional, TextIO
+
+# Добавляем путь для импортов
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.metrics import print_metrics
+from src.parser import ASTNode, iter_child_nodes, iter_fields
+
+# Размер буфера в символах, после которого он сбрасывается в поток
+DEFAULT_BUFFER_SIZE = 1 << 16
+
+
+def node_label(node: ASTNode) -> str:
+    """Тип узла с краткой информацией о нем, например VARIABLE(x)."""
+    kind = node.node_type.value
+    if kind == 'VARIABLE':
+        return f"{kind}({node.name})"
+    if kind == 'NUMBER':
+        return f"{kind}({node.value})"
+    if kind == 'STRING':
+        return f"{kind}('{node.value}')"
+    if kind == 'ASSIGNMENT':
+        return f"{kind}({node.variable.name})"
+    if kind == 'BINARY_OP':
+        return f"{kind}({node.operator})"
+    if kind == 'ARRAY':
+        return f"{kind}[{len(node.elements) if hasattr(node, 'elements') else 0} elements]"
+    if kind == 'ARRAY_ACCESS':
+        return f"{kind}(access)"
+    return kind
+
+
+class ReportRenderer:
+    """
+    Буферизованный вывод дерева AST и отчета анализа.
+
+    Args:
+        stream: Поток вывода (по умолчанию - sys.stdout на момент вывода)
+        max_depth: Наибольшая глубина выводимых узлов (корень - 0)
+        max_children: Наибольшее число выводимых элементов одного списка
+        elide: Отмечать пропущенные поддеревья и элементы строкой «…»
+        show_json: Выводить JSON представление AST в отчете
+        summary_only: Выводить в отчете только сводку, без дерева и JSON
+        buffer_size: Размер буфера в символах
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None, max_depth: Optional[int] = None,
+                 max_children: Optional[int] = None, elide: bool = True, show_json: bool = True,
+                 summary_only: bool = False, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        self.stream = stream
+        self.max_depth = max_depth
+        self.max_children = max_children
+        self.elide = elide
+        self.show_json = show_json
+        self.summary_only = summary_only
+        self.buffer_size = buffer_size
+        self.parts: List[str] = []
+        self.buffered = 0
+
+    def write(self, text: str):
+        """Добавляет текст в буфер (совместимо с file.write)."""
+        self.parts.append(text)
+        self.buffered += len(text)
+        if self.buffered >= self.buffer_size:
+            self.flush()
+
+    def line(self, text: str = ''):
+        self.write(text + '\n')
+
+    def flush(self):
+        """Выводит накопленный текст одним вызовом write."""
+        if self.parts:
+            stream = self.stream if self.stream is not None else sys.stdout
+            stream.write(''.join(self.parts))
+            self.parts = []
+            self.buffered = 0
+
+    def render_ast(self, node: ASTNode, level: int = 0):
+        """Выводит дерево с корнем node в формате PseudocodeAnalyzer.print_ast."""
+        self._render_node(node, level, 0)
+        self.flush()
+
+    def _render_node(self, node: ASTNode, level: int, depth: int):
+        indent = "  " * level
+        self.write(f"{indent}├─ {node_label(node)}\n")
+        if self.max_depth is not None and depth >= self.max_depth:
+            if self.elide and next(iter_child_nodes(node), None) is not None:
+                self.write(f"{indent}│  └─ …\n")
+            return
+
+        # Поля выводятся в порядке имен, как при прежнем обходе dir()
+        for name, value in sorted(iter_fields(node), key=lambda field: field[0]):
+            if isinstance(value, ASTNode):
+                self.write(f"{indent}│  └─ {name}:\n")
+                self._render_node(value, level + 2, depth + 1)
+            elif isinstance(value, list) and value:
+                self.write(f"{indent}│  └─ {name}:\n")
+                shown = value if self.max_children is None else value[:self.max_children]
+                for i, item in enumerate(shown):
+                    if isinstance(item, ASTNode):
+                        self.write(f"{indent}│     [{i}]:\n")
+                        self._render_node(item, level + 3, depth + 1)
+                    else:
+                        self.write(f"{indent}│     [{i}]: {item}\n")
+                if self.elide and len(shown) < len(value):
+                    self.write(f"{indent}│     … еще {len(value) - len(shown)}\n")
+
+    def render_summary(self, ast: ASTNode):
+        """Выводит число узлов по типам и глубину дерева."""
+        counts: Dict[str, int] = {}
+        max_depth = 0
+        stack = [(ast, 1)]
+        while stack:
+            node, depth = stack.pop()
+            kind = node.node_type.value
+            counts[kind] = counts.get(kind, 0) + 1
+            if depth > max_depth:
+                max_depth = depth
+            for _, value in iter_fields(node):
+                if isinstance(value, ASTNode):
+                    stack.append((value, depth + 1))
+                elif isinstance(value, list):
+                    stack.extend((item, depth + 1) for item in value if isinstance(item, ASTNode))
+        self.line(f"   Узлов: {sum(counts.values())}, глубина: {max_depth}")
+        for kind, count in sorted(counts.items(), key=lambda entry: (-entry[1], entry[0])):
+            self.line(f"     {kind}: {count}")
+
+    def render_report(self, result: Dict[str, Any], title: str = "АНАЛИЗ ПСЕВДОКОДА"):
+        """Выводит отчет анализа в формате PseudocodeAnalyzer.print_analysis_report."""
+        self.line("=" * 80)
+        self.line(title)
+        self.line("=" * 80)
+
+        # Статус анализа
+        self.line("✅ АНАЛИЗ УСПЕШЕН" if result['success'] else "❌ ОБНАРУЖЕНЫ ОШИБКИ")
+
+        # Информация о токенах
+        self.line(f"\n📊 ЛЕКСИЧЕСКИЙ АНАЛИЗ:")
+        self.line(f"   Найдено токенов: {result['token_count']}")
+
+        # Ошибки
+        if result['errors']:
+            if self.summary_only:
+                self.line(f"\n🚨 ОШИБКИ ВАЛИДАЦИИ: {len(result['errors'])}, первая: {result['errors'][0]}")
+            else:
+                self.line(f"\n🚨 ОШИБКИ ВАЛИДАЦИИ:")
+                for error in result['errors']:
+                    self.line(f"   • {error}")
+
+        # AST
+        if result['ast']:
+            self.line(f"\n🌳 АБСТРАКТНОЕ СИНТАКСИЧЕСКОЕ ДЕРЕВО (AST):")
+            if self.summary_only:
+                self.render_summary(result['ast'])
+            else:
+                self._render_node(result['ast'], 0, 0)
+
+        # Метрики анализа
+        if result.get('metrics'):
+            print_metrics(result['metrics'], file=self)
+
+        # JSON представление
+        if result.get('ast_json') and self.show_json and not self.summary_only:
+            self.line(f"\n📄 JSON ПРЕДСТАВЛЕНИЕ AST:")
+            json.dump(result['ast_json'], self, indent=2, ensure_ascii=False)
+            self.line()
+        self.flush()
+
+
+def main():
+    """Точка входа командной строки."""
+    from src.analyzer import PseudocodeAnalyzer
+
+    arg_parser = argparse.ArgumentParser(description="Отчет анализа псевдокода")
+    arg_parser.add_argument('file', help="Файл с псевдокодом")
+    arg_parser.add_argument('--max-depth', type=int, help="Наибольшая глубина дерева")
+    arg_parser.add_argument('--max-children', type=int, help="Наибольшее число элементов списка")
+    arg_parser.add_argument('--no-elide', action='store_true', help="Не отмечать пропущенное")
+    arg_parser.add_argument('--json', action='store_true', help="Выводить JSON представление AST")
+    arg_parser.add_argument('--summary', action='store_true', help="Только сводка, без дерева")
+    args = arg_parser.parse_args()
+
+    analyzer = PseudocodeAnalyzer()
+    result = analyzer.analyze_file(args.file)
+    ReportRenderer(max_depth=args.max_depth, max_children=args.max_children, elide=not args.no_elide,
+                   show_json=args.json, summary_only=args.summary).render_report(result, args.file)
+    return 0 if result['success'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
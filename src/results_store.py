@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+ХРАНИЛИЩЕ РЕЗУЛЬТАТОВ АНАЛИЗА В SQLITE
+
+Результаты PseudocodeAnalyzer.analyze по каждому файлу корпуса
+сохраняются в локальной базе SQLite, чтобы отвечать на вопросы о корпусе
+без повторного анализа: какие файлы не прошли проверку с ошибкой дальше
+сотой строки, сколько в среднем токенов в файлах каждого каталога и т.п.
+
+Таблицы:
+    files   - путь, каталог, статус, число токенов и узлов, глубина AST,
+              число ошибок, суммарное время анализа
+    errors  - текст ошибок с номером строки, если он в нем указан
+    phases  - время и выделенные блоки памяти по фазам анализа
+    asts    - AST в JSON, сжатый zlib (только с параметром store_ast)
+
+Записи копятся в памяти и вставляются пачками по batch_size файлов в
+одной транзакции; индексы построены по каталогу, статусу, строке ошибки
+и фазе.
+
+Использование:
+    python src/results_store.py export results.db examples tests/test_cases --workers 4
+    python src/results_store.py failures results.db --min-line 100
+    python src/results_store.py directories results.db
+    python src/results_store.py sql results.db "SELECT path, token_count FROM files ORDER BY 2 DESC LIMIT 5"
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import re
+import sqlite3
+import sys
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Добавляем путь для импортов
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.analyzer import PseudocodeAnalyzer
+from src.corpus_stats import iter_source_files
+
+DEFAULT_BATCH_SIZE = 500
+
+# Номер строки в тексте ошибок лексера, парсера и валидатора
+ERROR_LINE = re.compile(r'строке (\d+)')
+
+Record = Dict[str, Any]
+
+
+def file_record(path: str, result: Dict[str, Any], store_ast: bool = False) -> Record:
+    """
+    Переводит результат анализа файла в запись для хранилища.
+
+    Запись не содержит токенов и узлов AST, поэтому дешево передается
+    из рабочего процесса.
+    """
+    metrics = result.get('metrics') or {}
+    errors = []
+    for error in result['errors']:
+        message = str(error)
+        match = ERROR_LINE.search(message)
+        errors.append((int(match.group(1)) if match else None, message))
+    ast_json = result.get('ast_json')
+    return {
+        'path': path,
+        'directory': os.path.dirname(os.path.normpath(path)),
+        'success': bool(result['success']),
+        'token_count': result.get('token_count', len(result.get('tokens') or [])),
+        'node_count': metrics.get('node_total') if result.get('ast') is not None else None,
+        'max_depth': metrics.get('max_depth') if result.get('ast') is not None else None,
+        'total_time': metrics.get('total_time'),
+        'errors': errors,
+        'phases': [(name, record['time'], record['allocated_blocks'])
+                   for name, record in metrics.get('phases', {}).items()],
+        'ast': (zlib.compress(json.dumps(ast_json, ensure_ascii=False).encode('utf-8'))
+                if store_ast and ast_json else None),
+    }
+
+
+def analyze_path(analyzer: PseudocodeAnalyzer, path: str, store_ast: bool = False) -> Record:
+    """Анализирует файл и возвращает запись для хранилища."""
+    return file_record(path, analyzer.analyze_file(path), store_ast)
+
+
+class ResultsStore:
+    """
+    База SQLite с результатами анализа файлов.
+
+    Повторное добавление пути заменяет его прежние записи.
+    """
+
+    def __init__(self, path: str, batch_size: int = DEFAULT_BATCH_SIZE, read_only: bool = False):
+        """
+        Args:
+            path: Путь к файлу базы (':memory:' - в памяти)
+            batch_size: Число файлов в одной транзакции вставки
+            read_only: Открыть существующую базу только для чтения
+        """
+        if read_only:
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"База не найдена: {path}")
+            self.connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        else:
+            self.connection = sqlite3.connect(path)
+            # Журнал WAL и обычная синхронизация заметно ускоряют пакетную запись
+            self.connection.execute("PRAGMA journal_mode = WAL")
+            self.connection.execute("PRAGMA synchronous = NORMAL")
+            self._create_schema()
+        self.batch_size = batch_size
+        self.pending: List[Record] = []
+
+    def _create_schema(self):
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS files (
+                id INTEGER PRIMARY KEY,
+                path TEXT UNIQUE NOT NULL,
+                directory TEXT NOT NULL,
+                success INTEGER NOT NULL,
+                token_count INTEGER NOT NULL,
+                node_count INTEGER,
+                max_depth INTEGER,
+                error_count INTEGER NOT NULL,
+                total_time REAL,
+                analyzed_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS errors (
+                file INTEGER NOT NULL REFERENCES files(id),
+                position INTEGER NOT NULL,
+                line INTEGER,
+                message TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS phases (
+                file INTEGER NOT NULL REFERENCES files(id),
+                phase TEXT NOT NULL,
+                time REAL NOT NULL,
+                allocated_blocks INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS asts (
+                file INTEGER PRIMARY KEY REFERENCES files(id),
+                ast BLOB NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS files_directory ON files (directory);
+            CREATE INDEX IF NOT EXISTS files_success ON files (success);
+            CREATE INDEX IF NOT EXISTS errors_line ON errors (line, file);
+            CREATE INDEX IF NOT EXISTS errors_file ON errors (file);
+            CREATE INDEX IF NOT EXISTS phases_file ON phases (file);
+            CREATE INDEX IF NOT EXISTS phases_phase ON phases (phase);
+        """)
+
+    def add(self, record: Record):
+        """Добавляет запись; пачка записывается по достижении batch_size."""
+        self.pending.append(record)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def add_result(self, path: str, result: Dict[str, Any], store_ast: bool = False):
+        """Добавляет результат PseudocodeAnalyzer.analyze для файла path."""
+        self.add(file_record(path, result, store_ast))
+
+    def flush(self):
+        """Записывает накопленные записи одной транзакцией."""
+        if not self.pending:
+            return
+        # Из повторов одного пути в пачке остается последний
+        records = list({record['path']: record for record in self.pending}.values())
+        self.pending = []
+        now = time.time()
+        with self.connection:
+            self._remove([(record['path'],) for record in records])
+            self.connection.executemany(
+                "INSERT INTO files (path, directory, success, token_count, node_count, max_depth,"
+                " error_count, total_time, analyzed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                ((record['path'], record['directory'], int(record['success']), record['token_count'],
+                  record['node_count'], record['max_depth'], len(record['errors']), record['total_time'], now)
+                 for record in records))
+            ids = self._ids([record['path'] for record in records])
+            self.connection.executemany(
+                "INSERT INTO errors (file, position, line, message) VALUES (?, ?, ?, ?)",
+                ((ids[record['path']], position, line, message)
+                 for record in records for position, (line, message) in enumerate(record['errors'])))
+            self.connection.executemany(
+                "INSERT INTO phases (file, phase, time, allocated_blocks) VALUES (?, ?, ?, ?)",
+                ((ids[record['path']], name, seconds, blocks)
+                 for record in records for name, seconds, blocks in record['phases']))
+            self.connection.executemany(
+                "INSERT INTO asts (file, ast) VALUES (?, ?)",
+                ((ids[record['path']], record['ast']) for record in records if record['ast'] is not None))
+
+    def _ids(self, paths: List[str]) -> Dict[str, int]:
+        ids = {}
+        # SQLite ограничивает число параметров запроса
+        for start in range(0, len(paths), 500):
+            chunk = paths[start:start + 500]
+            placeholders = ', '.join('?' * len(chunk))
+            ids.update(self.connection.execute(
+                f"SELECT path, id FROM files WHERE path IN ({placeholders})", chunk))
+        return ids
+
+    def _remove(self, paths: List[Tuple[str]]):
+        for table in ('errors', 'phases', 'asts'):
+            self.connection.executemany(
+                f"DELETE FROM {table} WHERE file = (SELECT id FROM files WHERE path = ?)", paths)
+        self.connection.executemany("DELETE FROM files WHERE path = ?", paths)
+
+    def query(self, sql: str, params: Iterable[Any] = ()) -> Tuple[List[str], List[Tuple]]:
+        """Выполняет запрос и возвращает имена столбцов и строки."""
+        self.flush()
+        cursor = self.connection.execute(sql, tuple(params))
+        columns = [description[0] for description in cursor.description or []]
+        return columns, cursor.fetchall()
+
+    def failures(self, min_line: int = 0) -> List[Tuple[str, int, str]]:
+        """Файлы с ошибками на строке больше min_line: путь, строка, сообщение."""
+        return self.query(
+            "SELECT files.path, errors.line, errors.message FROM errors"
+            " JOIN files ON files.id = errors.file"
+            " WHERE errors.line > ? ORDER BY files.path, errors.position", (min_line,))[1]
+
+    def directories(self) -> List[Tuple[str, int, float, int]]:
+        """Каталоги: число файлов, среднее число токенов, число файлов с ошибками."""
+        return self.query(
+            "SELECT directory, COUNT(*), AVG(token_count), SUM(1 - success) FROM files"
+            " GROUP BY directory ORDER BY directory")[1]
+
+    def ast(self, path: str) -> Optional[Dict[str, Any]]:
+        """AST файла в виде словаря (если он был сохранен)."""
+        row = self.connection.execute(
+            "SELECT ast FROM asts JOIN files ON files.id = asts.file WHERE files.path = ?", (path,)).fetchone()
+        return json.loads(zlib.decompress(row[0]).decode('utf-8')) if row else None
+
+    def __len__(self) -> int:
+        self.flush()
+        return self.connection.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    def close(self):
+        """Записывает оставшиеся записи и закрывает базу."""
+        self.flush()
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# Анализатор рабочего процесса создается один раз при его запуске
+_worker_analyzer: Optional[PseudocodeAnalyzer] = None
+
+
+def _init_worker():
+    global _worker_analyzer
+    _worker_analyzer = PseudocodeAnalyzer(instrument=True)
+
+
+def _analyze_batch(paths: List[str], store_ast: bool) -> List[Record]:
+    return [analyze_path(_worker_analyzer, path, store_ast) for path in paths]
+
+
+def export(paths: Iterable[str], store: ResultsStore, workers: int = 0,
+           store_ast: bool = False, batch_size: int = 64) -> int:
+    """
+    Анализирует файлы и сохраняет результаты.
+
+    Args:
+        paths: Пути к файлам (итератор читается лениво)
+        store: Хранилище результатов
+        workers: Число рабочих процессов (0 - в текущем процессе)
+        store_ast: Сохранять сжатый AST
+        batch_size: Число файлов в одном задании пула
+
+    Returns:
+        Число файлов с ошибками
+    """
+    failed = 0
+    if workers <= 0:
+        analyzer = PseudocodeAnalyzer(instrument=True)
+        for path in paths:
+            record = analyze_path(analyzer, path, store_ast)
+            failed += not record['success']
+            store.add(record)
+        store.flush()
+        return failed
+
+    paths = iter(paths)
+    context = multiprocessing.get_context('fork') if 'fork' in multiprocessing.get_all_start_methods() else None
+    with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker) as pool:
+        pending = deque()
+        while True:
+            while len(pending) < 2 * workers:
+                batch = list(islice(paths, batch_size))
+                if not batch:
+                    break
+                pending.append(pool.submit(_analyze_batch, batch, store_ast))
+            if not pending:
+                break
+            for record in pending.popleft().result():
+                failed += not record['success']
+                store.add(record)
+    store.flush()
+    return failed
+
+
+def print_rows(columns: List[str], rows: List[Tuple]):
+    """Выводит строки результата запроса таблицей."""
+    if not columns:
+        return
+    cells = [[('' if value is None else f"{value:.3f}" if isinstance(value, float) else str(value))
+              for value in row] for row in rows]
+    widths = [max([len(column)] + [len(row[i]) for row in cells]) for i, column in enumerate(columns)]
+    print("  ".join(column.ljust(width) for column, width in zip(columns, widths)))
+    print("  ".join("-" * width for width in widths))
+    for row in cells:
+        print("  ".join(value.ljust(width) for value, width in zip(row, widths)))
+    print(f"📊 Строк: {len(rows)}")
+
+
+def main():
+    """Точка входа командной строки."""
+    arg_parser = argparse.ArgumentParser(description="Хранилище результатов анализа в SQLite")
+    commands = arg_parser.add_subparsers(dest='command', required=True)
+
+    export_command = commands.add_parser('export', help="Проанализировать файлы и сохранить результаты")
+    export_command.add_argument('database', help="Файл базы")
+    export_command.add_argument('paths', nargs='+', help="Файлы или каталоги с псевдокодом")
+    export_command.add_argument('--workers', type=int, default=0, help="Число рабочих процессов")
+    export_command.add_argument('--ast', action='store_true', help="Сохранять AST")
+    export_command.add_argument('--batch', type=int, default=DEFAULT_BATCH_SIZE,
+                                help="Число файлов в одной транзакции")
+
+    failures_command = commands.add_parser('failures', help="Файлы с ошибками дальше заданной строки")
+    failures_command.add_argument('database', help="Файл базы")
+    failures_command.add_argument('--min-line', type=int, default=0, help="Ошибки на строке больше этой")
+
+    directories_command = commands.add_parser('directories', help="Сводка по каталогам")
+    directories_command.add_argument('database', help="Файл базы")
+
+    sql_command = commands.add_parser('sql', help="Произвольный запрос (только чтение)")
+    sql_command.add_argument('database', help="Файл базы")
+    sql_command.add_argument('query', help="Текст запроса SQL")
+
+    args = arg_parser.parse_args()
+
+    if args.command == 'export':
+        with ResultsStore(args.database, args.batch) as store:
+            started = time.perf_counter()
+            failed = export(iter_source_files(args.paths), store, args.workers, args.ast)
+            print(f"💾 В базе {len(store)} файлов (с ошибками: {failed}), "
+                  f"{time.perf_counter() - started:.2f} с")
+        return 0
+
+    try:
+        store = ResultsStore(args.database, read_only=True)
+    except FileNotFoundError as e:
+        print(f"❌ {e}")
+        return 1
+    with store:
+        try:
+            if args.command == 'failures':
+                print_rows(['path', 'line', 'message'], store.failures(args.min_line))
+            elif args.command == 'directories':
+                print_rows(['directory', 'files', 'avg_tokens', 'failed'], store.directories())
+            else:
+                print_rows(*store.query(args.query))
+        except sqlite3.Error as e:
+            print(f"❌ Ошибка запроса: {e}")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
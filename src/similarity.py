@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+ИНДЕКС СТРУКТУРНОГО СХОДСТВА ПРОГРАММ
+
+Поиск почти одинаковых программ в большом корпусе без попарного сравнения.
+Каждая программа описывается множеством отпечатков - хешей нормализованных
+поддеревьев AST, в которых имена переменных и текст строк не учитываются.
+По множеству строится подпись MinHash, а подписи раскладываются по корзинам
+LSH (locality-sensitive hashing) в базе SQLite. Запрос читает только
+корзины своей подписи, поэтому его стоимость не растет линейно с корпусом.
+
+Использование:
+    python src/similarity.py index corpus.db submissions/*.pseudo
+    python src/similarity.py query corpus.db new.pseudo --threshold 0.7
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import sqlite3
+import sys
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+# Добавляем путь для импортов
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.lexer import LexerAnalyzer
+from src.parser import Parser, ASTNode, NodeType, iter_fields
+
+
+# Поля, значения которых не участвуют в отпечатке
+ABSTRACTED_FIELDS = {
+    NodeType.VARIABLE: ('name',),
+    NodeType.STRING: ('value',),
+}
+
+# Простое число Мерсенна 2^61 - 1 для универсального хеширования MinHash
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 64) - 1
+
+DEFAULT_NUM_PERM = 128
+DEFAULT_BANDS = 32
+DEFAULT_MIN_SIZE = 3
+
+# Параметры новой базы, не заданные явно
+DEFAULT_PARAMS = {'num_perm': DEFAULT_NUM_PERM, 'bands': DEFAULT_BANDS, 'min_size': DEFAULT_MIN_SIZE, 'seed': 1}
+
+
+def stable_hash(text: str) -> int:
+    """64-битный хеш, одинаковый во всех процессах (в отличие от hash())."""
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def subtree_hashes(ast: ASTNode) -> List[Tuple[int, int]]:
+    """
+    Вычисляет нормализованный хеш и размер каждого поддерева AST.
+
+    Обход итеративный (в обратном порядке), поэтому глубина вложенности
+    не ограничена стеком вызовов.
+
+    Returns:
+        Список пар (хеш, число узлов) для всех узлов дерева
+    """
+    results: List[Tuple[int, int]] = []
+    computed: Dict[int, Tuple[int, int]] = {}
+    stack: List[Tuple[ASTNode, bool]] = [(ast, False)]
+
+    while stack:
+        node, children_done = stack.pop()
+        if not children_done:
+            stack.append((node, True))
+            for _, value in iter_fields(node):
+                if isinstance(value, ASTNode):
+                    stack.append((value, False))
+                elif isinstance(value, list):
+                    stack.extend((item, False) for item in value if isinstance(item, ASTNode))
+            continue
+
+        key = id(node)
+        if key in computed:
+            # Разделенный узел (HashConsFactory) уже посчитан
+            results.append(computed[key])
+            continue
+
+        abstracted = ABSTRACTED_FIELDS.get(node.node_type, ())
+        parts = [node.node_type.value]
+        size = 1
+        for name, value in iter_fields(node):
+            if isinstance(value, ASTNode):
+                child_hash, child_size = computed[id(value)]
+                parts.append(f"{name}={child_hash:x}")
+                size += child_size
+            elif isinstance(value, list):
+                hashes = []
+                for item in value:
+                    if isinstance(item, ASTNode):
+                        child_hash, child_size = computed[id(item)]
+                        hashes.append(f"{child_hash:x}")
+                        size += child_size
+                parts.append(f"{name}=[{','.join(hashes)}]")
+            elif name in abstracted:
+                parts.append(f"{name}=*")
+            else:
+                parts.append(f"{name}={value!r}")
+
+        entry = (stable_hash('|'.join(parts)), size)
+        computed[key] = entry
+        results.append(entry)
+
+    return results
+
+
+def fingerprint(ast: ASTNode, min_size: int = DEFAULT_MIN_SIZE) -> Set[int]:
+    """
+    Возвращает множество отпечатков программы.
+
+    Args:
+        ast: Корень AST
+        min_size: Минимальный размер поддерева; мелкие поддеревья (одиночные
+            переменные и числа) есть почти в любой программе и только
+            размывают сходство
+    """
+    return {subtree_hash for subtree_hash, size in subtree_hashes(ast) if size >= min_size}
+
+
+def jaccard(left: Set[int], right: Set[int]) -> float:
+    """Точная мера Жаккара двух множеств отпечатков."""
+    if not left and not right:
+        return 1.0
+    return len(left & right) / len(left | right)
+
+
+class MinHasher:
+    """Построение подписей MinHash фиксированной длины."""
+
+    def __init__(self, num_perm: int = DEFAULT_NUM_PERM, seed: int = 1):
+        """
+        Args:
+            num_perm: Число хеш-функций (длина подписи)
+            seed: Зерно генератора коэффициентов; индекс и запросы должны
+                использовать одно и то же значение
+        """
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self.coefficients = [
+            (rng.randrange(1, MERSENNE_PRIME), rng.randrange(0, MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+    def signature(self, features: Iterable[int]) -> List[int]:
+        """Вычисляет подпись множества отпечатков."""
+        values = [feature % MERSENNE_PRIME for feature in features]
+        if not values:
+            return [MAX_HASH] * self.num_perm
+        prime = MERSENNE_PRIME
+        return [min((a * value + b) % prime for value in values) for a, b in self.coefficients]
+
+
+def estimate_similarity(left: List[int], right: List[int]) -> float:
+    """Оценка меры Жаккара по двум подписям MinHash."""
+    return sum(1 for a, b in zip(left, right) if a == b) / len(left)
+
+
+def parse_source(code: str) -> ASTNode:
+    """Разбирает исходный код в AST (ошибки лексера и парсера пробрасываются)."""
+    return Parser(LexerAnalyzer().analyze(code)).parse()
+
+
+class SimilarityIndex:
+    """
+    Хранящийся на диске индекс LSH по подписям MinHash.
+
+    Подпись из num_perm значений делится на bands полос по rows значений;
+    программы, совпавшие хотя бы в одной полосе, становятся кандидатами,
+    и для них сходство оценивается по полным подписям. Параметры
+    сохраняются в базе; при повторном открытии незаданные параметры
+    берутся из базы, а заданные явно должны с ними совпадать.
+    """
+
+    def __init__(self, path: str, num_perm: Optional[int] = None, bands: Optional[int] = None,
+                 min_size: Optional[int] = None, seed: Optional[int] = None):
+        """
+        Args:
+            path: Путь к файлу базы SQLite (':memory:' - в памяти)
+            num_perm: Длина подписи MinHash (по умолчанию DEFAULT_NUM_PERM)
+            bands: Число полос LSH (num_perm должно делиться на bands;
+                по умолчанию DEFAULT_BANDS)
+            min_size: Минимальный размер поддерева в отпечатке
+                (по умолчанию DEFAULT_MIN_SIZE)
+            seed: Зерно хеш-функций MinHash (по умолчанию 1)
+
+        Raises:
+            ValueError: Некорректные параметры или параметры, не совпадающие
+                с сохраненными в существующей базе
+        """
+        self.connection = sqlite3.connect(path)
+        try:
+            self._create_schema()
+            params = self._load_params({'num_perm': num_perm, 'bands': bands, 'min_size': min_size, 'seed': seed})
+        except Exception:
+            self.connection.close()
+            raise
+        self.num_perm = params['num_perm']
+        self.bands = params['bands']
+        self.rows = self.num_perm // self.bands
+        self.min_size = params['min_size']
+        self.hasher = MinHasher(self.num_perm, params['seed'])
+
+    def _create_schema(self):
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS params (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+            CREATE TABLE IF NOT EXISTS documents (
+                id INTEGER PRIMARY KEY,
+                name TEXT UNIQUE NOT NULL,
+                signature BLOB NOT NULL,
+                features INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS buckets (
+                band INTEGER NOT NULL,
+                bucket INTEGER NOT NULL,
+                document INTEGER NOT NULL REFERENCES documents(id)
+            );
+            CREATE INDEX IF NOT EXISTS buckets_lookup ON buckets (band, bucket);
+            CREATE INDEX IF NOT EXISTS buckets_document ON buckets (document);
+        """)
+
+    def _load_params(self, requested: Dict[str, Optional[int]]) -> Dict[str, int]:
+        """Сохраняет параметры новой базы или проверяет и читает параметры существующей."""
+        stored = dict(self.connection.execute("SELECT name, value FROM params"))
+        if stored:
+            mismatched = [f"{name}={value} (в базе {stored[name]})" for name, value in requested.items()
+                          if value is not None and value != stored[name]]
+            if mismatched:
+                raise ValueError(f"Параметры индекса не совпадают с сохраненными: {', '.join(mismatched)}")
+            return stored
+
+        params = {name: value if value is not None else DEFAULT_PARAMS[name] for name, value in requested.items()}
+        if params['num_perm'] % params['bands']:
+            raise ValueError(f"num_perm ({params['num_perm']}) должно делиться на bands ({params['bands']})")
+        with self.connection:
+            self.connection.executemany("INSERT INTO params VALUES (?, ?)", params.items())
+        return params
+
+    def _band_keys(self, signature: List[int]) -> List[int]:
+        """Ключи корзин для каждой полосы подписи (SQLite хранит знаковые 64 бита)."""
+        keys = []
+        for band in range(self.bands):
+            chunk = array('Q', signature[band * self.rows:(band + 1) * self.rows]).tobytes()
+            digest = hashlib.blake2b(chunk, digest_size=8).digest()
+            keys.append(int.from_bytes(digest, 'little', signed=True))
+        return keys
+
+    def signature_of(self, source) -> Tuple[List[int], int]:
+        """Подпись и число отпечатков для AST или исходного кода."""
+        ast = parse_source(source) if isinstance(source, str) else source
+        features = fingerprint(ast, self.min_size)
+        return self.hasher.signature(features), len(features)
+
+    def add(self, name: str, source) -> int:
+        """
+        Добавляет (или заменяет) программу в индексе.
+
+        Args:
+            name: Уникальное имя программы (например, путь к файлу)
+            source: AST или исходный код
+
+        Returns:
+            Идентификатор документа
+        """
+        signature, feature_count = self.signature_of(source)
+        with self.connection:
+            self._remove(name)
+            cursor = self.connection.execute(
+                "INSERT INTO documents (name, signature, features) VALUES (?, ?, ?)",
+                (name, array('Q', signature).tobytes(), feature_count))
+            document = cursor.lastrowid
+            self.connection.executemany(
+                "INSERT INTO buckets (band, bucket, document) VALUES (?, ?, ?)",
+                ((band, key, document) for band, key in enumerate(self._band_keys(signature))))
+        return document
+
+    def _remove(self, name: str):
+        row = self.connection.execute("SELECT id FROM documents WHERE name = ?", (name,)).fetchone()
+        if row:
+            self.connection.execute("DELETE FROM buckets WHERE document = ?", row)
+            self.connection.execute("DELETE FROM documents WHERE id = ?", row)
+
+    def remove(self, name: str):
+        """Удаляет программу из индекса."""
+        with self.connection:
+            self._remove(name)
+
+    def query(self, source, threshold: float = 0.5, limit: Optional[int] = 10,
+              exclude: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Ищет похожие программы.
+
+        Args:
+            source: AST или исходный код
+            threshold: Минимальная оценка сходства (0..1)
+            limit: Максимальное число результатов (None - без ограничения)
+            exclude: Имя документа, который не нужно возвращать (сам запрос)
+
+        Returns:
+            Список словарей name/similarity по убыванию сходства
+        """
+        signature, _ = self.signature_of(source)
+        candidates = set()
+        for band, key in enumerate(self._band_keys(signature)):
+            rows = self.connection.execute(
+                "SELECT document FROM buckets WHERE band = ? AND bucket = ?", (band, key))
+            candidates.update(row[0] for row in rows)
+
+        matches = []
+        for document in candidates:
+            name, blob = self.connection.execute(
+                "SELECT name, signature FROM documents WHERE id = ?", (document,)).fetchone()
+            if name == exclude:
+                continue
+            similarity = estimate_similarity(signature, array('Q', blob).tolist())
+            if similarity >= threshold:
+                matches.append({'name': name, 'similarity': similarity})
+
+        matches.sort(key=lambda match: (-match['similarity'], match['name']))
+        return matches[:limit] if limit is not None else matches
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def close(self):
+        """Закрывает базу."""
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def main():
+    """Точка входа командной строки."""
+    arg_parser = argparse.ArgumentParser(description="Индекс структурного сходства программ")
+    commands = arg_parser.add_subparsers(dest='command', required=True)
+
+    index_command = commands.add_parser('index', help="Добавить файлы в индекс")
+    index_command.add_argument('database', help="Файл базы индекса")
+    index_command.add_argument('files', nargs='+', help="Файлы с псевдокодом")
+
+    query_command = commands.add_parser('query', help="Найти программы, похожие на файл")
+    query_command.add_argument('database', help="Файл базы индекса")
+    query_command.add_argument('file', help="Файл с псевдокодом")
+    query_command.add_argument('--threshold', type=float, default=0.5, help="Минимальное сходство")
+    query_command.add_argument('--limit', type=int, default=10, help="Максимум результатов")
+
+    args = arg_parser.parse_args()
+
+    with SimilarityIndex(args.database) as index:
+        if args.command == 'index':
+            failed = 0
+            for path in args.files:
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        index.add(path, f.read())
+                except (OSError, SyntaxError, RuntimeError) as e:
+                    failed += 1
+                    print(f"❌ {path}: {e}")
+            print(f"📚 В индексе {len(index)} программ (пропущено: {failed})")
+            return 1 if failed else 0
+
+        with open(args.file, 'r', encoding='utf-8') as f:
+            code = f.read()
+        matches = index.query(code, args.threshold, args.limit, exclude=args.file)
+        if not matches:
+            print("✅ Похожих программ не найдено")
+            return 0
+        print(f"🔍 Похожие программы ({len(matches)}):")
+        for match in matches:
+            print(f"   {match['similarity']:.0%}  {match['name']}")
+        return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+ТАБЛИЦА СИМВОЛОВ И ИНДЕКС ОПРЕДЕЛЕНИЙ/ИСПОЛЬЗОВАНИЙ
+
+Строится одним обходом AST и затем отвечает на вопросы о переменных
+(где определена, где используется, что читается до записи, что не
+используется) поиском по индексу, без повторного обхода дерева.
+"""
+
+import os
+import sys
+from typing import Any, Dict, List
+
+# Добавляем путь для импортов
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.parser import ASTNode, NodeType, iter_child_nodes
+
+
+DEF = 'def'
+USE = 'use'
+
+
+class SymbolOccurrence:
+    """Одно вхождение переменной: определение или использование."""
+
+    __slots__ = ('name', 'kind', 'line', 'column', 'node')
+
+    def __init__(self, name: str, kind: str, node: ASTNode):
+        self.name = name
+        self.kind = kind
+        self.line = node.line
+        self.column = node.column
+        self.node = node
+
+    def __repr__(self):
+        return f"{self.kind}({self.name}@{self.line}:{self.column})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Преобразует вхождение в словарь для сериализации."""
+        return {'name': self.name, 'kind': self.kind, 'line': self.line, 'column': self.column}
+
+
+class SymbolTable:
+    """
+    Индекс переменных программы.
+
+    Определениями считаются левая часть присваивания и переменная цикла for,
+    использованиями - все остальные вхождения VARIABLE. Порядок вхождений
+    соответствует порядку выполнения внутри оператора (правая часть
+    присваивания раньше левой) и порядку операторов в тексте.
+    """
+
+    def __init__(self):
+        self._defs: Dict[str, List[SymbolOccurrence]] = {}
+        self._uses: Dict[str, List[SymbolOccurrence]] = {}
+        self._undefined: List[SymbolOccurrence] = []
+        self._unused: List[str] = None
+
+    def names(self) -> List[str]:
+        """Возвращает имена всех переменных в порядке первого появления."""
+        names = dict.fromkeys(self._defs)
+        names.update(dict.fromkeys(self._uses))
+        return list(names)
+
+    def defs(self, name: str) -> List[SymbolOccurrence]:
+        """Возвращает определения переменной."""
+        return self._defs.get(name, [])
+
+    def uses(self, name: str) -> List[SymbolOccurrence]:
+        """Возвращает использования переменной."""
+        return self._uses.get(name, [])
+
+    def undefined_before_use(self) -> List[SymbolOccurrence]:
+        """Возвращает использования переменных, которым еще ничего не присвоено."""
+        return self._undefined
+
+    def unused(self) -> List[str]:
+        """Возвращает переменные, которые определены, но нигде не читаются."""
+        if self._unused is None:
+            self._unused = [name for name in self._defs if name not in self._uses]
+        return self._unused
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Преобразует таблицу в словарь для сериализации."""
+        return {
+            'symbols': {
+                name: {
+                    'defs': [occurrence.to_dict() for occurrence in self.defs(name)],
+                    'uses': [occurrence.to_dict() for occurrence in self.uses(name)]
+                }
+                for name in self.names()
+            },
+            'undefined_before_use': [occurrence.to_dict() for occurrence in self._undefined],
+            'unused': self.unused()
+        }
+
+    def _add(self, occurrence: SymbolOccurrence):
+        if occurrence.kind == DEF:
+            self._defs.setdefault(occurrence.name, []).append(occurrence)
+        else:
+            if occurrence.name not in self._defs:
+                self._undefined.append(occurrence)
+            self._uses.setdefault(occurrence.name, []).append(occurrence)
+
+
+class SymbolTableBuilder:
+    """Построитель таблицы символов - один обход AST."""
+
+    def build(self, ast: ASTNode) -> SymbolTable:
+        """
+        Строит таблицу символов.
+
+        Args:
+            ast: Корневой узел AST
+
+        Returns:
+            Заполненная таблица символов
+        """
+        self.table = SymbolTable()
+        self._visit(ast)
+        return self.table
+
+    def _visit(self, node: ASTNode):
+        node_type = node.node_type
+
+        if node_type == NodeType.VARIABLE:
+            self.table._add(SymbolOccurrence(node.name, USE, node))
+        elif node_type == NodeType.ASSIGNMENT:
+            self._visit(node.value)
+            self.table._add(SymbolOccurrence(node.variable.name, DEF, node.variable))
+        elif node_type == NodeType.FOR_LOOP:
+            self._visit(node.start)
+            self._visit(node.end)
+            self.table._add(SymbolOccurrence(node.variable.name, DEF, node.variable))
+            self._visit(node.body)
+        else:
+            for child in iter_child_nodes(node):
+                self._visit(child)
+
+
+def build_symbol_table(ast: ASTNode) -> SymbolTable:
+    """Строит таблицу символов для AST."""
+    return SymbolTableBuilder().build(ast)
@@ -0,0 +1,661 @@
+#!/usr/bin/env python3
+"""
+ТЕСТОВЫЙ РАННЕР ДЛЯ СТАТИЧЕСКИХ АНАЛИЗОВ AST
+Оценка сложности циклов и другие проходы над деревом.
+"""
+
+import os
+import io
+import json
+import re
+import sys
+import tempfile
+import threading
+
+# Добавляем путь к src для импортов
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from analyzer import PseudocodeAnalyzer
+from complexity import ComplexityAnalyzer
+from similarity import SimilarityIndex, fingerprint, jaccard
+from ast_diff import diff_ast
+from query import QueryIndex, QuerySyntaxError
+from daemon import AnalysisDaemon
+from daemon_client import DaemonClient
+from lexer import LexerAnalyzer
+from lsp_server import Document, LanguageServer, AnalysisCancelled, analyze_document, relex
+from results_store import ResultsStore, export, file_record
+
+class AnalysisTestSuite:
+    """Тестовый набор для статических анализов AST."""
+
+    def __init__(self):
+        self.analyzer = PseudocodeAnalyzer()
+        self.test_results = []
+
+    def _parse(self, code):
+        """Строит AST для фрагмента кода."""
+        result = self.analyzer.analyze(code)
+        if not result['ast']:
+            raise AssertionError(f"Не удалось построить AST: {result['errors']}")
+        return result['ast']
+
+    def run_complexity_tests(self):
+        """Проверяет оценку сложности гнезд циклов."""
+        print("🧪 ТЕСТЫ ОЦЕНКИ СЛОЖНОСТИ")
+        print("=" * 50)
+
+        test_cases = [
+            {
+                'name': 'Программа без циклов',
+                'code': 'x = 1; print(x);',
+                'expected': 'O(1)',
+                'iterations': 0
+            },
+            {
+                'name': 'Линейный цикл for',
+                'code': 'n = 10; for i in range(0, n) { print(i); }',
+                'expected': 'O(n)',
+                'iterations': 10
+            },
+            {
+                'name': 'Вложенные циклы for',
+                'code': 'n = 10; for i in range(0, n) { for j in range(1, n + 1) { x = i + j; } }',
+                'expected': 'O(n^2)',
+                'iterations': 110
+            },
+            {
+                'name': 'Цикл while со счетчиком',
+                'code': 'c = 5; while (c > 0) { c = c - 1; }',
+                'expected': 'O(n)',
+                'iterations': 5
+            },
+            {
+                'name': 'Логарифмический цикл while',
+                'code': 'x = 64; while (x > 1) { x = x / 2; }',
+                'expected': 'O(log n)',
+                'iterations': 6
+            },
+            {
+                'name': 'Цикл без тела',
+                'code': 'x = 1; while (x > 0);',
+                'expected': 'O(∞)',
+                'iterations': None
+            },
+            {
+                'name': 'Переменная удаляется от границы',
+                'code': 'x = 1; while (x > 0) { x = x + 1; }',
+                'expected': 'O(∞)',
+                'iterations': None
+            }
+        ]
+
+        passed = 0
+        for test in test_cases:
+            print(f"\n🔸 {test['name']}")
+            report = ComplexityAnalyzer().analyze(self._parse(test['code']))
+
+            if report['complexity'] == test['expected'] and report['iterations'] == test['iterations']:
+                print(f"   ✅ {report['complexity']}, итераций: {report['iterations']}")
+                passed += 1
+            else:
+                print("   ❌ ТЕСТ НЕ ПРОЙДЕН")
+                print(f"      Ожидалось: {test['expected']}, {test['iterations']}")
+                print(f"      Получено:  {report['complexity']}, {report['iterations']}")
+
+        # Порог допустимой степени
+        report = ComplexityAnalyzer(max_degree=1).analyze(self._parse(test_cases[2]['code']))
+        print("\n🔸 Отклонение квадратичной программы")
+        if report['exceeds_limit'] and report['nests'][0]['line'] == 1:
+            print("   ✅ Превышение порога обнаружено")
+            passed += 1
+        else:
+            print("   ❌ Превышение порога не обнаружено")
+
+        self.test_results.append(('Тесты оценки сложности', passed, len(test_cases) + 1))
+        return passed == len(test_cases) + 1
+
+    def run_symbol_table_tests(self):
+        """Проверяет индекс определений и использований переменных."""
+        print("\n📇 ТЕСТЫ ТАБЛИЦЫ СИМВОЛОВ")
+        print("=" * 50)
+
+        code = """max_num = num1;
+num1 = 10;
+if (num1 > max_num) {
+    max_num = num1;
+}
+for i in range(0, 3) {
+    unused = i;
+}
+print(max_num);
+"""
+        result = self.analyzer.analyze(code)
+        table = result['symbols']
+
+        checks = [
+            ('Определения max_num',
+             [(o.line, o.column) for o in table.defs('max_num')] == [(1, 0), (4, 4)]),
+            ('Использования num1',
+             [o.line for o in table.uses('num1')] == [1, 3, 4]),
+            ('Переменная цикла как определение',
+             [o.line for o in table.defs('i')] == [6]),
+            ('Чтение до записи',
+             [(o.name, o.line) for o in table.undefined_before_use()] == [('num1', 1)]),
+            ('Неиспользуемые переменные',
+             table.unused() == ['unused']),
+            ('Неизвестное имя',
+             table.defs('missing') == [] and table.uses('missing') == [])
+        ]
+
+        passed = 0
+        for name, ok in checks:
+            if ok:
+                print(f"   ✅ {name}")
+                passed += 1
+            else:
+                print(f"   ❌ {name}")
+
+        self.test_results.append(('Тесты таблицы символов', passed, len(checks)))
+        return passed == len(checks)
+
+    def run_similarity_tests(self):
+        """Проверяет отпечатки AST и поиск похожих программ."""
+        print("\n🧬 ТЕСТЫ ИНДЕКСА СХОДСТВА")
+        print("=" * 50)
+
+        original = """total = 0;
+for i in range(1, 10) {
+    if (i % 2 == 0) {
+        total = total + i * i;
+    }
+}
+print("sum: " + total);
+"""
+        renamed = re.sub(r'\bi\b', 'k', original).replace('total', 's').replace('sum: ', 'итог ')
+        extended = original + "count = total / 2;\nprint(count);\n"
+        unrelated = """n = 5;
+f = 1;
+while (n > 1) {
+    f = f * n;
+    n = n - 1;
+}
+"""
+        index = SimilarityIndex(':memory:')
+        index.add('original', original)
+        index.add('unrelated', unrelated)
+
+        checks = [
+            ('Имена и строки не влияют на отпечаток',
+             fingerprint(self._parse(original)) == fingerprint(self._parse(renamed))),
+            ('Добавленный код снижает сходство',
+             0.5 < jaccard(fingerprint(self._parse(original)), fingerprint(self._parse(extended))) < 1),
+            ('Переименованная копия найдена',
+             index.query(renamed)[:1] == [{'name': 'original', 'similarity': 1.0}]),
+            ('Дополненная копия найдена',
+             [match['name'] for match in index.query(extended, threshold=0.5)] == ['original']),
+            ('Запрос принимает AST',
+             index.query(self._parse(unrelated), exclude='original')[0]['name'] == 'unrelated'),
+        ]
+        index.add('original', unrelated)
+        checks.append(('Повторное добавление заменяет документ',
+                       len(index) == 2 and index.query(original, threshold=0.9) == []))
+        index.close()
+
+        def reopen_with(**params):
+            try:
+                SimilarityIndex(path, **params).close()
+            except ValueError as e:
+                return str(e)
+            return None
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'index.db')
+            with SimilarityIndex(path, num_perm=64, bands=16, min_size=2, seed=7) as stored:
+                stored.add('original', original)
+            with SimilarityIndex(path) as reopened:
+                checks.append(('Параметры читаются из базы',
+                               (reopened.num_perm, reopened.bands, reopened.min_size) == (64, 16, 2)
+                               and reopened.query(renamed)[:1] == [{'name': 'original', 'similarity': 1.0}]))
+            checks.append(('Те же параметры при повторном открытии',
+                           reopen_with(num_perm=64, bands=16, min_size=2, seed=7) is None))
+            error = reopen_with(num_perm=128, seed=7)
+            checks.append(('Другие параметры - ValueError',
+                           error is not None and 'num_perm=128 (в базе 64)' in error
+                           and reopen_with(seed=1) is not None))
+        try:
+            SimilarityIndex(':memory:', num_perm=100, bands=32)
+            checks.append(('num_perm не делится на bands', False))
+        except ValueError:
+            checks.append(('num_perm не делится на bands', True))
+
+        passed = 0
+        for name, ok in checks:
+            if ok:
+                print(f"   ✅ {name}")
+                passed += 1
+            else:
+                print(f"   ❌ {name}")
+
+        self.test_results.append(('Тесты индекса сходства', passed, len(checks)))
+        return passed == len(checks)
+
+    def run_ast_diff_tests(self):
+        """Проверяет структурное сравнение версий программы."""
+        print("\n🔀 ТЕСТЫ СТРУКТУРНОГО СРАВНЕНИЯ")
+        print("=" * 50)
+
+        original = """x = 1;
+y = x + 2;
+if (x > 0) {
+    print("pos");
+    z = y * 3;
+}
+"""
+
+        def operations(new_code):
+            result = diff_ast(self._parse(original), self._parse(new_code))
+            return [(op['op'], op['node'], op['old'] and op['old']['line'], op['new'] and op['new']['line'])
+                    for op in result['operations']]
+
+        swapped = original.replace('    print("pos");\n    z = y * 3;', '    z = y * 3;\n    print("pos");')
+        numbers = '\n'.join(f'v{i} = {i} * 2;' for i in range(2000)) + '\n'
+        big_result = diff_ast(self._parse(numbers), self._parse(numbers.replace('v1000 = ', 'w = 5;\nv1000 = ')))
+
+        checks = [
+            ('Одинаковые версии', operations(original) == []),
+            ('Изменение числа', operations(original.replace('x = 1', 'x = 7')) == [('update', 'NUMBER(1)', 1, 1)]),
+            ('Переименование переменной',
+             operations(original.replace('z =', 'q =')) == [('update', 'VARIABLE(z)', 5, 5)]),
+            ('Перестановка операторов', operations(swapped) == [('move', 'OUTPUT', 4, 5)]),
+            ('Удаление оператора',
+             operations(original.replace('y = x + 2;\n', '')) == [('delete', 'ASSIGNMENT', 2, None)]),
+            ('Вставка оператора',
+             operations(original + 'print(z);\n') == [('insert', 'OUTPUT', None, 7)]),
+            ('Вставка в большую программу',
+             big_result['summary'] == {'insert': 1, 'delete': 0, 'update': 0, 'move': 0}
+             and big_result['operations'][0]['new']['line'] == 1001),
+        ]
+
+        passed = 0
+        for name, ok in checks:
+            if ok:
+                print(f"   ✅ {name}")
+                passed += 1
+            else:
+                print(f"   ❌ {name}")
+
+        self.test_results.append(('Тесты структурного сравнения', passed, len(checks)))
+        return passed == len(checks)
+
+    def run_query_tests(self):
+        """Проверяет язык запросов к AST."""
+        print("\n🔎 ТЕСТЫ ЗАПРОСОВ К AST")
+        print("=" * 50)
+
+        code = """i = 0;
+n = 10;
+while (i < n) {
+    print(i);
+}
+while (i < n) {
+    i = i + 1;
+}
+for a in range(0, 3) {
+    for b in range(0, 3) {
+        for c in range(0, 3) {
+            print(a / b);
+        }
+    }
+}
+if (n > 5) {
+    print("big");
+} else {
+    n = 5;
+}
+"""
+        analyzer = PseudocodeAnalyzer()
+        analyzer.analyze(code)
+        index = analyzer.query_index = QueryIndex(analyzer.ast)
+
+        def lines(selector):
+            return [node.line for node in index.select(selector)]
+
+        def rejects(selector):
+            try:
+                index.select(selector)
+            except QuerySyntaxError:
+                return True
+            return False
+
+        checks = [
+            ('Выбор по типу', lines('WHILE_LOOP') == [3, 6]),
+            ('Неизменяемое условие цикла', lines('WHILE_LOOP:invariant-condition') == [3]),
+            ('Тройная вложенность', lines('FOR_LOOP FOR_LOOP FOR_LOOP') == [11]),
+            ('Непосредственный ребенок', lines('FOR_LOOP > BLOCK > FOR_LOOP') == [10, 11]),
+            ('Условие на поле', lines('BINARY_OP[operator=DIV]') == [12]),
+            ('Поле родителя', lines('VARIABLE[name=n]:field(variable)') == [2, 19]),
+            ('Отрицание и наличие', lines('OUTPUT:not(:has(STRING))') == [4, 12]),
+            ('Объединение', lines('CONDITIONAL, WHILE_LOOP') == [3, 6, 16]),
+            ('Наличие поля', lines('CONDITIONAL[else_block]') == [16]),
+            ('Через анализатор', [n.line for n in analyzer.query('ASSIGNMENT:has(BINARY_OP)')] == [7]),
+            ('Индекс переменных', len(index.defs('i')) == 2 and len(index.uses('i')) == 4),
+            ('Родители и предки',
+             index.parent_of(index.select_one('FOR_LOOP FOR_LOOP FOR_LOOP')).node_type.value == 'BLOCK'
+             and index.ancestors(index.select_one('STRING'))[-1] is analyzer.ast),
+            ('Ошибки в запросе', rejects('LOOP') and rejects('WHILE_LOOP[') and rejects(':unknown')),
+        ]
+
+        passed = 0
+        for name, ok in checks:
+            if ok:
+                print(f"   ✅ {name}")
+                passed += 1
+            else:
+                print(f"   ❌ {name}")
+
+        self.test_results.append(('Тесты запросов к AST', passed, len(checks)))
+        return passed == len(checks)
+
+    def run_daemon_tests(self):
+        """Проверяет демон анализа и его клиент."""
+        print("\n🚀 ТЕСТЫ ДЕМОНА АНАЛИЗА")
+        print("=" * 50)
+
+        with tempfile.TemporaryDirectory() as directory:
+            socket_path = os.path.join(directory, 'daemon.sock')
+            program = os.path.join(directory, 'program.pseudo')
+            with open(program, 'w', encoding='utf-8') as f:
+                f.write("x = 1;\nprint(x + y);\n")
+
+            server = AnalysisDaemon(socket_path)
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            try:
+                with DaemonClient(socket_path, timeout=10) as client:
+                    first = client.analyze_code("x = 1;\nprint(x);\n")
+                    second = client.analyze_code("x = 1;\nprint(x);\n")
+                    broken = client.analyze_code("x = ;")
+                    batch = client.analyze_files([program, os.path.join(directory, 'missing.pseudo')])
+                    try:
+                        client.request({'op': 'unknown'})
+                        unknown_rejected = False
+                    except RuntimeError:
+                        unknown_rejected = True
+                    stats = client.request({'op': 'stats'})
+                    stopping = client.request({'op': 'shutdown'})
+                thread.join(5)
+            finally:
+                server.server_close()
+
+            checks = [
+                ('Анализ текста', first['success'] and first['token_count'] == 9 and not first['cached']),
+                ('Повтор из кеша', second['cached'] and second['success']),
+                ('Ошибка разбора', not broken['success'] and broken['errors']),
+                ('Анализ файла', batch[0]['success']
+                 and [o['name'] for o in batch[0]['undefined_before_use']] == ['y']),
+                ('Отсутствующий файл', not batch[1]['success'] and 'не найден' in batch[1]['errors'][0]),
+                ('Неизвестная операция', unknown_rejected),
+                ('Статистика', stats['cache_hits'] == 1 and stats['requests'] == 6),
+                ('Остановка', stopping['stopping'] and not thread.is_alive() and not os.path.exists(socket_path)),
+            ]
+
+        passed = 0
+        for name, ok in checks:
+            if ok:
+                print(f"   ✅ {name}")
+                passed += 1
+            else:
+                print(f"   ❌ {name}")
+
+        self.test_results.append(('Тесты демона анализа', passed, len(checks)))
+        return passed == len(checks)
+
+    def run_results_store_tests(self):
+        """Проверяет хранилище результатов анализа в SQLite."""
+        print("\n🗄️  ТЕСТЫ ХРАНИЛИЩА РЕЗУЛЬТАТОВ")
+        print("=" * 50)
+
+        with tempfile.TemporaryDirectory() as directory:
+            paths = []
+            for subdirectory, name, code in [
+                ('a', 'ok.pseudo', "x = 1;\nprint(x);\n"),
+                ('a', 'late.pseudo', "y = 1;\n" * 120 + "x = ;\n"),
+                ('b', 'early.pseudo', "x = (;\n"),
+                ('b', 'long.pseudo', "x = 1;\n" * 10),
+            ]:
+                os.makedirs(os.path.join(directory, subdirectory), exist_ok=True)
+                paths.append(os.path.join(directory, subdirectory, name))
+                with open(paths[-1], 'w', encoding='utf-8') as f:
+                    f.write(code)
+            database = os.path.join(directory, 'results.db')
+
+            with ResultsStore(database, batch_size=2) as store:
+                failed = export(paths + [os.path.join(directory, 'missing.pseudo')], store,
+                                workers=2, store_ast=True, batch_size=2)
+                # Повторный экспорт заменяет записи, а не дублирует их
+                export(paths[:1], store, store_ast=True)
+                replaced = len(store) == 5 and store.query("SELECT COUNT(*) FROM errors")[1] == [(3,)]
+                direct = ResultsStore(':memory:')
+                direct.add_result('memory.pseudo', self.analyzer.analyze("x = 1;"))
+
+            with ResultsStore(database, read_only=True) as store:
+                late = store.failures(min_line=100)
+                directories = {row[0][len(directory) + 1:]: row[1:] for row in store.directories()}
+                ok = store.query("SELECT success, token_count, node_count, error_count FROM files"
+                                 " WHERE path = ?", (paths[0],))[1]
+                phases = store.query("SELECT COUNT(DISTINCT phase) FROM phases JOIN files ON files.id = file"
+                                     " WHERE path = ?", (paths[0],))[1][0][0]
+                stored_ast = store.ast(paths[0])
+                indexes = {row[0] for row in store.query("SELECT name FROM sqlite_master WHERE type = 'index'")[1]}
+                try:
+                    store.query("DELETE FROM files")
+                    writable = True
+                except Exception:
+                    writable = False
+
+            checks = [
+                ('Файлы с ошибками', failed == 3 and replaced),
+                ('Ошибки дальше сотой строки', [(os.path.basename(row[0]), row[1]) for row in late]
+                 == [('late.pseudo', 121)]),
+                ('Сводка по каталогам', directories['a'] == (2, 246.0, 1) and directories['b'] == (2, 22.0, 1)),
+                ('Счетчики и фазы файла', ok == [(1, 9, 6, 0)] and phases == 5),
+                ('Сохраненный AST', stored_ast == self.analyzer.analyze("x = 1;\nprint(x);\n")['ast_json']),
+                ('Индексы', {'errors_line', 'files_directory', 'phases_phase'} <= indexes),
+                ('Только чтение', not writable),
+                ('Результат без метрик', len(direct) == 1
+                 and direct.query("SELECT node_count, total_time FROM files")[1] == [(None, None)]),
+                ('Запись без токенов', 'tokens' not in file_record('x', self.analyzer.analyze("x = 1;"))),
+            ]
+            direct.close()
+
+        passed = 0
+        for name, ok in checks:
+            if ok:
+                print(f"   ✅ {name}")
+                passed += 1
+            else:
+                print(f"   ❌ {name}")
+
+        self.test_results.append(('Тесты хранилища результатов', passed, len(checks)))
+        return passed == len(checks)
+
+    def run_lsp_tests(self):
+        """Проверяет сервер LSP без редактора: сообщения передаются напрямую."""
+        print("\n📝 ТЕСТЫ СЕРВЕРА LSP")
+        print("=" * 50)
+
+        def frame(message):
+            body = json.dumps(message).encode('utf-8')
+            return b'Content-Length: %d\r\n\r\n' % len(body) + body
+
+        def messages(stream):
+            data, result = stream.getvalue(), []
+            while data:
+                header, _, rest = data.partition(b'\r\n\r\n')
+                length = int(header.split(b':')[1])
+                result.append(json.loads(rest[:length]))
+                data = rest[length:]
+            return result
+
+        def change(line, start, end, text, end_line=None):
+            return {'range': {'start': {'line': line, 'character': start},
+                              'end': {'line': line if end_line is None else end_line, 'character': end}},
+                    'text': text}
+
+        uri = 'file:///program.pseudo'
+        code = "x = 1;\nprint(x + y);\nz = x * 2;\nprint(z);\n"
+        output = io.BytesIO()
+        server = LanguageServer(io.BytesIO(), output, debounce=0)
+        server.handle({'method': 'textDocument/didOpen',
+                       'params': {'textDocument': {'uri': uri, 'version': 1, 'text': code}}})
+        server.run_pending()
+        document = server.documents[uri]
+        opened = messages(output)[-1]['params']
+        first_tokens = document.tokens
+
+        server.handle({'method': 'textDocument/didChange',
+                       'params': {'textDocument': {'uri': uri, 'version': 2},
+                                  'contentChanges': [change(2, 8, 9, '3'), change(1, 10, 11, 'x')]}})
+        server.run_pending()
+        edited = messages(output)[-1]['params']
+        edited_tokens = document.tokens
+        edited_text = document.text
+        full = LexerAnalyzer()
+        expected_tokens = full.convert_tokens(full.lexer.tokenize(edited_text))
+
+        server.handle({'method': 'textDocument/didChange',
+                       'params': {'textDocument': {'uri': uri, 'version': 3},
+                                  'contentChanges': [change(3, 0, 0, 'q = ;\n')]}})
+        server.run_pending()
+        syntax = messages(output)[-1]['params']['diagnostics']
+
+        server.handle({'method': 'textDocument/didChange',
+                       'params': {'textDocument': {'uri': uri, 'version': 4},
+                                  'contentChanges': [change(3, 0, 5, 'q = @;')]}})
+        server.run_pending()
+        lexical = messages(output)[-1]['params']['diagnostics']
+
+        server.handle({'method': 'textDocument/didChange',
+                       'params': {'textDocument': {'uri': uri, 'version': 5},
+                                  'contentChanges': [change(3, 0, 0, '', end_line=4)]}})
+        server.run_pending()
+        server.handle({'id': 1, 'method': 'textDocument/documentSymbol',
+                       'params': {'textDocument': {'uri': uri}}})
+        server.handle({'id': 2, 'method': 'textDocument/definition',
+                       'params': {'textDocument': {'uri': uri}, 'position': {'line': 3, 'character': 6}}})
+        symbols, definition = [m['result'] for m in messages(output)[-2:]]
+
+        before = (document.tokens, document.analyzed_version)
+        try:
+            analyze_document(document, "y = 1;", 99, cancelled=lambda: True)
+            cancelled = False
+        except AnalysisCancelled:
+            cancelled = (document.tokens, document.analyzed_version) == before
+
+        multiline = 'x = 1;\ns = "a\nb\nc";\ny = 2;\nprint(y);\n'
+
+        def relexed(new_text, dirty_line):
+            document = Document('file:///strings.pseudo', multiline, 1)
+            analyze_document(document, multiline, 1)
+            tokens = relex(document, new_text, dirty_line)
+            reused = sum(1 for a, b in zip(document.tokens, tokens) if a is b)
+            lexer = LexerAnalyzer()
+            expected = lexer.convert_tokens(lexer.lexer.tokenize(new_text))
+            same = ([(t['text'], t['line'], t['column']) for t in tokens]
+                    == [(t['text'], t['line'], t['column']) for t in expected])
+            return same, reused
+
+        stream = io.BytesIO(frame({'id': 1, 'method': 'initialize', 'params': {}})
+                            + frame({'id': 2, 'method': 'shutdown'}) + frame({'method': 'exit'}))
+        session_output = io.BytesIO()
+        session = LanguageServer(stream, session_output)
+        session.serve()
+        session_replies = messages(session_output)
+
+        checks = [
+            ('Диагностика при открытии', [d['message'] for d in opened['diagnostics']]
+             == ['Переменная y используется до присваивания']
+             and opened['diagnostics'][0]['range']['start'] == {'line': 1, 'character': 10}),
+            ('Инкрементальные правки', edited_text == "x = 1;\nprint(x + x);\nz = x * 3;\nprint(z);\n"
+             and edited['diagnostics'] == [] and edited['version'] == 2),
+            ('Повторное использование токенов', all(a is b for a, b in zip(first_tokens[:4], edited_tokens[:4]))
+             and first_tokens[4] is not edited_tokens[4]),
+            ('Токены совпадают с полным разбором', [(t['text'], t['line'], t['column']) for t in expected_tokens]
+             == [(t['text'], t['line'], t['column']) for t in edited_tokens]),
+            ('Синтаксическая ошибка', len(syntax) == 1 and syntax[0]['range']['start']['line'] == 3),
+            ('Лексическая ошибка', len(lexical) == 1 and 'на строке 4' in lexical[0]['message']),
+            ('Символы документа', [s['name'] for s in symbols] == ['x', 'z']),
+            ('Переход к определению', [d['range']['start'] for d in definition] == [{'line': 2, 'character': 0}]),
+            ('Отмена устаревшего анализа', cancelled),
+            ('Многострочная строка выше правки переиспользуется',
+             relexed(multiline.replace('y = 2', 'y = 3'), 5) == (True, 8)),
+            ('Правка внутри многострочной строки',
+             relexed(multiline.replace('\nb\n', '\nbb\n'), 3) == (True, 4)),
+            ('Сеанс через поток', session_replies[0]['result']['capabilities']['textDocumentSync']['change'] == 2
+             and session.shutdown_requested),
+        ]
+
+        passed = 0
+        for name, ok in checks:
+            if ok:
+                print(f"   ✅ {name}")
+                passed += 1
+            else:
+                print(f"   ❌ {name}")
+
+        self.test_results.append(('Тесты сервера LSP', passed, len(checks)))
+        return passed == len(checks)
+
+    def print_summary(self):
+        """Выводит итоговый отчет по всем тестам."""
+        print("\n" + "=" * 60)
+        print("📊 ИТОГОВЫЙ ОТЧЕТ ПО ТЕСТИРОВАНИЮ СТАТИЧЕСКИХ АНАЛИЗОВ")
+        print("=" * 60)
+
+        total_passed = 0
+        total_tests = 0
+
+        for category, passed, total in self.test_results:
+            percentage = (passed / total) * 100 if total > 0 else 0
+            status = "✅" if passed == total else "❌"
+            print(f"{status} {category}: {passed}/{total} ({percentage:.1f}%)")
+            total_passed += passed
+            total_tests += total
+
+        overall_percentage = (total_passed / total_tests) * 100 if total_tests > 0 else 0
+        print(f"\n🎯 ОБЩИЙ РЕЗУЛЬТАТ: {total_passed}/{total_tests} ({overall_percentage:.1f}%)")
+
+        if total_passed == total_tests:
+            print("\n🎉 ВСЕ ТЕСТЫ СТАТИЧЕСКИХ АНАЛИЗОВ ПРОЙДЕНЫ УСПЕШНО!")
+        else:
+            print(f"\n💥 НЕ ПРОЙДЕНО: {total_tests - total_passed} тестов")
+
+    def run_all_tests(self):
+        """Запускает все тесты статических анализов."""
+        print("🎯 КОМПЛЕКСНОЕ ТЕСТИРОВАНИЕ СТАТИЧЕСКИХ АНАЛИЗОВ")
+        print("=" * 60)
+
+        self.run_complexity_tests()
+        self.run_symbol_table_tests()
+        self.run_similarity_tests()
+        self.run_ast_diff_tests()
+        self.run_query_tests()
+        self.run_daemon_tests()
+        self.run_results_store_tests()
+        self.run_lsp_tests()
+
+        self.print_summary()
+
+        return all(passed == total for _, passed, total in self.test_results)
+
+
+def main():
+    """Основная функция тестирования."""
+    test_suite = AnalysisTestSuite()
+    success = test_suite.run_all_tests()
+    return 0 if success else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
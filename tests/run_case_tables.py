@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+ТАБЛИЧНЫЙ ТЕСТОВЫЙ РАННЕР
+Параллельный запуск случаев из tests/case_tables/*.json с замером времени.
+
+Каждая таблица - JSON-объект с описанием, бюджетом времени по умолчанию
+(budget_ms) и списком случаев. Случай задает имя, вид проверки (kind),
+входные данные и ожидаемый результат:
+
+    tokens   - code; types, count, at ({"индекс": "ТИП"}) или error
+    analyze  - code, file (относительно tests/) или generate ({size, seed,
+               depth}); success, nodes, token_count, error
+    execute  - code; output, status
+
+Случаи раздаются пулу процессов; время проверки измеряется в рабочем
+процессе (минимум из repeat повторов). Случай, превысивший свой бюджет
+budget_ms, считается непройденным, поэтому регрессии производительности
+ловятся вместе с ошибками. Отчет можно сохранить в JSON.
+
+Использование:
+    python tests/run_case_tables.py
+    python tests/run_case_tables.py --workers 4 --report report.json
+    python tests/run_case_tables.py tests/case_tables/lexer.json --filter оператор
+"""
+
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+# Добавляем путь к src для импортов
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from analyzer import PseudocodeAnalyzer
+from generator import ProgramGenerator, parse_size
+from lexer import PseudocodeLexer
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+TABLES_DIR = os.path.join(TESTS_DIR, 'case_tables')
+
+# Бюджет случая, если он не задан ни в случае, ни в таблице
+DEFAULT_BUDGET_MS = 100.0
+
+Case = Dict[str, Any]
+
+
+def load_tables(paths: List[str]) -> List[Case]:
+    """Читает таблицы и возвращает список случаев с именем таблицы и бюджетом."""
+    cases = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            table = json.load(f)
+        name = os.path.splitext(os.path.basename(path))[0]
+        for case in table['cases']:
+            cases.append(dict(case, table=name,
+                              budget_ms=case.get('budget_ms', table.get('budget_ms', DEFAULT_BUDGET_MS))))
+    return cases
+
+
+# Состояние рабочего процесса: прогретые лексер и анализатор
+_lexer: Optional[PseudocodeLexer] = None
+_analyzer: Optional[PseudocodeAnalyzer] = None
+
+
+def _init_worker():
+    global _lexer, _analyzer
+    _lexer = PseudocodeLexer()
+    _analyzer = PseudocodeAnalyzer()
+
+
+def _source(case: Case) -> str:
+    """Исходный код случая: текст, файл или сгенерированная программа."""
+    if 'code' in case:
+        return case['code']
+    if 'file' in case:
+        with open(os.path.join(TESTS_DIR, case['file']), 'r', encoding='utf-8') as f:
+            return f.read()
+    spec = case['generate']
+    generator = ProgramGenerator(seed=spec.get('seed', 0), max_depth=spec.get('depth', 4))
+    return generator.generate(parse_size(str(spec['size'])))
+
+
+def _node_types(node: Any, found: set) -> set:
+    if isinstance(node, dict):
+        if 'node_type' in node:
+            found.add(node['node_type'])
+        for value in node.values():
+            _node_types(value, found)
+    elif isinstance(node, list):
+        for item in node:
+            _node_types(item, found)
+    return found
+
+
+def check_tokens(case: Case, code: str) -> List[str]:
+    try:
+        tokens = _lexer.tokenize(code)
+    except RuntimeError as e:
+        if case.get('error'):
+            expected = case['error']
+            return [] if expected is True or expected in str(e) else [f"ошибка {e!s} не содержит {expected!r}"]
+        return [f"неожиданная ошибка: {e}"]
+    if case.get('error'):
+        return ["ожидалась ошибка лексера"]
+
+    problems = []
+    types = [token['type'] for token in tokens]
+    if 'types' in case and types != case['types']:
+        problems.append(f"типы {types}, ожидалось {case['types']}")
+    if 'count' in case and len(tokens) != case['count']:
+        problems.append(f"токенов {len(tokens)}, ожидалось {case['count']}")
+    for index, expected in case.get('at', {}).items():
+        actual = types[int(index)] if int(index) < len(types) else None
+        if actual != expected:
+            problems.append(f"токен {index}: {actual}, ожидалось {expected}")
+    return problems
+
+
+def check_analyze(case: Case, code: str) -> List[str]:
+    result = _analyzer.analyze(code)
+    problems = []
+    if 'success' in case and result['success'] != case['success']:
+        problems.append(f"success = {result['success']}, ошибки: {result['errors']}")
+    if 'token_count' in case and result.get('token_count') != case['token_count']:
+        problems.append(f"токенов {result.get('token_count')}, ожидалось {case['token_count']}")
+    if 'nodes' in case:
+        missing = set(case['nodes']) - _node_types(result.get('ast_json'), set())
+        if missing:
+            problems.append(f"нет узлов {sorted(missing)}")
+    if 'error' in case and not any(case['error'] in str(error) for error in result['errors']):
+        problems.append(f"нет ошибки с текстом {case['error']!r}: {result['errors']}")
+    return problems
+
+
+def check_execute(case: Case, code: str) -> List[str]:
+    result = _analyzer.execute(code)
+    problems = []
+    if 'output' in case and result['output'] != case['output']:
+        problems.append(f"вывод {result['output']!r}, ожидалось {case['output']!r}")
+    if 'status' in case and result['status'] != case['status']:
+        problems.append(f"статус {result['status']}, ожидалось {case['status']}")
+    return problems
+
+
+CHECKS: Dict[str, Callable[[Case, str], List[str]]] = {
+    'tokens': check_tokens,
+    'analyze': check_analyze,
+    'execute': check_execute,
+}
+
+
+def run_case(case: Case) -> Dict[str, Any]:
+    """Выполняет случай и возвращает запись отчета."""
+    check = CHECKS.get(case.get('kind'))
+    record = {'table': case['table'], 'name': case['name'], 'kind': case.get('kind'),
+              'budget_ms': case['budget_ms'], 'duration_ms': 0.0}
+    if check is None:
+        return dict(record, passed=False, problems=[f"неизвестный вид проверки: {case.get('kind')}"])
+    try:
+        # Подготовка исходника (чтение файла, генерация) в замер не входит
+        code = _source(case)
+        durations = []
+        for _ in range(max(1, case.get('repeat', 1))):
+            start = time.perf_counter()
+            problems = check(case, code)
+            durations.append((time.perf_counter() - start) * 1000)
+    except Exception as e:
+        return dict(record, passed=False, problems=[f"исключение: {type(e).__name__}: {e}"])
+
+    duration = min(durations)
+    record['duration_ms'] = round(duration, 3)
+    if duration > case['budget_ms']:
+        problems.append(f"превышен бюджет: {duration:.1f} мс > {case['budget_ms']:g} мс")
+    return dict(record, passed=not problems, problems=problems)
+
+
+def run_cases(cases: List[Case], workers: int) -> List[Dict[str, Any]]:
+    """Выполняет случаи в пуле процессов (workers = 0 - в текущем процессе)."""
+    if workers <= 0:
+        _init_worker()
+        return [run_case(case) for case in cases]
+    context = multiprocessing.get_context('fork') if 'fork' in multiprocessing.get_all_start_methods() else None
+    with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker) as pool:
+        return list(pool.map(run_case, cases, chunksize=max(1, len(cases) // (workers * 4))))
+
+
+def print_report(results: List[Dict[str, Any]], elapsed: float, slowest: int = 5):
+    """Выводит результаты по таблицам и итоговый отчет."""
+    table = None
+    for record in results:
+        if record['table'] != table:
+            table = record['table']
+            print(f"\n📋 {table}")
+            print("=" * 50)
+        status = "✅" if record['passed'] else "❌"
+        print(f"   {status} {record['name']} ({record['duration_ms']:.1f} мс)")
+        for problem in record['problems']:
+            print(f"      {problem}")
+
+    passed = sum(record['passed'] for record in results)
+    print("\n" + "=" * 60)
+    print("📊 ИТОГОВЫЙ ОТЧЕТ ПО ТАБЛИЦАМ СЛУЧАЕВ")
+    print("=" * 60)
+    print("⏱️  Самые долгие случаи:")
+    for record in sorted(results, key=lambda r: -r['duration_ms'])[:slowest]:
+        print(f"   {record['duration_ms']:8.1f} мс / {record['budget_ms']:g} мс  {record['table']}: {record['name']}")
+    percentage = passed / len(results) * 100 if results else 0
+    print(f"\n🎯 ОБЩИЙ РЕЗУЛЬТАТ: {passed}/{len(results)} ({percentage:.1f}%) за {elapsed:.2f} с")
+    if passed == len(results):
+        print("\n🎉 ВСЕ СЛУЧАИ ПРОЙДЕНЫ УСПЕШНО!")
+    else:
+        print(f"\n💥 НЕ ПРОЙДЕНО: {len(results) - passed} случаев")
+
+
+def main():
+    """Основная функция тестирования."""
+    arg_parser = argparse.ArgumentParser(description="Табличный тестовый раннер")
+    arg_parser.add_argument('tables', nargs='*', help="Файлы таблиц (по умолчанию - tests/case_tables/*.json)")
+    arg_parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help="Число рабочих процессов (0 - без пула)")
+    arg_parser.add_argument('--filter', help="Запускать только случаи, в имени которых есть подстрока")
+    arg_parser.add_argument('--budget-scale', type=float,
+                            default=float(os.environ.get('PSEUDOCODE_BUDGET_SCALE', 1.0)),
+                            help="Множитель бюджетов времени (для медленных машин)")
+    arg_parser.add_argument('--report', help="Сохранить отчет в JSON")
+    args = arg_parser.parse_args()
+
+    cases = load_tables(args.tables or sorted(glob.glob(os.path.join(TABLES_DIR, '*.json'))))
+    if args.filter:
+        cases = [case for case in cases if args.filter.lower() in case['name'].lower()]
+    for case in cases:
+        case['budget_ms'] *= args.budget_scale
+
+    print("🎯 ТАБЛИЧНОЕ ТЕСТИРОВАНИЕ АНАЛИЗАТОРА")
+    print(f"   Случаев: {len(cases)}, процессов: {args.workers}")
+    started = time.perf_counter()
+    results = run_cases(cases, args.workers)
+    elapsed = time.perf_counter() - started
+    print_report(results, elapsed)
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump({
+                'workers': args.workers,
+                'budget_scale': args.budget_scale,
+                'elapsed': round(elapsed, 3),
+                'total': len(results),
+                'passed': sum(record['passed'] for record in results),
+                'cases': results,
+            }, f, ensure_ascii=False, indent=2)
+        print(f"💾 Отчет сохранен в {args.report}")
+
+    return 0 if all(record['passed'] for record in results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+ТЕСТОВЫЙ РАННЕР ДЛЯ ИНТЕРПРЕТАТОРА
+Проверка выполнения программ и ограничения ресурсов.
+"""
+
+import io
+import os
+import sys
+
+# Добавляем путь к src для импортов
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from analyzer import PseudocodeAnalyzer
+from interpreter import ExecutionLimits
+from profiler import ProfilingInterpreter, collapsed_stacks, render_listing
+
+class InterpreterTestSuite:
+    """Тестовый набор для интерпретатора псевдокода."""
+
+    def __init__(self):
+        self.analyzer = PseudocodeAnalyzer()
+        self.test_results = []
+
+    def run_execution_tests(self):
+        """Проверяет результаты выполнения корректных программ."""
+        print("🧪 ТЕСТЫ ВЫПОЛНЕНИЯ")
+        print("=" * 50)
+
+        test_cases = [
+            {
+                'name': 'Присваивание и вывод',
+                'code': 'x = 40; y = x + 2; print(y);',
+                'expected_output': '42\n'
+            },
+            {
+                'name': 'Конкатенация строк',
+                'code': 'n = 5; print("n = " + n);',
+                'expected_output': 'n = 5\n'
+            },
+            {
+                'name': 'Цикл for и остаток от деления',
+                'code': 'sum = 0; for i in range(1, 11) { if (i % 2 == 0) { sum = sum + i; } } print(sum);',
+                'expected_output': '30\n'
+            },
+            {
+                'name': 'Цикл while',
+                'code': 'c = 3; while (c > 0) { print(c); c = c - 1; }',
+                'expected_output': '3\n2\n1\n'
+            },
+            {
+                'name': 'Вложенный else if',
+                'code': 'x = 0; if (x > 0) { print("pos"); } else if (x == 0) { print("zero"); } else { print("neg"); }',
+                'expected_output': 'zero\n'
+            }
+        ]
+
+        passed = 0
+        for test in test_cases:
+            print(f"\n🔸 {test['name']}")
+            result = self.analyzer.execute(test['code'])
+
+            if result['success'] and result['output'] == test['expected_output']:
+                print("   ✅ ТЕСТ ПРОЙДЕН")
+                passed += 1
+            else:
+                print("   ❌ ТЕСТ НЕ ПРОЙДЕН")
+                print(f"      Статус: {result['status']}, вывод: {result['output']!r}")
+                if result['errors']:
+                    print(f"      Ошибки: {result['errors']}")
+
+        self.test_results.append(('Тесты выполнения', passed, len(test_cases)))
+        return passed == len(test_cases)
+
+    def run_limit_tests(self):
+        """Проверяет прерывание выполнения при превышении бюджета."""
+        print("\n⏱️  ТЕСТЫ ОГРАНИЧЕНИЯ РЕСУРСОВ")
+        print("=" * 50)
+
+        test_cases = [
+            {
+                'name': 'Бесконечный цикл без тела',
+                'code': 'x = 1; while (x > 0);',
+                'limits': ExecutionLimits(max_steps=1000),
+                'expected_status': 'step_limit',
+                'expected_output': ''
+            },
+            {
+                'name': 'Частичный вывод при превышении шагов',
+                'code': 'print("start"); x = 1; while (x > 0) { x = x + 1; }',
+                'limits': ExecutionLimits(max_steps=100),
+                'expected_status': 'step_limit',
+                'expected_output': 'start\n'
+            },
+            {
+                'name': 'Лимит времени',
+                'code': 'x = 1; while (x > 0) { x = x + 1; }',
+                'limits': ExecutionLimits(max_steps=None, max_time=0.05),
+                'expected_status': 'time_limit',
+                'expected_output': ''
+            },
+            {
+                'name': 'Лимит вывода',
+                'code': 'while (1) { print("abc"); }',
+                'limits': ExecutionLimits(max_output_bytes=10),
+                'expected_status': 'output_limit',
+                'expected_output': 'abc\nabc\nab'
+            },
+            {
+                'name': 'Лимит размера значения',
+                'code': 's = "ab"; while (1) { s = s + s; }',
+                'limits': ExecutionLimits(max_value_size=1000),
+                'expected_status': 'memory_limit',
+                'expected_output': ''
+            },
+            {
+                'name': 'Ошибка выполнения',
+                'code': 'print("a"); x = 1 / 0;',
+                'limits': ExecutionLimits(),
+                'expected_status': 'runtime_error',
+                'expected_output': 'a\n'
+            }
+        ]
+
+        passed = 0
+        for test in test_cases:
+            print(f"\n🔸 {test['name']}")
+            result = self.analyzer.execute(test['code'], test['limits'])
+
+            status_ok = result['status'] == test['expected_status']
+            output_ok = result['output'] == test['expected_output']
+
+            if status_ok and output_ok and not result['success']:
+                print(f"   ✅ Прервано: {result['errors'][0]}")
+                passed += 1
+            else:
+                print("   ❌ ТЕСТ НЕ ПРОЙДЕН")
+                print(f"      Ожидалось: {test['expected_status']}, {test['expected_output']!r}")
+                print(f"      Получено:  {result['status']}, {result['output']!r}")
+
+        self.test_results.append(('Тесты ограничения ресурсов', passed, len(test_cases)))
+        return passed == len(test_cases)
+
+    def run_profiler_tests(self):
+        """Проверяет профилирование выполнения по строкам."""
+        print("\n🔥 ТЕСТЫ ПРОФИЛИРОВЩИКА")
+        print("=" * 50)
+
+        code = """s = 0;
+for i in range(0, 4) {
+    j = 0;
+    while (j < i) {
+        s = s + j;
+        j = j + 1;
+    }
+}
+print(s);
+"""
+
+        def profile(source=code, **options):
+            return self.analyzer.execute(source, interpreter=ProfilingInterpreter(**options))
+
+        def same_result():
+            result, plain = profile(), self.analyzer.execute(code)
+            return (result['output'] == plain['output'] == '4\n' and result['steps'] == plain['steps']
+                    and result['profile']['steps'] == plain['steps'])
+
+        def line_counts():
+            lines = profile(timing=False)['profile']['lines']
+            return ({number: totals['count'] for number, totals in lines.items()}
+                    == {1: 1, 2: 1, 3: 4, 4: 4, 5: 6, 6: 6, 9: 1}
+                    and lines[4]['steps'] == 10 and lines[2]['steps'] == 5)
+
+        def loop_iterations():
+            loops = profile()['profile']['loops']
+            return [(loop['node_type'], loop['line'], loop['count'], loop['iterations']) for loop in loops] == [
+                ('FOR_LOOP', 2, 1, 4), ('WHILE_LOOP', 4, 4, 6)]
+
+        def self_time():
+            statements = profile()['profile']['statements']
+            return (all(statement['self_time'] <= statement['time'] for statement in statements)
+                    and statements[1]['time'] >= statements[3]['time'] > 0)
+
+        def stacks():
+            folded = collapsed_stacks(profile(timing=False)['profile'])
+            return folded == ['program;ASSIGNMENT:1 1', 'program;FOR_LOOP:2 5', 'program;FOR_LOOP:2;ASSIGNMENT:3 4',
+                              'program;FOR_LOOP:2;WHILE_LOOP:4 10',
+                              'program;FOR_LOOP:2;WHILE_LOOP:4;ASSIGNMENT:5 6',
+                              'program;FOR_LOOP:2;WHILE_LOOP:4;ASSIGNMENT:6 6',
+                              'program;OUTPUT:9 1']
+
+        def listing():
+            stream = io.StringIO()
+            render_listing(code, profile()['profile'], stream)
+            lines = stream.getvalue().splitlines()
+            return (len(lines) == 10 and lines[4].endswith('while (j < i) {    ⟳ итераций: 6')
+                    and lines[8].split()[0] == '8' and lines[8].split()[1] == '|')
+
+        def aborted_run():
+            result = profile('x = 1; while (x > 0) { x = x + 1; }', limits=ExecutionLimits(max_steps=100))
+            return result['status'] == 'step_limit' and result['profile']['steps'] == 101
+
+        def limits_with_interpreter():
+            try:
+                self.analyzer.execute(code, ExecutionLimits(max_steps=100), interpreter=ProfilingInterpreter())
+            except ValueError:
+                return True
+            return False
+
+        test_cases = [
+            ('Результат совпадает с Interpreter', same_result),
+            ('Число выполнений по строкам', line_counts),
+            ('Итерации циклов', loop_iterations),
+            ('Собственное время не больше полного', self_time),
+            ('Свернутые стеки', stacks),
+            ('Аннотированный листинг', listing),
+            ('Профиль прерванного выполнения', aborted_run),
+            ('limits вместе с interpreter отклоняются', limits_with_interpreter),
+        ]
+
+        passed = 0
+        for name, check in test_cases:
+            print(f"\n🔸 {name}")
+            if check():
+                print("   ✅ ТЕСТ ПРОЙДЕН")
+                passed += 1
+            else:
+                print("   ❌ ТЕСТ НЕ ПРОЙДЕН")
+
+        self.test_results.append(('Тесты профилировщика', passed, len(test_cases)))
+        return passed == len(test_cases)
+
+    def print_summary(self):
+        """Выводит итоговый отчет по всем тестам."""
+        print("\n" + "=" * 60)
+        print("📊 ИТОГОВЫЙ ОТЧЕТ ПО ТЕСТИРОВАНИЮ ИНТЕРПРЕТАТОРА")
+        print("=" * 60)
+
+        total_passed = 0
+        total_tests = 0
+
+        for category, passed, total in self.test_results:
+            percentage = (passed / total) * 100 if total > 0 else 0
+            status = "✅" if passed == total else "❌"
+            print(f"{status} {category}: {passed}/{total} ({percentage:.1f}%)")
+            total_passed += passed
+            total_tests += total
+
+        overall_percentage = (total_passed / total_tests) * 100 if total_tests > 0 else 0
+        print(f"\n🎯 ОБЩИЙ РЕЗУЛЬТАТ: {total_passed}/{total_tests} ({overall_percentage:.1f}%)")
+
+        if total_passed == total_tests:
+            print("\n🎉 ВСЕ ТЕСТЫ ИНТЕРПРЕТАТОРА ПРОЙДЕНЫ УСПЕШНО!")
+        else:
+            print(f"\n💥 НЕ ПРОЙДЕНО: {total_tests - total_passed} тестов")
+
+    def run_all_tests(self):
+        """Запускает все тесты интерпретатора."""
+        print("🎯 КОМПЛЕКСНОЕ ТЕСТИРОВАНИЕ ИНТЕРПРЕТАТОРА")
+        print("=" * 60)
+
+        self.run_execution_tests()
+        self.run_limit_tests()
+        self.run_profiler_tests()
+
+        self.print_summary()
+
+        return all(passed == total for _, passed, total in self.test_results)
+
+
+def main():
+    """Основная функция тестирования."""
+    test_suite = InterpreterTestSuite()
+    success = test_suite.run_all_tests()
+    return 0 if success else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
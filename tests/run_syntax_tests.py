@@ -4,14 +4,41 @@
 Лабораторная работа №2
 """
 
+import contextlib
+import io
 import os
+import pickle
 import sys
+import tracemalloc
 
 # Добавляем путь к src для импортов
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from analyzer import PseudocodeAnalyzer
-from parser import Parser, ASTValidator
+from antlr_backend import AntlrBackend, antlr_available, first_difference, require_antlr, run_backend
+from lexer import LexerAnalyzer
+from parser import Parser, ASTValidator, LazyBlockNode, HashConsFactory, NodeType
+from lexer import LineIndex
+from flat_ast import FlatAST, parse_flat
+from metrics import PHASES, print_metrics
+from fuzz import BACKENDS, CaseGenerator, HandWrittenBackend, compare, ddmin, fuzz, minimize
+from generator import GrammarSpec, PARSER_EXTRA_OPERATORS, ProgramGenerator, parse_size
+from interpreter import ExecutionLimits
+from parallel import parse_parallel, find_split_points, plan_chunks
+from query import QueryIndex
+from report import ReportRenderer
+from symbols import build_symbol_table
+
+class RejectModuloBackend(HandWrittenBackend):
+    """Парсер с внесенной ошибкой для проверки фаззера: отвергает '%'."""
+    
+    name = 'no-mod'
+    
+    def parse(self, code):
+        if '%' in code:
+            raise SyntaxError("'%' не поддерживается")
+        return super().parse(code)
+
 
 class SyntaxTestSuite:
     """Комплексный тестовый набор для синтаксического анализатора."""
@@ -199,6 +226,814 @@ class SyntaxTestSuite:
         self.test_results.append(('Тесты валидации', passed, len(test_cases)))
         return passed == len(test_cases)
     
+    def run_metrics_tests(self):
+        """Тестирует метрики фаз анализа."""
+        print("\n⏱️  ТЕСТЫ МЕТРИК АНАЛИЗА")
+        print("=" * 50)
+        
+        code = "x = 1;\nif (x > 0) { print(x + 2); }\n"
+        received = []
+        analyzer = PseudocodeAnalyzer(instrument=True, metrics_callback=received.append)
+        result = analyzer.analyze(code)
+        metrics = result['metrics']
+        
+        def phases_present():
+            return (list(metrics['phases']) == list(PHASES)
+                    and all(set(record) >= {'time', 'allocated_blocks'} for record in metrics['phases'].values())
+                    and abs(metrics['total_time'] - sum(r['time'] for r in metrics['phases'].values())) < 1e-9)
+        
+        def node_counts():
+            return (metrics['node_counts'] == {'PROGRAM': 1, 'ASSIGNMENT': 1, 'CONDITIONAL': 1, 'CONDITION': 1,
+                                               'BLOCK': 1, 'OUTPUT': 1, 'BINARY_OP': 1, 'NUMBER': 3,
+                                               'VARIABLE': 3}
+                    and metrics['node_total'] == 13 and metrics['max_depth'] == 6)
+        
+        def callback_called():
+            return (len(received) == 1 and received[0]['success'] is True
+                    and {key: value for key, value in received[0].items() if key != 'success'} == metrics)
+        
+        def callback_enables_instrument():
+            return PseudocodeAnalyzer(metrics_callback=received.append).instrument
+        
+        def not_instrumented():
+            plain = PseudocodeAnalyzer().analyze(code)
+            return plain['success'] and 'metrics' not in plain
+        
+        def lexer_error():
+            before = len(received)
+            failed = analyzer.analyze("x = @;")
+            return (not failed['success'] and list(failed['metrics']['phases']) == ['lexing']
+                    and failed['metrics']['node_total'] == 0 and received[before]['success'] is False)
+        
+        def syntax_error():
+            failed = analyzer.analyze("x = (1;")
+            return (not failed['success']
+                    and list(failed['metrics']['phases']) == ['lexing', 'token_conversion', 'parsing']
+                    and failed['metrics']['node_counts'] == {} and failed['metrics']['max_depth'] == 0)
+        
+        def printed():
+            stream = io.StringIO()
+            print_metrics(metrics, file=stream)
+            text = stream.getvalue()
+            return all(phase in text for phase in PHASES) and "Узлов AST: 13, максимальная глубина: 6" in text
+        
+        def trace_memory():
+            tracemalloc.start()
+            try:
+                traced = PseudocodeAnalyzer(instrument=True, trace_memory=True).analyze("x = 1;\n")
+                # Python 3.8: tracemalloc.reset_peak отсутствует
+                reset_peak = getattr(tracemalloc, 'reset_peak', None)
+                if reset_peak is not None:
+                    del tracemalloc.reset_peak
+                try:
+                    without_reset = PseudocodeAnalyzer(instrument=True, trace_memory=True).analyze("x = 1;\n")
+                finally:
+                    if reset_peak is not None:
+                        tracemalloc.reset_peak = reset_peak
+            finally:
+                tracemalloc.stop()
+            phases = without_reset['metrics']['phases']
+            return (traced['success'] and without_reset['success'] and list(phases) == list(PHASES)
+                    and all('peak_memory' not in record for record in phases.values())
+                    and (reset_peak is None or 'peak_memory' in traced['metrics']['phases']['parsing']))
+        
+        test_cases = [
+            ('Все фазы в метриках', phases_present),
+            ('Число узлов и глубина', node_counts),
+            ('Обработчик получает метрики', callback_called),
+            ('Обработчик включает инструментирование', callback_enables_instrument),
+            ('Без instrument метрик нет', not_instrumented),
+            ('Метрики при лексической ошибке', lexer_error),
+            ('Метрики при синтаксической ошибке', syntax_error),
+            ('Вывод print_metrics', printed),
+            ('Пиковая память без tracemalloc.reset_peak', trace_memory),
+        ]
+        
+        passed = 0
+        for name, check in test_cases:
+            print(f"\n🔸 {name}")
+            if check():
+                print("   ✅ ТЕСТ ПРОЙДЕН")
+                passed += 1
+            else:
+                print("   ❌ ТЕСТ НЕ ПРОЙДЕН")
+        
+        self.test_results.append(('Тесты метрик анализа', passed, len(test_cases)))
+        return passed == len(test_cases)
+    
+    def run_lazy_parsing_tests(self):
+        """Тестирует отложенный разбор блоков."""
+        print("\n💤 ТЕСТЫ ОТЛОЖЕННОГО РАЗБОРА БЛОКОВ")
+        print("=" * 50)
+        
+        def parse(code, lazy):
+            return Parser(LexerAnalyzer().analyze(code), lazy_blocks=lazy).parse()
+        
+        nested = 'if (x > 1) { for i in range(0, 3) { while (y < i) { y = y + 1; } } } else print(x);'
+        broken = 'if (x > 1) { y = ; }\nz = 2;'
+        
+        def same_ast():
+            for file_name in ('basic.pseudo', 'arithmetic.pseudo', 'loops.pseudo'):
+                path = os.path.join(os.path.dirname(__file__), 'test_cases', file_name)
+                with open(path, 'r', encoding='utf-8') as f:
+                    code = f.read()
+                if parse(code, False).to_dict() != parse(code, True).to_dict():
+                    return False
+            return parse(nested, False).to_dict() == parse(nested, True).to_dict()
+        
+        def body_deferred():
+            block = parse(nested, True).statements[0].then_block
+            return isinstance(block, LazyBlockNode) and 'statements' not in vars(block)
+        
+        def body_on_access():
+            block = parse(nested, True).statements[0].then_block
+            return (block.statements[0].node_type.value == 'FOR_LOOP'
+                    and isinstance(block.statements[0].body, LazyBlockNode))
+        
+        def errors_deferred():
+            ast = parse(broken, True)
+            if ast.statements[1].line != 2:
+                return False
+            try:
+                ast.statements[0].then_block.statements
+            except SyntaxError as e:
+                return 'строке 1' in str(e)
+            return False
+        
+        def validator_sees_body():
+            return ASTValidator().validate(parse(nested, True)) == ASTValidator().validate(parse(nested, False))
+        
+        def unclosed_block():
+            try:
+                parse('if (x > 5) { y = 1;', True)
+            except SyntaxError:
+                return True
+            return False
+        
+        test_cases = [
+            ('AST совпадает с полным разбором', same_ast),
+            ('Тело блока не разобрано до обращения', body_deferred),
+            ('Тело разбирается при обращении', body_on_access),
+            ('Ошибка в теле обнаруживается при обращении', errors_deferred),
+            ('Валидатор обходит отложенные блоки', validator_sees_body),
+            ('Незакрытый блок - ошибка сразу', unclosed_block),
+        ]
+        
+        passed = 0
+        for name, check in test_cases:
+            print(f"\n🔸 {name}")
+            if check():
+                print("   ✅ ТЕСТ ПРОЙДЕН")
+                passed += 1
+            else:
+                print("   ❌ ТЕСТ НЕ ПРОЙДЕН")
+        
+        self.test_results.append(('Тесты отложенного разбора', passed, len(test_cases)))
+        return passed == len(test_cases)
+    
+    def run_generator_tests(self):
+        """Тестирует генератор программ для нагрузочных тестов."""
+        print("\n🏭 ТЕСТЫ ГЕНЕРАТОРА ПРОГРАММ")
+        print("=" * 50)
+        
+        def same_seed():
+            return (ProgramGenerator(seed=3).generate(5000) == ProgramGenerator(seed=3).generate(5000)
+                    and ProgramGenerator(seed=3).generate(5000) != ProgramGenerator(seed=4).generate(5000))
+        
+        def size_respected():
+            for size in (1, 1000, 20000):
+                code = ProgramGenerator(seed=1).generate(size)
+                stream = io.StringIO()
+                written = ProgramGenerator(seed=1).write(stream, size, chunk_size=512)
+                if not (size <= len(code) < size + 2000 and stream.getvalue() == code and written == len(code)):
+                    return False
+            return parse_size('64K') == 65536 and parse_size('1.5M') == 1572864
+        
+        def output_parses():
+            return all(self.analyzer.analyze(ProgramGenerator(seed=seed, max_depth=5).generate(5000))['success']
+                       for seed in range(10))
+        
+        def programs_finish():
+            limits = ExecutionLimits(max_steps=2_000_000, max_time=None)
+            statuses = [self.analyzer.execute(ProgramGenerator(seed=seed).generate(2000), limits)['status']
+                        for seed in range(40)]
+            return statuses == ['completed'] * 40
+        
+        def injected_errors():
+            generator = ProgramGenerator(seed=2, error_rate=0.2)
+            code = generator.generate(5000)
+            return generator.errors_injected > 0 and not self.analyzer.analyze(code)['success']
+        
+        test_cases = [
+            ('Одинаковое зерно - одинаковая программа', same_seed),
+            ('Размер программы соблюдается', size_respected),
+            ('Программы разбираются без ошибок', output_parses),
+            ('Программы завершаются при выполнении', programs_finish),
+            ('Внедренные ошибки обнаруживаются', injected_errors),
+        ]
+        
+        passed = 0
+        for name, check in test_cases:
+            print(f"\n🔸 {name}")
+            if check():
+                print("   ✅ ТЕСТ ПРОЙДЕН")
+                passed += 1
+            else:
+                print("   ❌ ТЕСТ НЕ ПРОЙДЕН")
+        
+        self.test_results.append(('Тесты генератора программ', passed, len(test_cases)))
+        return passed == len(test_cases)
+    
+    def run_antlr_backend_tests(self):
+        """Сверяет парсер ANTLR с основным парсером (если ANTLR доступен)."""
+        print("\n⚖️  ТЕСТЫ ПАРСЕРА ANTLR")
+        print("=" * 50)
+        
+        if not antlr_available():
+            try:
+                require_antlr()
+            except RuntimeError as e:
+                print(f"   ⏭️  Пропущено: {e}")
+            return True
+        
+        hand, antlr = HandWrittenBackend(), AntlrBackend()
+        tests_dir = os.path.dirname(os.path.abspath(__file__))
+        sources = [os.path.join(tests_dir, '..', 'examples', name)
+                   for name in sorted(os.listdir(os.path.join(tests_dir, '..', 'examples')))
+                   if name.endswith('.pseudo')]
+        sources += [os.path.join(tests_dir, 'test_cases', name)
+                    for name in sorted(os.listdir(os.path.join(tests_dir, 'test_cases')))
+                    if name.endswith('.pseudo')]
+        
+        def same_tree(code):
+            hand_result, antlr_result = run_backend(hand, code), run_backend(antlr, code)
+            if not (hand_result['accepted'] and antlr_result['accepted']):
+                print(f"      hand: {hand_result['error']}, antlr: {antlr_result['error']}")
+                return False
+            difference = first_difference(hand_result['ast'], antlr_result['ast'])
+            if difference:
+                print(f"      {difference}")
+            return difference is None
+        
+        def read(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                return f.read()
+        
+        test_cases = [(f"Файл {os.path.basename(path)}", lambda path=path: same_tree(read(path)))
+                      for path in sources]
+        test_cases += [
+            ('Операция %', lambda: same_tree("x = 7 % 3 * 2;\nprint(x % 2);\n")),
+            ('Вложенные блоки и else', lambda: same_tree(
+                "if (x > 1) { y = 1; } else if (x == 0) { { y = 2; } } else print(y);\n")),
+            ('Сгенерированные программы', lambda: all(
+                same_tree(ProgramGenerator(seed=seed).generate(3000)) for seed in range(5))),
+            ('Оба отвергают ошибку', lambda: not run_backend(hand, "x = (1;")['accepted']
+                                             and not run_backend(antlr, "x = (1;")['accepted']),
+            ('Режим предсказания', lambda: same_tree("x = 1;") and antlr.last_mode in ('SLL', 'LL')),
+        ]
+        
+        passed = 0
+        for name, check in test_cases:
+            print(f"\n🔸 {name}")
+            if check():
+                print("   ✅ ТЕСТ ПРОЙДЕН")
+                passed += 1
+            else:
+                print("   ❌ ТЕСТ НЕ ПРОЙДЕН")
+        
+        self.test_results.append(('Тесты парсера ANTLR', passed, len(test_cases)))
+        return passed == len(test_cases)
+    
+    def run_compact_positions_tests(self):
+        """Тестирует хранение позиций в виде смещений."""
+        print("\n📍 ТЕСТЫ КОМПАКТНЫХ ПОЗИЦИЙ")
+        print("=" * 50)
+        
+        compact = PseudocodeAnalyzer(compact_positions=True)
+        code = 'n = 3;\n# комментарий\nfor i in range(0, n) {\n    print("i = " + i);\n}\n'
+        
+        def same_ast():
+            for file_name in ('basic.pseudo', 'arithmetic.pseudo', 'loops.pseudo'):
+                path = os.path.join(os.path.dirname(__file__), 'test_cases', file_name)
+                if compact.analyze_file(path)['ast_json'] != self.analyzer.analyze_file(path)['ast_json']:
+                    return False
+            return compact.analyze(code)['ast_json'] == self.analyzer.analyze(code)['ast_json']
+        
+        def tokens_have_offsets():
+            tokens = compact.analyze(code)['tokens']
+            return all('offset' in t and 'line' not in t for t in tokens)
+        
+        def node_position():
+            loop = compact.analyze(code)['ast'].statements[1]
+            output = loop.body.statements[0]
+            return (loop.line, loop.column, output.line, output.column) == (3, 0, 4, 4)
+        
+        def same_errors():
+            for broken in ('x = 1;\n\ny = (2;', 'x = 1;\n  y = @;', 'if (x) {\n y = 1;'):
+                if compact.analyze(broken)['errors'] != self.analyzer.analyze(broken)['errors']:
+                    return False
+            return True
+        
+        def symbols_lines():
+            table = compact.analyze(code)['symbols']
+            return [o.line for o in table.uses('n')] == [3]
+        
+        test_cases = [
+            ('AST совпадает с обычным режимом', same_ast),
+            ('Токены хранят только смещение', tokens_have_offsets),
+            ('Строка и столбец вычисляются по смещению', node_position),
+            ('Сообщения об ошибках совпадают', same_errors),
+            ('Таблица символов видит строки', symbols_lines),
+        ]
+        
+        passed = 0
+        for name, check in test_cases:
+            print(f"\n🔸 {name}")
+            if check():
+                print("   ✅ ТЕСТ ПРОЙДЕН")
+                passed += 1
+            else:
+                print("   ❌ ТЕСТ НЕ ПРОЙДЕН")
+        
+        self.test_results.append(('Тесты компактных позиций', passed, len(test_cases)))
+        return passed == len(test_cases)
+    
+    def run_hash_consing_tests(self):
+        """Тестирует разделение одинаковых поддеревьев."""
+        print("\n🧬 ТЕСТЫ РАЗДЕЛЕНИЯ ПОДДЕРЕВЬЕВ")
+        print("=" * 50)
+        
+        code = 'a = x + 1;\nprint("s" + (x + 1));\nif (x + 1 > 2) { b = x + 1; }\nc = 1 + x;'
+        tokens = LexerAnalyzer().analyze(code)
+        
+        def parse(factory):
+            return Parser(tokens, node_factory=factory).parse()
+        
+        def identical_shared():
+            ast = parse(HashConsFactory())
+            first = ast.statements[0].value
+            return (first is ast.statements[1].expression.right
+                    and first is ast.statements[2].condition.left
+                    and first is ast.statements[2].then_block.statements[0].value)
+        
+        def different_not_shared():
+            ast = parse(HashConsFactory())
+            return ast.statements[0].value is not ast.statements[3].value
+        
+        def without_positions(value):
+            if isinstance(value, dict):
+                return {k: without_positions(v) for k, v in value.items() if k not in ('line', 'column')}
+            if isinstance(value, list):
+                return [without_positions(item) for item in value]
+            return value
+        
+        def structure_preserved():
+            plain, shared = parse(None), parse(HashConsFactory())
+            return (without_positions(plain.to_dict()) == without_positions(shared.to_dict())
+                    and shared.statements[2].line == 3
+                    and shared.statements[0].value.line == 0)
+        
+        def structural_hash():
+            ast = parse(HashConsFactory())
+            return ast.statements[0].value._hash == ast.statements[2].condition.left._hash
+        
+        def table_is_weak():
+            factory = HashConsFactory()
+            ast = parse(factory)
+            alive = factory.stats()['shared_nodes']
+            del ast
+            return alive > 0 and factory.stats()['shared_nodes'] == 0
+        
+        test_cases = [
+            ('Одинаковые выражения - один узел', identical_shared),
+            ('Разные выражения не совпадают', different_not_shared),
+            ('Структура и позиции операторов сохранены', structure_preserved),
+            ('Структурный хеш совпадает', structural_hash),
+            ('Таблица не удерживает узлы', table_is_weak),
+        ]
+        
+        passed = 0
+        for name, check in test_cases:
+            print(f"\n🔸 {name}")
+            if check():
+                print("   ✅ ТЕСТ ПРОЙДЕН")
+                passed += 1
+            else:
+                print("   ❌ ТЕСТ НЕ ПРОЙДЕН")
+        
+        self.test_results.append(('Тесты разделения поддеревьев', passed, len(test_cases)))
+        return passed == len(test_cases)
+    
+    def run_fused_validation_tests(self):
+        """Тестирует проверку узлов при разборе."""
+        print("\n🧷 ТЕСТЫ ПРОВЕРКИ ПРИ РАЗБОРЕ")
+        print("=" * 50)
+        
+        class StrictValidator(ASTValidator):
+            """Валидатор с правилами, срабатывающими на многих узлах."""
+            RULES = dict(ASTValidator.RULES)
+            RULES.update({
+                NodeType.VARIABLE: '_validate_variable',
+                NodeType.BINARY_OP: '_validate_binary_op',
+                NodeType.BLOCK: '_validate_block_size',
+            })
+            
+            def _validate_variable(self, node):
+                if len(node.name) == 1:
+                    self.errors.append(f"Короткое имя {node.name} на строке {node.line}")
+            
+            def _validate_binary_op(self, node):
+                self.errors.append(f"Операция {node.operator} на строке {node.line}")
+            
+            def _validate_block_size(self, node):
+                self._validate_block(node)
+                if len(node.statements) > 1:
+                    self.errors.append(f"Длинный блок на строке {node.line}")
+        
+        code = """x = 1;
+for i in range(0, x + 2) {
+    if (i > x) { y = i * (x - 1); print(y); } else { total = i; }
+    while (total < 10) { total = total + i; }
+}
+print("done" + x);
+"""
+        
+        def same_errors(source, validator_class, **options):
+            lexer = LexerAnalyzer()
+            if options.pop('compact', False):
+                tokens = lexer.convert_tokens(lexer.lexer.tokenize_compact(source))
+                options['line_index'] = lexer.lexer.line_index
+            else:
+                tokens = lexer.convert_tokens(lexer.lexer.tokenize(source))
+            separate = validator_class().validate(Parser(tokens, **options).parse())
+            parser = Parser(tokens, validator=validator_class(), **options)
+            parser.parse()
+            return separate == parser.validation_errors, separate
+        
+        def files_match():
+            directory = os.path.join(os.path.dirname(__file__), 'test_cases')
+            return all(same_errors(open(os.path.join(directory, name), encoding='utf-8').read(), ASTValidator)[0]
+                       for name in os.listdir(directory) if name.endswith('.pseudo'))
+        
+        def empty_program():
+            parser = Parser([], validate=True)
+            parser.parse()
+            return parser.validation_errors == ["Программа не должна быть пустой"]
+        
+        def strict_order():
+            matched, errors = same_errors(code, StrictValidator)
+            return matched and len(errors) > 10
+        
+        def strict_compact_and_shared():
+            return (same_errors(code, StrictValidator, compact=True)[0]
+                    and same_errors(code, StrictValidator, node_factory=HashConsFactory())[0])
+        
+        def lazy_rejected():
+            try:
+                Parser(LexerAnalyzer().analyze(code), lazy_blocks=True, validate=True)
+            except ValueError:
+                return True
+            return False
+        
+        def analyzer_unchanged():
+            result = self.analyzer.analyze(code)
+            return result['success'] and result['errors'] == ASTValidator().validate(result['ast'])
+        
+        test_cases = [
+            ('Файлы тестов: те же ошибки', files_match),
+            ('Пустая программа', empty_program),
+            ('Порядок ошибок как у ASTValidator', strict_order),
+            ('Компактные позиции и разделение поддеревьев', strict_compact_and_shared),
+            ('Несовместимо с отложенным разбором', lazy_rejected),
+            ('Анализатор дает те же ошибки', analyzer_unchanged),
+        ]
+        
+        passed = 0
+        for name, check in test_cases:
+            print(f"\n🔸 {name}")
+            if check():
+                print("   ✅ ТЕСТ ПРОЙДЕН")
+                passed += 1
+            else:
+                print("   ❌ ТЕСТ НЕ ПРОЙДЕН")
+        
+        self.test_results.append(('Тесты проверки при разборе', passed, len(test_cases)))
+        return passed == len(test_cases)
+    
+    def run_flat_ast_tests(self):
+        """Тестирует плоское представление AST."""
+        print("\n🧱 ТЕСТЫ ПЛОСКОГО AST")
+        print("=" * 50)
+        
+        directory = os.path.join(os.path.dirname(__file__), 'test_cases')
+        sources = [open(os.path.join(directory, name), encoding='utf-8').read()
+                   for name in sorted(os.listdir(directory)) if name.endswith('.pseudo')]
+        code = 'x = 1;\nif (x > 0) { print("p" + x); } else { y = x * 2; }\nfor i in range(0, 3) print(i);\n'
+        ast = self.analyzer.analyze(code)['ast']
+        tree = FlatAST.from_ast(ast, LineIndex(code))
+        
+        def same_as_parser():
+            return all(parse_flat(source).root.to_dict() == self.analyzer.analyze(source)['ast'].to_dict()
+                       for source in sources)
+        
+        def round_trips():
+            restored = pickle.loads(pickle.dumps(tree))
+            return (tree.to_ast().to_dict() == ast.to_dict()
+                    and restored.root.to_dict() == ast.to_dict()
+                    and restored.root.statements[1].line == 2)
+        
+        def proxy_interface():
+            root = tree.root
+            conditional = root.statements[1]
+            try:
+                conditional.condition = None
+                read_only = False
+            except AttributeError:
+                read_only = True
+            return (root.statements[0] is root.statements[0]
+                    and conditional.node_type.value == 'CONDITIONAL'
+                    and (conditional.line, conditional.column) == (2, 0)
+                    and conditional.condition.operator == 'GT'
+                    and conditional.then_block.statements[0].expression.left.value == 'p'
+                    and conditional.else_block.statements[0].variable.name == 'y'
+                    and not hasattr(conditional, 'name') and read_only)
+        
+        def analyses_work():
+            return build_symbol_table(tree.root).to_dict() == build_symbol_table(ast).to_dict()
+        
+        def queries_work():
+            flat, plain = QueryIndex(tree.root), QueryIndex(ast)
+            selectors = ['VARIABLE[name="x"]', 'VARIABLE[name=y]:field(variable)', 'BINARY_OP[operator=PLUS]',
+                         'BINARY_OP[operator!=PLUS]', 'CONDITIONAL > BLOCK OUTPUT', 'FOR_LOOP[variable]']
+            positions = [[(node.line, node.column) for node in index.select(selector)]
+                         for index in (flat, plain) for selector in selectors]
+            return (positions[:len(selectors)] == positions[len(selectors):]
+                    and len(flat.select('VARIABLE[name="x"]')) == 4
+                    and len(flat.select('BINARY_OP[operator=PLUS]')) == 1)
+        
+        def index_loops():
+            preorder = all(tree.first_child[i] in (-1, i + 1) for i in range(len(tree)))
+            variables = [tree.literals[tree.literal[i]] for i in tree.indices_of(NodeType.VARIABLE)]
+            return (preorder and tree.count(NodeType.BINARY_OP) == 2
+                    and variables == ['x', 'x', 'x', 'y', 'x', 'i', 'i']
+                    and list(tree.children(0)) == [1, 4, 19])
+        
+        def compact_storage():
+            return tree.nbytes() == 25 * len(tree)
+        
+        def large_offsets():
+            # Исходник, сдвинутый за 2 ГиБ: смещения не помещаются в 32 бита
+            shifted = LineIndex(code)
+            shifted.line_starts = [start + 3 * 2 ** 30 for start in shifted.line_starts]
+            big = pickle.loads(pickle.dumps(FlatAST.from_ast(ast, shifted)))
+            return (max(big.offset) > 2 ** 31 and big.root.statements[2].line == 3
+                    and big.root.to_dict() == ast.to_dict())
+        
+        def needs_positions():
+            try:
+                FlatAST.from_ast(ast)
+            except ValueError:
+                return True
+            return False
+        
+        test_cases = [
+            ('Совпадает с деревом парсера', same_as_parser),
+            ('Восстановление и pickle', round_trips),
+            ('Интерфейс ASTNode у посредников', proxy_interface),
+            ('Анализы работают с посредниками', analyses_work),
+            ('Запросы QueryIndex к посредникам', queries_work),
+            ('Обход циклом по индексам', index_loops),
+            ('25 байт на узел', compact_storage),
+            ('Смещения больше 2 ГиБ', large_offsets),
+            ('Позиции требуют индекса строк', needs_positions),
+        ]
+        
+        passed = 0
+        for name, check in test_cases:
+            print(f"\n🔸 {name}")
+            if check():
+                print("   ✅ ТЕСТ ПРОЙДЕН")
+                passed += 1
+            else:
+                print("   ❌ ТЕСТ НЕ ПРОЙДЕН")
+        
+        self.test_results.append(('Тесты плоского AST', passed, len(test_cases)))
+        return passed == len(test_cases)
+    
+    def run_parallel_parsing_tests(self):
+        """Тестирует параллельный разбор по границам операторов."""
+        print("\n🔀 ТЕСТЫ ПАРАЛЛЕЛЬНОГО РАЗБОРА")
+        print("=" * 50)
+        
+        unit = """x = 1;
+if (x > 0) { y = 1; } else { y = 2; }
+while (x < 3) { x = x + 1; }
+if (x) print("a"); else print("b");
+{ z = x; }
+for i in range(0, 2) print(i);
+"""
+        code = unit * 40
+        
+        def split_points():
+            tokens = LexerAnalyzer().analyze(unit)
+            starts = [(tokens[i]['type'], tokens[i]['line']) for i in find_split_points(tokens)]
+            return starts == [('IF', 2), ('WHILE', 3), ('IF', 4), ('LBRACE', 5), ('FOR', 6)]
+        
+        def chunks_cover_tokens():
+            tokens = LexerAnalyzer().analyze(code)
+            bounds = plan_chunks(tokens, 4, min_chunk_tokens=50)
+            return (len(bounds) == 4 and bounds[0][0] == 0 and bounds[-1][1] == len(tokens)
+                    and all(a[1] == b[0] for a, b in zip(bounds, bounds[1:])))
+        
+        def flat_matches():
+            stats = {}
+            tree = parse_parallel(code, workers=3, min_chunk_tokens=50, stats=stats)
+            reference = parse_flat(code)
+            return (stats['chunks'] == 3 and tree.root.to_dict() == reference.root.to_dict()
+                    and list(tree.offset) == list(reference.offset))
+        
+        def ast_matches():
+            program = parse_parallel(code, workers=3, flat=False, min_chunk_tokens=50)
+            return program.to_dict() == self.analyzer.analyze(code)['ast'].to_dict()
+        
+        def same_first_error():
+            broken = code + "x = ;\n" + code + "y = (;\n"
+            try:
+                Parser(LexerAnalyzer().analyze(broken)).parse()
+            except SyntaxError as e:
+                expected = str(e)
+            try:
+                parse_parallel(broken, workers=3, flat=False, min_chunk_tokens=50)
+            except SyntaxError as e:
+                return str(e) == expected
+            return False
+        
+        test_cases = [
+            ('Границы операторов верхнего уровня', split_points),
+            ('Части покрывают все токены', chunks_cover_tokens),
+            ('Плоский результат совпадает', flat_matches),
+            ('Дерево ASTNode совпадает', ast_matches),
+            ('Та же первая ошибка', same_first_error),
+        ]
+        
+        passed = 0
+        for name, check in test_cases:
+            print(f"\n🔸 {name}")
+            if check():
+                print("   ✅ ТЕСТ ПРОЙДЕН")
+                passed += 1
+            else:
+                print("   ❌ ТЕСТ НЕ ПРОЙДЕН")
+        
+        self.test_results.append(('Тесты параллельного разбора', passed, len(test_cases)))
+        return passed == len(test_cases)
+    
+    def run_report_tests(self):
+        """Тестирует буферизованный вывод дерева и отчета."""
+        print("\n🖨️  ТЕСТЫ ВЫВОДА ОТЧЕТА")
+        print("=" * 50)
+        
+        code = "a = 1;\nb = 2;\nc = 3;\nd = 4;\nif (a > 0) { print(a + b * c); }\n"
+        result = self.analyzer.analyze(code)
+        
+        class CountingStream(io.StringIO):
+            writes = 0
+            
+            def write(self, text):
+                self.writes += 1
+                return super().write(text)
+        
+        def render(method, *args, **options):
+            stream = CountingStream()
+            renderer = ReportRenderer(stream=stream, **options)
+            getattr(renderer, method)(*args)
+            return stream
+        
+        def same_as_print_ast():
+            printed = io.StringIO()
+            with contextlib.redirect_stdout(printed):
+                self.analyzer.print_ast(result['ast'])
+            lines = printed.getvalue().splitlines()
+            return (printed.getvalue() == render('render_ast', result['ast']).getvalue()
+                    and lines[:4] == ['├─ PROGRAM', '│  └─ statements:', '│     [0]:', '      ├─ ASSIGNMENT(a)'])
+        
+        def single_write():
+            stream = render('render_report', result)
+            return stream.writes == 1 and '📄 JSON ПРЕДСТАВЛЕНИЕ AST:' in stream.getvalue()
+        
+        def depth_limit():
+            text = render('render_ast', result['ast'], max_depth=1).getvalue()
+            hidden = render('render_ast', result['ast'], max_depth=1, elide=False).getvalue()
+            return ('ASSIGNMENT(a)' in text and 'NUMBER(1)' not in text and text.count('└─ …') == 5
+                    and '…' not in hidden)
+        
+        def children_limit():
+            text = render('render_ast', result['ast'], max_children=2).getvalue()
+            return '[1]:' in text and '[2]:' not in text and '… еще 3' in text
+        
+        def tree_without_json():
+            text = render('render_report', result, show_json=False).getvalue()
+            return 'BINARY_OP(MUL)' in text and '📄' not in text
+        
+        def summary_only():
+            text = render('render_report', result, summary_only=True).getvalue()
+            return 'Узлов: 24, глубина: 7' in text and '├─' not in text and '📄' not in text
+        
+        def flat_tree_same():
+            return (render('render_ast', parse_flat(code).root).getvalue()
+                    == render('render_ast', result['ast']).getvalue())
+        
+        test_cases = [
+            ('Вывод совпадает с print_ast', same_as_print_ast),
+            ('Отчет выводится одним write', single_write),
+            ('Ограничение глубины', depth_limit),
+            ('Ограничение числа элементов', children_limit),
+            ('Дерево без JSON', tree_without_json),
+            ('Только сводка', summary_only),
+            ('Дерево FlatAST выводится так же', flat_tree_same),
+        ]
+        
+        passed = 0
+        for name, check in test_cases:
+            print(f"\n🔸 {name}")
+            if check():
+                print("   ✅ ТЕСТ ПРОЙДЕН")
+                passed += 1
+            else:
+                print("   ❌ ТЕСТ НЕ ПРОЙДЕН")
+        
+        self.test_results.append(('Тесты вывода отчета', passed, len(test_cases)))
+        return passed == len(test_cases)
+    
+    def run_differential_fuzzing_tests(self):
+        """Тестирует дифференциальный фаззинг парсеров."""
+        print("\n🐞 ТЕСТЫ ДИФФЕРЕНЦИАЛЬНОГО ФАЗЗИНГА")
+        print("=" * 50)
+        
+        hand, compact = BACKENDS['hand'](), BACKENDS['compact']()
+        
+        def multiline_string_positions():
+            code = 'x = "a\nb";\ny = 1;\nprint(y);\n'
+            tree = hand.parse(code).to_dict()
+            return compare(hand, compact, code) == (True, None) and tree['statements'][1]['line'] == 3
+        
+        def ddmin_reduces():
+            items = list("x = a % b + 1;")
+            return ddmin(items, lambda chars: '%' in chars) == ['%']
+        
+        def minimize_keeps_signature():
+            code = "x = 1;\nwhile (x < 10) { y = x % 3; x = x + 1; }\n"
+            return minimize(code, lambda candidate: '%' in candidate and '3' in candidate) in ('%3', '3%')
+        
+        def finds_injected_bug(workers):
+            def check():
+                stats, findings = fuzz(HandWrittenBackend, RejectModuloBackend, cases=300, workers=workers,
+                                       seed=5, batch_size=50)
+                if len(findings) != 1:
+                    return False
+                finding = findings[0]
+                signature = compare(HandWrittenBackend(), RejectModuloBackend(), finding['minimized'])[1][0]
+                return (stats.cases == 300 and finding['signature'] == 'decision:hand=True,no-mod=False'
+                        and signature == finding['signature'] and '%' in finding['minimized']
+                        and len(finding['minimized']) <= 30 < len(finding['input'])
+                        and stats.accepted + stats.rejected + stats.disagreements == 300)
+            return check
+        
+        def deterministic_cases():
+            generator = CaseGenerator()
+            return ([generator.case(11, i) for i in range(20)] == [CaseGenerator().case(11, i) for i in range(20)]
+                    and generator.case(11, 0) != generator.case(12, 0))
+        
+        def backends_agree():
+            stats, findings = fuzz(HandWrittenBackend, BACKENDS['compact'], cases=200, seed=1)
+            return not findings and stats.accepted > 0 and stats.rejected > 0
+        
+        def grammar_has_modulo():
+            return '%' in GrammarSpec.load().multiplicative and PARSER_EXTRA_OPERATORS == {}
+        
+        test_cases = [
+            ('Многострочная строка: позиции совпадают', multiline_string_positions),
+            ('ddmin находит минимальный список', ddmin_reduces),
+            ('Минимизация сохраняет расхождение', minimize_keeps_signature),
+            ('Внесенная ошибка найдена и минимизирована', finds_injected_bug(0)),
+            ('То же в пуле процессов', finds_injected_bug(2)),
+            ('Входы определяются зерном', deterministic_cases),
+            ('hand и compact согласны', backends_agree),
+            ('Грамматика содержит %', grammar_has_modulo),
+        ]
+        
+        passed = 0
+        for name, check in test_cases:
+            print(f"\n🔸 {name}")
+            if check():
+                print("   ✅ ТЕСТ ПРОЙДЕН")
+                passed += 1
+            else:
+                print("   ❌ ТЕСТ НЕ ПРОЙДЕН")
+        
+        self.test_results.append(('Тесты дифференциального фаззинга', passed, len(test_cases)))
+        return passed == len(test_cases)
+    
     def run_integration_tests(self):
         """Запускает интеграционные тесты на файлах."""
         print("\n📁 ИНТЕГРАЦИОННЫЕ ТЕСТЫ")
@@ -261,6 +1096,17 @@ class SyntaxTestSuite:
         self.run_basic_syntax_tests()
         self.run_ast_structure_tests()
         self.run_validation_tests()
+        self.run_metrics_tests()
+        self.run_lazy_parsing_tests()
+        self.run_generator_tests()
+        self.run_antlr_backend_tests()
+        self.run_compact_positions_tests()
+        self.run_hash_consing_tests()
+        self.run_fused_validation_tests()
+        self.run_flat_ast_tests()
+        self.run_parallel_parsing_tests()
+        self.run_report_tests()
+        self.run_differential_fuzzing_tests()
         self.run_integration_tests()
         
         self.print_summary()
@@ -13,6 +13,7 @@ import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from lexer import PseudocodeLexer, LexerAnalyzer
+from corpus_stats import CorpusStatistics, HeavyHitters, Histogram, collect, iter_source_files
 
 class LexerTestSuite:
     """Комплексный тестовый набор для лексического анализатора."""
@@ -200,6 +201,122 @@ class LexerTestSuite:
         self.test_results.append(('Тесты обработки ошибок', passed, len(error_cases)))
         return passed == len(error_cases)
     
+    def run_interning_tests(self):
+        """Тестирует интернирование текста токенов."""
+        print("\n🔗 ТЕСТЫ ИНТЕРНИРОВАНИЯ")
+        print("=" * 50)
+        
+        code = 'max_num = 10;\nmax_num = max_num + 10;\nprint("итог" + max_num);\nprint("итог");'
+        tokens = self.analyzer.analyze(code)
+        table = self.analyzer.lexer.intern_table
+        names = [t['text'] for t in tokens if t['type'] == 'ID']
+        strings = [t['text'] for t in tokens if t['type'] == 'STRING']
+        numbers = [t['text'] for t in tokens if t['type'] == 'NUMBER']
+        
+        checks = [
+            ('Один объект на идентификатор', all(name is names[0] for name in names)),
+            ('Один объект на строковый литерал', strings[0] is strings[1]),
+            ('Один объект на текст числа', numbers[0] is numbers[1]),
+            ('Целочисленные идентификаторы', table.id_of('max_num') == table.id_of(names[1])
+             and table.text_of(table.id_of('max_num')) is names[0]),
+        ]
+        self.analyzer.analyze('x = 1;')
+        checks.append(('Таблица своя для каждого анализа',
+                       'max_num' not in self.analyzer.lexer.intern_table))
+        
+        passed = 0
+        for name, ok in checks:
+            if ok:
+                print(f"   ✅ {name}")
+                passed += 1
+            else:
+                print(f"   ❌ {name}")
+        
+        self.test_results.append(('Тесты интернирования', passed, len(checks)))
+        return passed == len(checks)
+    
+    def run_corpus_statistics_tests(self):
+        """Тестирует потоковую статистику по корпусу программ."""
+        print("\n📚 ТЕСТЫ СТАТИСТИКИ КОРПУСА")
+        print("=" * 50)
+        
+        code = 'max_num = 10;\nif (max_num > 5) {\n  print("итог" + max_num);\n}\n'
+        streamed = list(self.lexer.iter_tokens(code))
+        
+        # Скетч: точные частоты, пока элементов не больше k; иначе
+        # занижение не больше total / (k+1), а частый элемент не теряется
+        exact = HeavyHitters(10)
+        exact.update({'a': 3, 'b': 2})
+        exact.add('a')
+        skewed = HeavyHitters(4)
+        stream = ['hot'] * 300 + [f'cold{i}' for i in range(200)]
+        for item in stream[::2]:
+            skewed.add(item)
+        other = HeavyHitters(4)
+        for item in stream[1::2]:
+            other.add(item)
+        skewed.merge(other)
+        
+        left, right, union = Histogram(), Histogram(), Histogram()
+        for value in (0, 1, 3, 4, 100):
+            left.add(value)
+            union.add(value)
+        for value in (2, 7, 1000):
+            right.add(value)
+            union.add(value)
+        left.merge(right)
+        
+        corpus = [os.path.join(os.path.dirname(__file__), '..', 'examples'),
+                  os.path.join(os.path.dirname(__file__), 'test_cases')]
+        files = list(iter_source_files(corpus))
+        summaries = []
+        sequential = collect(files + ['missing.pseudo'], on_summary=summaries.append)
+        parallel = collect(iter(files), workers=2, batch_size=2)
+        halves = CorpusStatistics()
+        halves.merge(collect(files[:2]))
+        halves.merge(collect(files[2:]))
+        
+        single = CorpusStatistics()
+        single.add_code('a.pseudo', code)
+        broken = single.add_code('b.pseudo', 'x = 1;\ny = @;')
+        self.analyzer.analyze(code)
+        
+        checks = [
+            ('iter_tokens совпадает с tokenize', streamed == self.lexer.tokenize(code)),
+            ('Позиции после многострочной строки', [
+                (token['value'], token['line'], token['column'])
+                for token in self.lexer.iter_tokens('s = "a\nbc"; x\n  y', self.lexer.intern_table.intern)
+            ][-3:] == [(';', 2, 3), ('x', 2, 5), ('y', 3, 2)]),
+            ('Точные частоты малого скетча', exact.top() == [('a', 4), ('b', 2)] and exact.error == 0),
+            ('Частый элемент после объединения', skewed.top(1)[0][0] == 'hot'
+             and 300 - skewed.total // 5 <= skewed.estimate('hot') <= 300
+             and skewed.total == 500 and len(skewed.counters) <= 8),
+            ('Объединение гистограмм', left.to_dict() == union.to_dict()
+             and left.quantile(0.5) == 3 and left.max == 1000),
+            ('Параллельный сбор совпадает с последовательным',
+             dict(parallel.to_dict(), failed=1) == CorpusStatistics.from_dict(sequential.to_dict()).to_dict()
+             and parallel.failed == 0 and sequential.failed == 1),
+            ('Объединение частей корпуса', halves.to_dict()['histograms'] == parallel.to_dict()['histograms']
+             and halves.token_types == parallel.token_types),
+            ('Сводки по файлам в исходном порядке', [s['file'] for s in summaries] == files + ['missing.pseudo']
+             and summaries[-1]['error'] is not None),
+            ('Типы токенов как в get_statistics', single.token_types == self.analyzer.get_statistics()
+             and single.lines == 4 and single.identifiers.top() == [('max_num', 3)]),
+            ('Файл с ошибкой лексера не учитывается', broken['error'] is not None
+             and single.files == 1 and single.failed == 1 and single.tokens == len(streamed)),
+        ]
+        
+        passed = 0
+        for name, ok in checks:
+            if ok:
+                print(f"   ✅ {name}")
+                passed += 1
+            else:
+                print(f"   ❌ {name}")
+        
+        self.test_results.append(('Тесты статистики корпуса', passed, len(checks)))
+        return passed == len(checks)
+    
     def print_summary(self):
         """Выводит итоговый отчет по всем тестам."""
         print("\n" + "=" * 60)
@@ -234,6 +351,8 @@ class LexerTestSuite:
         self.run_keyword_tests()
         self.run_file_tests()
         self.run_error_handling_tests()
+        self.run_interning_tests()
+        self.run_corpus_statistics_tests()
         
         self.print_summary()
         